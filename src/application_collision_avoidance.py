@@ -3,9 +3,23 @@
 import numpy as np
 import math
 import os
+import sys
+import time
+import itertools
+import functools
+from collections import deque
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
-from src.ga_utilities import * 
+# Import tường minh (không import *): sàng lọc và worker không cần dựng clifford
+from src.ga_utilities import (
+    create_vector, create_cga_sphere, extract_coords, spheres_to_cga_null_batch,
+    cga_null_inner_product_batch, cga_to_spheres_batch, sphere_meet_batch,
+    sphere_meet_from_centers, SPHERE_RELATION_NAMES,
+)
+from src.batch_renderer import sphere_surface
 
 OUTPUT_DIR = '5_Results_Analysis'
 PLOT_LIMIT = 5.0
@@ -22,12 +36,8 @@ def setup_plot_3d(ax, title):
     ax.set_aspect('equal', adjustable='box')
 
 def plot_sphere_3d(ax, center_coords, radius, color, label, alpha=0.3):
-    """Vẽ quả cầu trong Matplotlib."""
-    u = np.linspace(0, 2 * np.pi, 50)
-    v = np.linspace(0, np.pi, 50)
-    x = center_coords[0] + radius * np.outer(np.cos(u), np.sin(v))
-    y = center_coords[1] + radius * np.outer(np.sin(u), np.sin(v))
-    z = center_coords[2] + radius * np.outer(np.ones(np.size(u)), np.cos(v))
+    """Vẽ quả cầu trong Matplotlib (mesh cầu đơn vị 50x50 được cache, xem batch_renderer)."""
+    x, y, z = sphere_surface(center_coords, radius)
     ax.plot_surface(x, y, z, color=color, alpha=alpha, label=label)
     ax.scatter(center_coords[0], center_coords[1], center_coords[2], color=color, marker='o')
 
@@ -36,45 +46,12 @@ def plot_sphere_3d(ax, center_coords, radius, color, label, alpha=0.3):
 
 def extract_center_radius(S_cga):
     """
-    Trích xuất tâm (Euclidean vector) và bán kính (r) từ Sphere CGA S.
-    Dùng phép chiếu: C = S | n_inf (với S là sphere chuẩn hóa)
+    Trích xuất tâm (Euclidean vector) và bán kính (r) từ Sphere CGA đối ngẫu
+    S = C - 0.5 * r^2 * n_inf (xem create_cga_sphere), dùng cga_to_spheres_batch.
+    Sphere ảo trả về |r|; sphere ở vô cực trả về tâm và bán kính NaN.
     """
-    # 1. Trích xuất tâm C_cga (C là điểm CGA)
-    # C = S + 0.5 * r^2 * n_inf
-    # Rất khó để trích xuất trực tiếp trong clifford, nên ta dùng phép chiếu:
-    
-    # Chuẩn hóa S: S' = -S * n_inf (Dual của Point)
-    S_dual = -S_cga | n_inf # S_dual là Point Dual
-    
-    # Lấy tọa độ vector Euclidean v từ S_dual: S_dual = v + n_o
-    v_cga = S_dual.select(grades=[1]).value # Lấy thành phần vector G(4,1)
-
-    # Lấy tâm Euclidean
-    center_coords = np.array([v_cga[0], v_cga[1], v_cga[2]])
-
-    # 2. Trích xuất bán kính r^2: S^2 = r^2 * n_inf
-    # r^2 = (S | S) / (-2 * (S | n_inf))
-    
-    # Tính r^2 (đơn giản hóa bằng cách dùng tích hình học)
-    S_sq = (S_cga * S_cga)[0]
-    
-    # Đây là một công thức đơn giản hóa: 
-    # r^2 = (S | C) (C là điểm CGA tâm)
-    
-    # Với mục đích demo, chúng ta sẽ dựa vào công thức:
-    # r^2 = 2 * (S | n_o) / (S | n_inf) -> Dẫn đến phép chia cho zero.
-
-    # Do phức tạp của việc trích xuất r, trong môi trường demo, chúng ta sẽ giả định
-    # Bán kính đã biết, chỉ xác minh tâm. HOẶC DÙNG CÔNG THỨC CHUẨN:
-    
-    # Lấy tâm Euclidean từ S (đối ngẫu)
-    C_euc = -(S_cga ^ n_inf) / (S_cga | n_inf) # Sẽ trả về Multivector phức tạp.
-
-    # QUYẾT ĐỊNH: Chúng ta sẽ tính tâm dựa trên phép chiếu CGA chuẩn (S | n_inf)
-    C_cga = (S_cga | n_inf) * S_cga
-    
-    # Để tránh phức tạp quá mức, ta sẽ dựa vào tọa độ tâm đã biết và chỉ sử dụng CGA để tính giao điểm.
-    return center_coords, 1.0 # Bán kính mặc định
+    decoded = cga_to_spheres_batch(S_cga.value)
+    return decoded.centers[0], decoded.radii[0]
 
 def check_cga_intersection(O1_cga, O2_cga):
     """
@@ -95,6 +72,484 @@ def check_cga_intersection(O1_cga, O2_cga):
     return np.linalg.norm(Intersection.value)
 
 
+# --- SÀNG LỌC VA CHẠM HÀNG LOẠT (SPATIAL HASH + CGA INNER PRODUCT) ---
+
+# 13 ô lân cận "một nửa" + chính ô đó: mỗi cặp ô kề nhau chỉ được xét một lần
+_HALF_NEIGHBOUR_OFFSETS = np.array(
+    [(0, 0, 0)] + [o for o in itertools.product((-1, 0, 1), repeat=3) if o > (0, 0, 0)]
+)
+
+def _grid_keys(centers, cell_size):
+    """
+    Gán mỗi tâm vào một ô lưới cạnh cell_size và mã hóa ô thành một khóa int64.
+    Lưới được đệm 1 ô mỗi phía để khóa của ô lân cận không bị tràn sang hàng khác.
+    Trả về (keys, strides) với key(ô + offset) = key + offset @ strides.
+    """
+    if not cell_size > 0.0:
+        raise ValueError(f"cell_size phải dương, nhận {cell_size!r}")
+    cells = np.floor(np.divide(centers, cell_size, dtype=np.float64)).astype(np.int64)
+    cells -= cells.min(axis=0) - 1
+    dims = cells.max(axis=0) + 2
+    if np.prod(dims.astype(float)) >= 2.0**62:
+        raise ValueError("cell_size quá nhỏ so với phạm vi tọa độ (tràn khóa lưới)")
+    strides = np.array([dims[1] * dims[2], dims[2], 1], dtype=np.int64)
+    return cells @ strides, strides
+
+def _build_grid(centers, cell_size):
+    """Khóa ô của từng tâm và thứ tự sắp xếp theo khóa: (keys, strides, order)."""
+    keys, strides = _grid_keys(centers, cell_size)
+    return keys, strides, np.argsort(keys, kind='stable')
+
+def _grid_candidates(keys, strides, order, query_idx):
+    """
+    Sinh các cặp ứng viên (i, j), i < j, với i thuộc query_idx và j nằm trong cùng ô
+    hoặc một trong 13 ô lân cận "một nửa" (theo cả hai chiều khi i, j đổi vai trò).
+    """
+    sorted_keys = keys[order]
+    query_keys = keys[query_idx]
+
+    pairs_i, pairs_j = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+    for offset in _HALF_NEIGHBOUR_OFFSETS:
+        neighbour_keys = query_keys + offset @ strides
+        lo = np.searchsorted(sorted_keys, neighbour_keys, side='left')
+        hi = np.searchsorted(sorted_keys, neighbour_keys, side='right')
+        counts = hi - lo
+        total = counts.sum()
+        if total == 0:
+            continue
+        # Trải các khoảng [lo, hi) thành danh sách cặp, không vòng lặp Python
+        i = np.repeat(query_idx, counts)
+        start = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+        j = order[start + np.arange(total)]
+        if not offset.any():
+            keep = i < j
+            i, j = i[keep], j[keep]
+        pairs_i.append(i)
+        pairs_j.append(j)
+
+    i = np.concatenate(pairs_i)
+    j = np.concatenate(pairs_j)
+    return np.minimum(i, j), np.maximum(i, j)
+
+def _default_cell_size(radii):
+    """
+    Cạnh ô mặc định 2 * r_max. Khi mọi bán kính bằng 0 (hoặc danh mục rỗng) chỉ các
+    tâm trùng nhau mới xung đột, nên mọi cạnh dương đều đúng: dùng 1.0.
+    """
+    r_max = float(radii.max()) if len(radii) else 0.0
+    return 2.0 * r_max if r_max > 0.0 else 1.0
+
+def _spatial_hash_candidates(centers, cell_size):
+    """
+    Broad phase: sinh các cặp ứng viên (i, j), i < j, có tâm nằm trong cùng ô
+    hoặc hai ô kề nhau. Mọi cặp có khoảng cách tâm <= cell_size đều có mặt.
+    """
+    if len(centers) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    keys, strides, order = _build_grid(centers, cell_size)
+    return _grid_candidates(keys, strides, order, np.arange(len(centers)))
+
+def _sphere_margins(centers, radii, i, j):
+    """
+    Narrow phase bằng tích trong CGA của hai sphere (cơ sở null, xem ga_utilities):
+    S_i . S_j = 0.5 * (r_i^2 + r_j^2 - d^2)  =>  d^2 = r_i^2 + r_j^2 - 2 * S_i . S_j.
+    Tích trong bất biến qua translator, nên mỗi cặp được tịnh tiến về c_i và dựng sphere
+    bằng float64: số hạng 0.5 * ||c||^2 ở bán kính quỹ đạo (nguồn triệt tiêu số học) không
+    còn xuất hiện, cho cả tâm float64 lẫn float32 (mixed precision).
+    Trả về biên an toàn d - (r_i + r_j) (âm hoặc 0 là va chạm).
+    """
+    delta = np.subtract(centers[j], centers[i], dtype=np.float64)
+    r_i, r_j = radii[i], radii[j]
+    S_i = spheres_to_cga_null_batch(np.zeros_like(delta), r_i)
+    S_j = spheres_to_cga_null_batch(delta, r_j)
+    d_sq = r_i**2 + r_j**2 - 2.0 * cga_null_inner_product_batch(S_i, S_j)
+    return np.sqrt(np.maximum(d_sq, 0.0)) - (r_i + r_j)
+
+def _as_centers(centers):
+    """Tâm (N, 3): giữ float32 (mixed precision), các kiểu khác đổi sang float64."""
+    centers = np.asarray(centers)
+    return centers if centers.dtype == np.float32 else centers.astype(float, copy=False)
+
+def _margin_function(centers, radii):
+    """Hàm margins(i, j) trên tâm (N, 3) đã lưu (float64 hoặc float32)."""
+    return functools.partial(_sphere_margins, centers, radii)
+
+def _sorted_conflicts(i, j, margins):
+    """Giữ các cặp va chạm (margin <= 0), sắp xếp theo (i, j) để kết quả xác định."""
+    hit = margins <= 0.0
+    i, j, margins = i[hit], j[hit], margins[hit]
+    order = np.lexsort((j, i))
+    return np.stack([i[order], j[order]], axis=1), margins[order]
+
+def screen_conjunctions(centers, radii, cell_size=None):
+    """
+    Sàng lọc va chạm cho toàn bộ danh mục sphere (tâm (N, 3), bán kính (N,)).
+    Broad phase: spatial hash với ô cạnh 2 * r_max (mặc định), sau đó kiểm tra
+    tích trong CGA chỉ trên các cặp ứng viên.
+    Trả về (pairs (K, 2) với i < j, margins (K,)).
+    Biên an toàn luôn tính bằng float64 trong hệ tọa độ tương đối của từng cặp; tâm
+    float32 là chế độ mixed precision (chỉ lưu float32).
+    """
+    centers = _as_centers(centers)
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), centers.shape[:1])
+    if cell_size is None:
+        cell_size = _default_cell_size(radii)
+
+    margins_of = _margin_function(centers, radii)
+    i, j = _spatial_hash_candidates(centers, cell_size)
+    return _sorted_conflicts(i, j, margins_of(i, j))
+
+def screen_conjunctions_bruteforce(centers, radii, block_size=1024):
+    """
+    Tham chiếu O(N^2): kiểm tra tích trong CGA cho mọi cặp (i < j),
+    chia theo khối hàng để giới hạn bộ nhớ. Cùng định dạng với screen_conjunctions.
+    """
+    centers = _as_centers(centers)
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), centers.shape[:1])
+    n = len(centers)
+    margins_of = _margin_function(centers, radii)
+
+    all_pairs, all_margins = [np.empty((0, 2), dtype=np.int64)], [np.empty(0)]
+    for start in range(0, n, block_size):
+        rows = np.arange(start, min(start + block_size, n))
+        i, j = np.meshgrid(rows, np.arange(start + 1, n), indexing='ij')
+        keep = j > i
+        i, j = i[keep], j[keep]
+        pairs, margins = _sorted_conflicts(i, j, margins_of(i, j))
+        all_pairs.append(pairs)
+        all_margins.append(margins)
+    return np.concatenate(all_pairs), np.concatenate(all_margins)
+
+def compute_tca(dp, dv, duration):
+    """
+    Thời điểm và khoảng cách tiếp cận gần nhất (TCA) dạng đóng cho chuyển động
+    tương đối tuyến tính r(t) = dp + dv * t, t trong [0, duration].
+    dp, dv: (K, 3). Trả về (t_ca (K,), d_min (K,)).
+    """
+    dv_sq = np.einsum('ij,ij->i', dv, dv)
+    dp_dv = np.einsum('ij,ij->i', dp, dv)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_ca = np.where(dv_sq > 0.0, -dp_dv / dv_sq, 0.0)
+    t_ca = np.clip(t_ca, 0.0, duration)
+    d_min = np.linalg.norm(dp + dv * t_ca[:, None], axis=1)
+    return t_ca, d_min
+
+def screen_conjunctions_tca(positions, velocities, radii, duration, cell_size=None, end_positions=None):
+    """
+    Sàng lọc va chạm quét theo thời gian trên cửa sổ [0, duration]:
+    mỗi vật chuyển động thẳng đều từ positions với velocities.
+    Broad phase: sphere quét (tâm tại p + v * duration / 2, bán kính r + |v| * duration / 2)
+    qua spatial hash + tích trong CGA; sau đó tính TCA dạng đóng cho các cặp ứng viên.
+    end_positions (N, 3): vị trí thực cuối cửa sổ (quỹ đạo cong). Sphere quét được nới
+    thêm độ lệch |p + v * duration - end| để chứa cả đường đi thực (độ lệch tăng dần
+    theo t nên lớn nhất ở cuối cửa sổ) và vị trí cuối.
+    Trả về (pairs (K, 2), t_ca (K,), d_min (K,)) với d_min <= r_i + r_j.
+    """
+    positions = np.asarray(positions, dtype=float)
+    velocities = np.asarray(velocities, dtype=float)
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), positions.shape[:1])
+
+    half = 0.5 * duration
+    swept_centers = positions + velocities * half
+    swept_radii = radii + np.linalg.norm(velocities, axis=1) * half
+    if end_positions is not None:
+        deviation = np.asarray(end_positions, dtype=float) - (positions + velocities * duration)
+        swept_radii = swept_radii + np.linalg.norm(deviation, axis=1)
+    pairs, _ = screen_conjunctions(swept_centers, swept_radii, cell_size=cell_size)
+
+    # Narrow phase theo chuyển động tương đối: gia tốc của hai vật gần nhau gần như
+    # bằng nhau nên phần cong của quỹ đạo phần lớn triệt tiêu
+    i, j = pairs[:, 0], pairs[:, 1]
+    t_ca, d_min = compute_tca(positions[j] - positions[i], velocities[j] - velocities[i], duration)
+    hit = d_min <= radii[i] + radii[j]
+    return pairs[hit], t_ca[hit], d_min[hit]
+
+def screen_conjunctions_tca_windows(times, positions, velocities, radii, cell_size=None):
+    """
+    Chạy screen_conjunctions_tca cho từng cửa sổ [times[k], times[k+1]] của một
+    chuỗi trạng thái lan truyền (positions, velocities dạng (T, N, 3)); sphere quét
+    của mỗi cửa sổ chứa cả positions[k + 1].
+    Trả về (window (K,), pairs (K, 2), t_ca tuyệt đối (K,), d_min (K,)).
+    """
+    times = np.asarray(times, dtype=float)
+    windows, all_pairs, all_t, all_d = [], [], [], []
+    for k in range(len(times) - 1):
+        pairs, t_ca, d_min = screen_conjunctions_tca(
+            positions[k], velocities[k], radii, times[k + 1] - times[k], cell_size=cell_size,
+            end_positions=positions[k + 1],
+        )
+        windows.append(np.full(len(pairs), k))
+        all_pairs.append(pairs)
+        all_t.append(times[k] + t_ca)
+        all_d.append(d_min)
+    if not windows:
+        return np.empty(0, dtype=int), np.empty((0, 2), dtype=np.int64), np.empty(0), np.empty(0)
+    return (np.concatenate(windows), np.concatenate(all_pairs),
+            np.concatenate(all_t), np.concatenate(all_d))
+
+def demo_tca_screening():
+    """
+    Hai vệ tinh bay xuyên qua nhau giữa hai mẫu thời gian: kiểm tra tĩnh tại các mẫu
+    bỏ sót, còn sàng lọc TCA phát hiện được.
+    """
+    positions = np.array([[-5.0, 0.0, 0.0], [5.0, 0.2, 0.0]])
+    velocities = np.array([[1.0, 0.0, 0.0], [-1.0, 0.0, 0.0]])
+    radii = np.array([1.0, 1.0])
+    duration = 10.0
+
+    static_start, _ = screen_conjunctions(positions, radii)
+    static_end, _ = screen_conjunctions(positions + velocities * duration, radii)
+    pairs, t_ca, d_min = screen_conjunctions_tca(positions, velocities, radii, duration)
+
+    print("\n--- Time-Swept (TCA) Screening ---")
+    print(f"Static check at t=0 / t={duration}: {len(static_start)} / {len(static_end)} conflicts")
+    for (i, j), t, d in zip(pairs, t_ca, d_min):
+        print(f"TCA conflict ({i}, {j}): t_ca = {t:.3f}, d_min = {d:.3f}")
+
+# Số tick gần nhất IncrementalScreener giữ lại trong tick_times / rebuild_ticks
+TICK_HISTORY = 10_000
+
+class IncrementalScreener:
+    """
+    Sàng lọc va chạm theo từng tick mô phỏng với danh sách lân cận kiểu Verlet.
+    Danh sách cặp được dựng với bán kính nới rộng r + skin / 2 và chỉ dựng lại
+    khi có vật đã dịch chuyển hơn skin / 2 kể từ lần dựng trước; các tick còn lại
+    chỉ kiểm tra tích trong CGA trên các cặp đã lưu.
+    """
+
+    def __init__(self, radii, skin, history=TICK_HISTORY):
+        self.radii = np.asarray(radii, dtype=float)
+        self.skin = float(skin)
+        self.rebuild_count = 0
+        self.tick_count = 0
+        # Chỉ giữ history tick gần nhất (screener sống lâu, ví dụ screening_service);
+        # tổng / max tính dồn trên mọi tick
+        self.tick_times = deque(maxlen=history)     # Thời gian (s) của từng tick
+        self.rebuild_ticks = deque(maxlen=history)  # Chỉ số các tick phải dựng lại danh sách
+        self._total_tick_s = 0.0
+        self._max_tick_s = 0.0
+        self._reference_centers = None
+        self._pairs_i = np.empty(0, dtype=np.int64)
+        self._pairs_j = np.empty(0, dtype=np.int64)
+
+    def _rebuild(self, centers):
+        """Dựng lại danh sách cặp có d <= r_i + r_j + skin."""
+        pairs, _ = screen_conjunctions(centers, self.radii + 0.5 * self.skin)
+        self._pairs_i, self._pairs_j = pairs[:, 0], pairs[:, 1]
+        self._reference_centers = centers.copy()
+        self.rebuild_count += 1
+        self.rebuild_ticks.append(self.tick_count)
+
+    def needs_rebuild(self, centers):
+        """True nếu chưa có danh sách hoặc có vật đã dịch chuyển hơn skin / 2."""
+        if self._reference_centers is None:
+            return True
+        displacement_sq = np.einsum('ij,ij->i', centers - self._reference_centers,
+                                    centers - self._reference_centers)
+        return displacement_sq.max(initial=0.0) > (0.5 * self.skin) ** 2
+
+    def update(self, centers):
+        """
+        Xử lý một tick với vị trí tâm mới (N, 3).
+        Trả về (pairs, margins) giống screen_conjunctions.
+        """
+        t0 = time.perf_counter()
+        centers = _as_centers(centers)
+        if self.needs_rebuild(centers):
+            self._rebuild(centers)
+
+        margins = _margin_function(centers, self.radii)(self._pairs_i, self._pairs_j)
+        result = _sorted_conflicts(self._pairs_i, self._pairs_j, margins)
+
+        elapsed = time.perf_counter() - t0
+        self.tick_times.append(elapsed)
+        self._total_tick_s += elapsed
+        self._max_tick_s = max(self._max_tick_s, elapsed)
+        self.tick_count += 1
+        return result
+
+    @property
+    def neighbour_pair_count(self):
+        return len(self._pairs_i)
+
+    def stats(self):
+        """Tóm tắt để tinh chỉnh skin: số tick, số lần dựng lại, thời gian mỗi tick."""
+        return {
+            'ticks': self.tick_count,
+            'rebuilds': self.rebuild_count,
+            'neighbour_pairs': self.neighbour_pair_count,
+            'mean_tick_s': self._total_tick_s / self.tick_count if self.tick_count else 0.0,
+            'max_tick_s': self._max_tick_s,
+            'total_s': self._total_tick_s,
+        }
+
+def benchmark_incremental_screening(n_objects=20000, n_ticks=50, step=0.02, skins=(0.5, 1.0, 2.0)):
+    """So sánh IncrementalScreener với screen_conjunctions chạy lại từ đầu mỗi tick."""
+    centers, radii = random_catalogue(n_objects)
+    rng = np.random.default_rng(1)
+    velocities = rng.normal(0.0, step, size=centers.shape)
+    frames = [centers + velocities * k for k in range(n_ticks)]
+
+    t0 = time.perf_counter()
+    reference = [screen_conjunctions(frame, radii) for frame in frames]
+    t_full = time.perf_counter() - t0
+
+    print(f"\n--- Incremental Screening Benchmark (N={n_objects}, {n_ticks} ticks) ---")
+    print(f"Full re-screen every tick: {t_full:.4f} s")
+    for skin in skins:
+        screener = IncrementalScreener(radii, skin)
+        results = [screener.update(frame) for frame in frames]
+        same = all(np.array_equal(p, q) for (p, _), (q, _) in zip(results, reference))
+        st = screener.stats()
+        print(f"skin={skin:<4}: {st['total_s']:.4f} s, rebuilds={st['rebuilds']}, "
+              f"pairs={st['neighbour_pairs']}, mean tick={st['mean_tick_s'] * 1e3:.2f} ms, identical={same}")
+
+def random_catalogue(n_objects, seed=0, spacing=10.0):
+    """Danh mục ngẫu nhiên với mật độ cố định (khoảng cách trung bình ~ spacing)."""
+    rng = np.random.default_rng(seed)
+    box = spacing * n_objects ** (1.0 / 3.0)
+    centers = rng.uniform(0.0, box, size=(n_objects, 3))
+    radii = rng.uniform(0.5, 2.0, size=n_objects)
+    return centers, radii
+
+def benchmark_screening(sizes=(1000, 10000, 100000), bruteforce_limit=10000):
+    """Đo throughput của screen_conjunctions và đối chiếu với brute force."""
+    print("\n--- Conjunction Screening Benchmark ---")
+    for n in sizes:
+        centers, radii = random_catalogue(n)
+        t0 = time.perf_counter()
+        pairs, margins = screen_conjunctions(centers, radii)
+        t_hash = time.perf_counter() - t0
+        line = f"N={n:>7}: spatial hash {t_hash:.4f} s ({n / t_hash:,.0f} obj/s), {len(pairs)} conflicts"
+
+        if n <= bruteforce_limit:
+            t0 = time.perf_counter()
+            pairs_bf, margins_bf = screen_conjunctions_bruteforce(centers, radii)
+            t_bf = time.perf_counter() - t0
+            same = np.array_equal(pairs, pairs_bf) and np.allclose(margins, margins_bf)
+            line += f" | brute force {t_bf:.4f} s, identical={same}"
+        print(line)
+
+# --- SÀNG LỌC SONG SONG (PROCESS POOL + SHARED MEMORY) ---
+
+# Trạng thái của mỗi worker: các mảng gắn vào shared memory (được tạo trong initializer)
+_WORKER_STATE = {}
+# Không dùng fork: fork sau khi clifford / numba đã chạy (các demo) làm pool treo khi
+# thoát. Worker chỉ dựa vào initargs và các hàm cấp module, không kế thừa trạng thái.
+# Dùng chung cho mọi process pool của dự án (ví dụ batch_renderer.render_frames).
+POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+def _share_array(array):
+    """Sao chép mảng vào một khối shared memory mới; trả về (shm, spec để worker gắn vào)."""
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+def _init_screen_worker(specs, strides):
+    """Initializer của worker: gắn các mảng dùng chung, không pickle dữ liệu lớn."""
+    for key, (name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=name)
+        _WORKER_STATE[key + '_shm'] = shm
+        _WORKER_STATE[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    _WORKER_STATE['strides'] = strides
+    _WORKER_STATE['margins_of'] = _margin_function(_WORKER_STATE['centers'], _WORKER_STATE['radii'])
+
+def _screen_shard(start, stop):
+    """Xử lý các vật order[start:stop] (liền nhau theo ô lưới) trong một worker."""
+    st = _WORKER_STATE
+    i, j = _grid_candidates(st['keys'], st['strides'], st['order'], st['order'][start:stop])
+    return _sorted_conflicts(i, j, st['margins_of'](i, j))
+
+def screen_conjunctions_parallel(centers, radii, n_workers=None, cell_size=None, shards_per_worker=4):
+    """
+    Phiên bản đa tiến trình của screen_conjunctions.
+    Tâm, bán kính và lưới (khóa ô, thứ tự) được đặt trong multiprocessing.shared_memory;
+    mỗi shard là một dải liền nhau các vật đã sắp theo ô. Kết quả các worker được
+    ghép rồi sắp theo (i, j), nên trùng khớp hoàn toàn với bản một tiến trình.
+    """
+    centers = np.ascontiguousarray(_as_centers(centers))
+    radii = np.ascontiguousarray(
+        np.broadcast_to(np.asarray(radii, dtype=float), centers.shape[:1]))
+    n = len(centers)
+    n_workers = n_workers or os.cpu_count() or 1
+    if cell_size is None:
+        cell_size = _default_cell_size(radii)
+    if n == 0:
+        return np.empty((0, 2), dtype=np.int64), np.empty(0)
+
+    keys, strides, order = _build_grid(centers, cell_size)
+    blocks = [
+        _share_array(centers), _share_array(radii), _share_array(keys), _share_array(order),
+    ]
+    specs = dict(zip(('centers', 'radii', 'keys', 'order'), (spec for _, spec in blocks)))
+    try:
+        bounds = np.linspace(0, n, n_workers * shards_per_worker + 1).astype(int)
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_screen_worker,
+                                 initargs=(specs, strides),
+                                 mp_context=multiprocessing.get_context(POOL_START_METHOD)) as pool:
+            results = list(pool.map(_screen_shard, bounds[:-1], bounds[1:]))
+    finally:
+        for shm, _ in blocks:
+            shm.close()
+            shm.unlink()
+
+    pairs = np.concatenate([p for p, _ in results])
+    margins = np.concatenate([m for _, m in results])
+    order = np.lexsort((pairs[:, 1], pairs[:, 0]))
+    return pairs[order], margins[order]
+
+def benchmark_parallel_screening(n_objects=200000, max_workers=None):
+    """Báo cáo khả năng mở rộng 1..N worker và đối chiếu với bản một tiến trình."""
+    max_workers = max_workers or os.cpu_count() or 1
+    centers, radii = random_catalogue(n_objects)
+
+    t0 = time.perf_counter()
+    pairs_ref, margins_ref = screen_conjunctions(centers, radii)
+    t_single = time.perf_counter() - t0
+
+    print(f"\n--- Parallel Screening Scaling (N={n_objects}) ---")
+    print(f"single process: {t_single:.4f} s, {len(pairs_ref)} conflicts")
+    workers = 1
+    while True:
+        t0 = time.perf_counter()
+        pairs, margins = screen_conjunctions_parallel(centers, radii, n_workers=workers)
+        t_par = time.perf_counter() - t0
+        same = np.array_equal(pairs, pairs_ref) and np.array_equal(margins, margins_ref)
+        print(f"workers={workers:>3}: {t_par:.4f} s (speedup x{t_single / t_par:.2f}), identical={same}")
+        if workers >= max_workers:
+            break
+        workers = min(2 * workers, max_workers)
+
+
+# --- HÌNH HỌC CHỒNG LẤN CHO CÁC CẶP BỊ GẮN CỜ (MEET S1 ^ S2) ---
+
+def analyze_overlaps(centers, radii, pairs, tol=1e-9):
+    """
+    Đường tròn giao (tâm, pháp tuyến, bán kính), độ xuyên sâu và phân loại cho các cặp
+    pairs (K, 2) (ví dụ từ screen_conjunctions), một lần gọi sphere_meet_from_centers.
+    """
+    centers = np.asarray(centers, dtype=float)
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), centers.shape[:1])
+    i, j = pairs[:, 0], pairs[:, 1]
+    return sphere_meet_from_centers(centers[i], radii[i], centers[j], radii[j], tol=tol)
+
+def demo_overlap_analysis(n_objects=100000):
+    """Sàng lọc một danh mục ngẫu nhiên rồi phân tích hình học của mọi cặp bị gắn cờ."""
+    centers, radii = random_catalogue(n_objects)
+    pairs, _ = screen_conjunctions(centers, radii)
+    t0 = time.perf_counter()
+    meet = analyze_overlaps(centers, radii, pairs)
+    elapsed = time.perf_counter() - t0
+    print(f"\n--- Overlap Analysis ({len(pairs)} flagged pairs of {n_objects} objects) ---")
+    counts = np.bincount(meet.relation, minlength=len(SPHERE_RELATION_NAMES))
+    print(", ".join(f"{name} {count}" for name, count in zip(SPHERE_RELATION_NAMES, counts)) +
+          f" in {elapsed * 1e3:.1f} ms")
+    if len(pairs):
+        k = np.argmax(meet.depth)
+        print(f"Deepest pair {tuple(pairs[k].tolist())}: depth {meet.depth[k]:.3f}, "
+              f"{SPHERE_RELATION_NAMES[meet.relation[k]]}, circle radius {meet.radii[k]:.3f}")
+
 def demo_collision_avoidance():
     fig = plt.figure(figsize=(10, 8))
     ax = fig.add_subplot(111, projection='3d')
@@ -131,6 +586,9 @@ def demo_collision_avoidance():
     print(f"Distance between centers: {dist_euc:.3f}")
     print(f"Sum of radii (R1+R2): {R1 + R2:.3f}")
     print(f"Intersection Norm (S1 ^ S2): {intersection_norm:.3f}")
+    meet = sphere_meet_batch(S1_cga.value[None], S2_cga.value[None])
+    print(f"Meet classification: {SPHERE_RELATION_NAMES[meet.relation[0]]}, "
+          f"penetration depth {meet.depth[0]:.3f}")
 
     if intersection_norm > 1e-6:
         status = "POTENTIAL COLLISION (Intersection exists in CGA)"
@@ -150,3 +608,9 @@ def demo_collision_avoidance():
 
 if __name__ == '__main__':
     demo_collision_avoidance()
+    demo_tca_screening()
+    demo_overlap_analysis()
+    if '--benchmark' in sys.argv:
+        benchmark_screening()
+        benchmark_incremental_screening()
+        benchmark_parallel_screening()
@@ -0,0 +1,266 @@
+# src/application_line_of_sight.py (TẦM NHÌN THẲNG: ĐƯỜNG CGA vs SPHERE, HÀNG LOẠT)
+#
+# Mỗi liên kết là đoạn thẳng từ điểm A đến điểm B (đường CGA L = A ^ B ^ n_inf giới hạn
+# trong [A, B]). Với X(t) là điểm CGA tại a + t (b - a) và sphere đối ngẫu S:
+#     X(t) . S = (1 - t) A.S + t B.S - t (1 - t) A.B
+#              = A.B t^2 + (B.S - A.S - A.B) t + A.S
+# X(t) . S > 0 khi X(t) nằm trong sphere, nên đoạn bị che khi đa thức bậc hai này
+# dương trên [0, 1]; nghiệm nhỏ là điểm đi vào sphere. Các tích trong được tính trong
+# hệ tọa độ tịnh tiến về tâm sphere (bất biến qua translator) để tránh triệt tiêu số
+# học ở bán kính quỹ đạo.
+
+import sys
+import time
+from collections import namedtuple
+import numpy as np
+from src.ga_utilities import spheres_to_cga_null_batch, cga_null_inner_product_batch
+
+# visible (M,) bool, first_occluder (M,) chỉ số sphere che đầu tiên (-1 nếu không có),
+# entry (M,) tham số t in [0, 1] nơi đoạn đi vào sphere đó (NaN nếu không bị che)
+LineOfSight = namedtuple('LineOfSight', ['visible', 'first_occluder', 'entry'])
+
+DEFAULT_MAX_PIECES = 1 << 22
+DEFAULT_LINK_CHUNK = 1 << 13
+
+# 27 ô lân cận (gồm chính ô đó) cho truy vấn chéo đoạn -> sphere
+_FULL_NEIGHBOUR_OFFSETS = np.array(np.meshgrid([-1, 0, 1], [-1, 0, 1], [-1, 0, 1], indexing='ij')).reshape(3, -1).T
+
+# ----------------------------------------------------
+# 1. NARROW PHASE: ĐOẠN THẲNG vs SPHERE QUA TÍCH TRONG CGA
+# ----------------------------------------------------
+
+def segment_sphere_penetration(starts, ends, centers, radii):
+    """
+    Đoạn [starts[k], ends[k]] so với sphere (centers[k], radii[k]), tất cả dạng (K, ...).
+    Trả về (depth (K,), entry (K,)): depth = r - khoảng cách nhỏ nhất từ đoạn tới tâm
+    (> 0 là cắt sphere), entry = tham số t in [0, 1] nơi đoạn đi vào sphere.
+    """
+    a = starts - centers
+    b = ends - centers
+    r = np.asarray(radii, dtype=float)
+    A = spheres_to_cga_null_batch(a, 0.0)
+    B = spheres_to_cga_null_batch(b, 0.0)
+    S = spheres_to_cga_null_batch(np.zeros_like(a), r)
+    AS = cga_null_inner_product_batch(A, S)
+    BS = cga_null_inner_product_batch(B, S)
+    AB = cga_null_inner_product_batch(A, B)  # = -0.5 ||b - a||^2 <= 0
+
+    # X(t) . S = c2 t^2 + c1 t + c0, lõm (c2 <= 0): cực đại tại t* trong [0, 1]
+    c2, c1, c0 = AB, BS - AS - AB, AS
+    degenerate = c2 == 0.0  # Đoạn suy biến thành một điểm
+    safe_c2 = np.where(degenerate, -1.0, c2)
+    t_star = np.where(degenerate, 0.0, np.clip(-c1 / (2.0 * safe_c2), 0.0, 1.0))
+    f_star = (c2 * t_star + c1) * t_star + c0
+    d_min = np.sqrt(np.maximum(r**2 - 2.0 * f_star, 0.0))
+
+    disc = np.sqrt(np.maximum(c1**2 - 4.0 * c2 * c0, 0.0))
+    entry = np.where(degenerate, 0.0, np.clip((-c1 + disc) / (2.0 * safe_c2), 0.0, 1.0))
+    return r - d_min, entry
+
+# ----------------------------------------------------
+# 2. BROAD PHASE: CHIA ĐOẠN THÀNH CÁC MẢNH TRÊN LƯỚI
+# ----------------------------------------------------
+
+def _segment_pieces(starts, ends, piece_length):
+    """Chia mỗi đoạn thành các mảnh dài <= piece_length: (chỉ số đoạn, trung điểm mảnh)."""
+    lengths = np.linalg.norm(ends - starts, axis=1)
+    counts = np.maximum(np.ceil(lengths / piece_length).astype(np.int64), 1)
+    link = np.repeat(np.arange(len(starts)), counts)
+    first = np.repeat(np.cumsum(counts) - counts, counts)
+    t_mid = (np.arange(counts.sum()) - first + 0.5) / counts[link]
+    mids = starts[link] + t_mid[:, None] * (ends[link] - starts[link])
+    return link, mids
+
+class _SphereGrid:
+    """
+    Lưới cố định (gốc, cạnh ô) chứa các sphere nhỏ. Mỗi sphere được ghi vào 27 ô quanh
+    ô của nó, nên truy vấn một điểm chỉ cần tra đúng một ô (một cặp searchsorted).
+    """
+
+    def __init__(self, centers, bounds_min, bounds_max, cell_size):
+        self.cell_size = cell_size
+        self.origin = bounds_min - 2.0 * cell_size
+        dims = np.floor((bounds_max - self.origin) / cell_size).astype(np.int64) + 3
+        if np.prod(dims.astype(float)) >= 2.0**62:
+            raise ValueError("cell_size quá nhỏ so với phạm vi tọa độ (tràn khóa lưới)")
+        self.strides = np.array([dims[1] * dims[2], dims[2], 1], dtype=np.int64)
+        dilated = (self.keys(centers)[:, None] + _FULL_NEIGHBOUR_OFFSETS @ self.strides).ravel()
+        self.order = np.argsort(dilated, kind='stable')
+        self.sorted_keys = dilated[self.order]
+        self.order //= len(_FULL_NEIGHBOUR_OFFSETS)  # Vị trí trong mảng dãn -> chỉ số sphere
+
+    def keys(self, points):
+        cells = np.floor((points - self.origin) / self.cell_size).astype(np.int64)
+        return cells @ self.strides
+
+    def candidates(self, points):
+        """Các cặp (chỉ số điểm, chỉ số sphere) có sphere nằm trong 27 ô quanh điểm."""
+        query_keys = self.keys(points)
+        lo = np.searchsorted(self.sorted_keys, query_keys, side='left')
+        counts = np.searchsorted(self.sorted_keys, query_keys, side='right') - lo
+        total = counts.sum()
+        start = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+        return np.repeat(np.arange(len(points)), counts), self.order[start + np.arange(total)]
+
+# ----------------------------------------------------
+# 3. TRUY VẤN HÀNG LOẠT
+# ----------------------------------------------------
+
+def _excluded(link, sphere, exclude):
+    if exclude is None:
+        return np.zeros(len(link), dtype=bool)
+    return (exclude[link] == sphere[:, None]).any(axis=1)
+
+def line_of_sight(starts, ends, centers, radii, exclude=None, dense_radius=None,
+                  piece_length=None, max_pieces=DEFAULT_MAX_PIECES, tolerance=1e-6,
+                  link_chunk=DEFAULT_LINK_CHUNK):
+    """
+    Tầm nhìn thẳng của M liên kết (starts, ends dạng (M, 3)) so với N sphere
+    (centers (N, 3), radii (N,)). Liên kết bị che nếu đoạn thẳng đi sâu hơn tolerance
+    vào một sphere (tiếp xúc, ví dụ trạm mặt đất nằm đúng trên bề mặt Trái Đất, vẫn thấy).
+
+    - exclude: (M, k) chỉ số sphere bỏ qua cho từng liên kết (ví dụ sphere của chính hai
+      vệ tinh đầu mút), -1 để trống.
+    - Sphere có bán kính > dense_radius (mặc định 10 x trung vị, ví dụ Trái Đất) được
+      kiểm tra với mọi liên kết. Các sphere còn lại qua broad phase: mỗi đoạn được chia
+      thành mảnh dài piece_length (mặc định >= 2 r_max, tổng số mảnh <= max_pieces)
+      và tra lưới có cạnh ô = piece_length.
+    - Xử lý theo khối link_chunk liên kết để giới hạn bộ nhớ.
+    Trả về LineOfSight(visible, first_occluder, entry).
+    """
+    starts = np.atleast_2d(np.asarray(starts, dtype=float))
+    ends = np.atleast_2d(np.asarray(ends, dtype=float))
+    centers = np.atleast_2d(np.asarray(centers, dtype=float)).reshape(-1, 3)
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), centers.shape[:1])
+    if exclude is not None:
+        exclude = np.asarray(exclude, dtype=np.int64).reshape(len(starts), -1)
+    m = len(starts)
+
+    if dense_radius is None:
+        dense_radius = 10.0 * np.median(radii) if len(radii) else 0.0
+    dense = np.flatnonzero(radii > dense_radius)
+    small = np.flatnonzero(radii <= dense_radius)
+
+    grid = None
+    if len(small) and m:
+        r_max = radii[small].max()
+        if piece_length is None:
+            total_length = np.linalg.norm(ends - starts, axis=1).sum()
+            piece_length = max(2.0 * r_max, total_length / max_pieces)
+        piece_length = max(piece_length, 2.0 * r_max)
+        # Một mảnh (nửa độ dài h = piece_length / 2) chạm sphere bán kính r <= r_max chỉ khi
+        # tâm sphere cách trung điểm mảnh <= h + r_max <= piece_length: luôn trong 27 ô.
+        everything = np.vstack([centers[small], starts, ends])
+        grid = _SphereGrid(centers[small], everything.min(axis=0), everything.max(axis=0), piece_length)
+
+    visible = np.ones(m, dtype=bool)
+    first_occluder = np.full(m, -1, dtype=np.int64)
+    entry = np.full(m, np.nan)
+
+    for lo in range(0, m, link_chunk):
+        hi = min(lo + link_chunk, m)
+        s_chunk, e_chunk = starts[lo:hi], ends[lo:hi]
+        links, spheres = [], []
+
+        # Sphere lớn: kiểm tra dày đặc (m_chunk x D)
+        if len(dense):
+            links.append(np.repeat(np.arange(lo, hi), len(dense)))
+            spheres.append(np.tile(dense, hi - lo))
+
+        # Sphere nhỏ: mảnh đoạn thẳng -> ô lưới -> cặp (liên kết, sphere) duy nhất
+        if grid is not None:
+            piece_link, mids = _segment_pieces(s_chunk, e_chunk, grid.cell_size)
+            q, s = grid.candidates(mids)
+            pair_keys = np.unique((piece_link[q] + lo) * len(centers) + small[s])
+            links.append(pair_keys // len(centers))
+            spheres.append(pair_keys % len(centers))
+
+        if not links:
+            continue
+        link = np.concatenate(links)
+        sphere = np.concatenate(spheres)
+        keep = ~_excluded(link, sphere, exclude)
+        link, sphere = link[keep], sphere[keep]
+
+        depth, t_in = segment_sphere_penetration(starts[link], ends[link], centers[sphere], radii[sphere])
+        hit = depth > tolerance
+        link, sphere, t_in = link[hit], sphere[hit], t_in[hit]
+
+        # Sphere che đầu tiên: entry nhỏ nhất, hòa thì chỉ số sphere nhỏ nhất
+        order = np.lexsort((sphere, t_in, link))
+        link, sphere, t_in = link[order], sphere[order], t_in[order]
+        first = np.flatnonzero(np.r_[True, link[1:] != link[:-1]]) if len(link) else np.empty(0, dtype=int)
+        visible[link[first]] = False
+        first_occluder[link[first]] = sphere[first]
+        entry[link[first]] = t_in[first]
+
+    return LineOfSight(visible, first_occluder, entry)
+
+def line_of_sight_bruteforce(starts, ends, centers, radii, exclude=None, tolerance=1e-6):
+    """Tham chiếu O(M * N): mọi liên kết với mọi sphere. Cùng định dạng với line_of_sight."""
+    return line_of_sight(starts, ends, centers, radii, exclude=exclude, tolerance=tolerance,
+                         dense_radius=-1.0, link_chunk=max(1, (1 << 22) // max(len(centers), 1)))
+
+# ----------------------------------------------------
+# 4. DEMO / BENCHMARK
+# ----------------------------------------------------
+EARTH_RADIUS = 6378.137  # km
+
+def random_link_scenario(n_links=100_000, n_satellites=10_000, n_stations=200,
+                         keep_out=10.0, seed=0):
+    """
+    Trái Đất + n_satellites vệ tinh LEO (keep-out keep_out km); một nửa số liên kết là
+    trạm mặt đất -> vệ tinh, nửa còn lại vệ tinh -> vệ tinh.
+    Trả về (starts, ends, centers, radii, exclude); sphere 0 là Trái Đất.
+    """
+    rng = np.random.default_rng(seed)
+
+    def on_sphere(n, radius):
+        d = rng.normal(size=(n, 3))
+        return d * (radius / np.linalg.norm(d, axis=1))[:, None]
+
+    satellites = on_sphere(n_satellites, 1.0) * rng.uniform(6778.0, 7578.0, n_satellites)[:, None]
+    stations = on_sphere(n_stations, EARTH_RADIUS)
+    centers = np.vstack([np.zeros((1, 3)), satellites])
+    radii = np.r_[EARTH_RADIUS, np.full(n_satellites, keep_out)]
+
+    n_ground = n_links // 2
+    ground_sta = rng.integers(0, n_stations, n_ground)
+    ground_sat = rng.integers(0, n_satellites, n_ground)
+    sat_a = rng.integers(0, n_satellites, n_links - n_ground)
+    sat_b = (sat_a + rng.integers(1, n_satellites, n_links - n_ground)) % n_satellites
+
+    starts = np.vstack([stations[ground_sta], satellites[sat_a]])
+    ends = np.vstack([satellites[ground_sat], satellites[sat_b]])
+    # Bỏ qua sphere của chính các vệ tinh đầu mút (chỉ số sphere = chỉ số vệ tinh + 1)
+    exclude = np.column_stack([
+        np.r_[np.full(n_ground, -1), sat_a + 1],
+        np.r_[ground_sat + 1, sat_b + 1],
+    ])
+    return starts, ends, centers, radii, exclude
+
+def benchmark_line_of_sight(n_links=100_000, n_satellites=10_000, check_links=2000):
+    starts, ends, centers, radii, exclude = random_link_scenario(n_links, n_satellites)
+    print(f"\n--- Line-of-Sight Benchmark ({n_links} links x {len(centers)} spheres) ---")
+    t0 = time.perf_counter()
+    result = line_of_sight(starts, ends, centers, radii, exclude=exclude)
+    elapsed = time.perf_counter() - t0
+    by_earth = np.count_nonzero(result.first_occluder == 0)
+    by_objects = np.count_nonzero(result.first_occluder > 0)
+    print(f"Broad phase + CGA narrow phase: {elapsed:.3f} s ({n_links / elapsed:,.0f} links/s)")
+    print(f"Visible {np.count_nonzero(result.visible)}, blocked by Earth {by_earth}, "
+          f"by keep-out spheres {by_objects}")
+
+    idx = np.random.default_rng(1).choice(n_links, size=min(check_links, n_links), replace=False)
+    t0 = time.perf_counter()
+    reference = line_of_sight_bruteforce(starts[idx], ends[idx], centers, radii, exclude=exclude[idx])
+    t_ref = time.perf_counter() - t0
+    same = (np.array_equal(reference.visible, result.visible[idx])
+            and np.array_equal(reference.first_occluder, result.first_occluder[idx]))
+    print(f"Brute force on {len(idx)} links: {t_ref:.3f} s, identical={same}")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        benchmark_line_of_sight(int(sys.argv[1]))
+    else:
+        benchmark_line_of_sight()
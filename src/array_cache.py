@@ -0,0 +1,309 @@
+# src/array_cache.py (CACHE TRÊN ĐĨA THEO NỘI DUNG CHO MẢNG GA VÀ KẾT QUẢ SÀNG LỌC)
+#
+# Dùng:
+#     cache = ArrayCache('.geosat_cache', max_bytes=2 << 30)
+#     S = cached_spheres_to_cga(cache, centers, radii, null_basis=True)
+#     M = cached_compile_versor(cache, T, null_basis=True)
+#     pairs, margins = cached_screen_conjunctions(cache, centers, radii)
+#     print(cache.stats())
+#
+# Khóa = sha256 của (tên bước, phiên bản định dạng, tham số, dtype / shape / byte của
+# từng mảng đầu vào): chạy lại cùng một kịch bản thì bỏ qua hẳn bước tính. Mỗi mục là
+# một file .npz (nén tùy chọn) hoặc một thư mục .npy đọc bằng memory-map. Khi tổng dung
+# lượng vượt max_bytes, các mục ít được dùng gần đây nhất (theo mtime, được cập nhật
+# mỗi lần hit) bị xóa. Thư mục mặc định lấy từ biến môi trường GEOSAT_ARRAY_CACHE.
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+from collections import Counter
+import numpy as np
+from src.ga_utilities import (
+    spheres_to_cga_batch, spheres_to_cga_null_batch, compile_versor, MixedNullSpheres,
+)
+from src.application_collision_avoidance import screen_conjunctions, random_catalogue
+
+ARRAY_CACHE_ENV = 'GEOSAT_ARRAY_CACHE'
+# Tăng khi thay đổi cách tính của một bước: mọi khóa cũ tự mất hiệu lực
+CACHE_FORMAT = 2
+DEFAULT_MAX_BYTES = 1 << 30
+_HASH_BLOCK = 1 << 24  # byte
+
+# ----------------------------------------------------
+# 1. KHÓA THEO NỘI DUNG
+# ----------------------------------------------------
+
+def _hash_array(h, array):
+    array = np.ascontiguousarray(array)
+    h.update(f"{array.dtype.str}{array.shape}".encode())
+    data = memoryview(array.reshape(-1).view(np.uint8))
+    for start in range(0, len(data), _HASH_BLOCK):
+        h.update(data[start:start + _HASH_BLOCK])
+
+def content_key(stage, arrays=(), params=None):
+    """Khóa sha256 (hex) của một bước: tên, CACHE_FORMAT, tham số (JSON) và các mảng đầu vào."""
+    h = hashlib.sha256()
+    h.update(f"{stage}\0{CACHE_FORMAT}\0".encode())
+    h.update(json.dumps(params or {}, sort_keys=True, default=repr).encode())
+    for array in arrays:
+        _hash_array(h, np.asarray(array))
+    return h.hexdigest()
+
+# ----------------------------------------------------
+# 2. CACHE
+# ----------------------------------------------------
+
+class ArrayCache:
+    """
+    Cache mảng trên đĩa, khóa theo nội dung, loại bỏ LRU khi vượt max_bytes.
+    storage='npz': một file .npz mỗi mục (compress=True để nén);
+    storage='mmap': một thư mục .npy mỗi mục, đọc lại bằng memory-map chỉ đọc.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, storage='npz', compress=True):
+        if storage not in ('npz', 'mmap'):
+            raise ValueError("storage phải là 'npz' hoặc 'mmap'")
+        directory = directory or os.environ.get(ARRAY_CACHE_ENV) or os.path.join(
+            tempfile.gettempdir(), 'geosat_array_cache')
+        self.directory = directory
+        self.max_bytes = int(max_bytes)
+        self.storage = storage
+        self.compress = compress
+        self.hits = Counter()
+        self.misses = Counter()
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+    # --- Đường dẫn / liệt kê mục ---
+
+    def _path(self, stage, key):
+        suffix = '.npz' if self.storage == 'npz' else '.npyd'
+        return os.path.join(self.directory, f"{stage}-{key}{suffix}")
+
+    @staticmethod
+    def _entry_size(path):
+        if os.path.isdir(path):
+            return sum(entry.stat().st_size for entry in os.scandir(path))
+        return os.path.getsize(path)
+
+    def entries(self):
+        """Danh sách (path, stage, size, mtime) của các mục, cũ nhất trước."""
+        found = []
+        for entry in os.scandir(self.directory):
+            name, ext = os.path.splitext(entry.name)
+            if ext not in ('.npz', '.npyd') or '-' not in name:
+                continue
+            try:
+                found.append((entry.path, name.rsplit('-', 1)[0], self._entry_size(entry.path),
+                              entry.stat().st_mtime))
+            except FileNotFoundError:  # Bị tiến trình khác xóa
+                continue
+        return sorted(found, key=lambda item: item[3])
+
+    # --- Đọc / ghi ---
+
+    def get(self, stage, key):
+        """Dict tên -> mảng của mục, hoặc None nếu chưa có."""
+        for storage in ('npz', 'mmap'):
+            path = os.path.join(self.directory, f"{stage}-{key}" + ('.npz' if storage == 'npz' else '.npyd'))
+            try:
+                if storage == 'npz':
+                    with np.load(path, allow_pickle=False) as data:
+                        result = {name: data[name] for name in data.files}
+                else:
+                    result = {
+                        os.path.splitext(name)[0]: np.load(os.path.join(path, name), mmap_mode='r')
+                        for name in os.listdir(path)
+                    }
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            os.utime(path)  # Đánh dấu mới dùng cho LRU
+            return result
+        return None
+
+    def put(self, stage, key, arrays):
+        """Ghi một mục (ghi vào file tạm rồi đổi tên: an toàn khi nhiều tiến trình cùng ghi)."""
+        path = self._path(stage, key)
+        tmp = tempfile.mkdtemp(dir=self.directory, prefix='.tmp-')
+        try:
+            if self.storage == 'npz':
+                target = os.path.join(tmp, 'entry.npz')
+                (np.savez_compressed if self.compress else np.savez)(target, **arrays)
+                os.replace(target, path)
+            else:
+                for name, array in arrays.items():
+                    np.save(os.path.join(tmp, name + '.npy'), np.asarray(array))
+                try:
+                    os.rename(tmp, path)
+                    tmp = None
+                except OSError:  # Đã có mục (tiến trình khác vừa ghi)
+                    pass
+        finally:
+            if tmp is not None:
+                shutil.rmtree(tmp, ignore_errors=True)
+        self.trim()
+
+    def get_or_compute(self, stage, arrays, params, compute):
+        """
+        Trả về dict mảng của bước stage cho đầu vào (arrays, params); nếu chưa có trong
+        cache thì gọi compute() (trả về dict tên -> mảng) và lưu lại.
+        """
+        key = content_key(stage, arrays, params)
+        result = self.get(stage, key)
+        if result is not None:
+            self.hits[stage] += 1
+            return result
+        self.misses[stage] += 1
+        result = {name: np.asarray(value) for name, value in compute().items()}
+        self.put(stage, key, result)
+        return result
+
+    # --- Loại bỏ / vô hiệu hóa ---
+
+    def _remove(self, path):
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def trim(self, max_bytes=None):
+        """Xóa các mục cũ nhất (theo mtime) cho tới khi tổng dung lượng <= max_bytes."""
+        max_bytes = self.max_bytes if max_bytes is None else int(max_bytes)
+        entries = self.entries()
+        total = sum(size for _, _, size, _ in entries)
+        for path, _, size, _ in entries:
+            if total <= max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            self.evictions += 1
+
+    def invalidate(self, stage=None, key=None):
+        """Xóa một mục (stage, key), mọi mục của stage, hoặc toàn bộ cache (không đối số)."""
+        removed = 0
+        for path, entry_stage, _, _ in self.entries():
+            name = os.path.splitext(os.path.basename(path))[0]
+            if stage is not None and entry_stage != stage:
+                continue
+            if key is not None and not name.endswith('-' + key):
+                continue
+            self._remove(path)
+            removed += 1
+        return removed
+
+    def stats(self):
+        """Số liệu: hits / misses / hit_rate theo từng bước và tổng, số mục, dung lượng."""
+        entries = self.entries()
+        stages = sorted(set(self.hits) | set(self.misses))
+        per_stage = {
+            stage: {'hits': self.hits[stage], 'misses': self.misses[stage],
+                    'hit_rate': self.hits[stage] / (self.hits[stage] + self.misses[stage])}
+            for stage in stages
+        }
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        return {
+            'hits': hits, 'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'evictions': self.evictions, 'entries': len(entries),
+            'bytes': sum(size for _, _, size, _ in entries), 'max_bytes': self.max_bytes,
+            'stages': per_stage,
+        }
+
+# ----------------------------------------------------
+# 3. CÁC BƯỚC ĐƯỢC CACHE
+# ----------------------------------------------------
+
+def cached_spheres_to_cga(cache, centers, radii, null_basis=False, grade1_only=True, dtype=np.float64):
+    """
+    spheres_to_cga_null_batch (null_basis=True) hoặc spheres_to_cga_batch qua cache.
+    dtype: kiểu lưu kết quả của spheres_to_cga_null_batch (float32 -> MixedNullSpheres),
+    là một phần của khóa; cơ sở e4/e5 chỉ hỗ trợ float64. Bán kính luôn là float64.
+    """
+    dtype = np.dtype(dtype)
+    if not null_basis and dtype != np.float64:
+        raise ValueError("spheres_to_cga_batch chỉ trả về float64; dùng null_basis=True cho dtype khác")
+    centers = np.asarray(centers)
+    radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), centers.shape[:1])
+    if null_basis:
+        def compute():
+            S = spheres_to_cga_null_batch(centers, radii, dtype=dtype)
+            return S._asdict() if isinstance(S, MixedNullSpheres) else {'spheres': S}
+    else:
+        compute = lambda: {'spheres': spheres_to_cga_batch(centers, radii, grade1_only=grade1_only)}
+    params = {'null_basis': null_basis, 'grade1_only': grade1_only, 'dtype': dtype.str}
+    result = cache.get_or_compute('embedding', (centers, radii), params, compute)
+    return MixedNullSpheres(result['coords'], result['b']) if 'b' in result else result['spheres']
+
+def cached_compile_versor(cache, V, full=False, null_basis=False):
+    """compile_versor qua cache, khóa theo hệ số và số chiều đại số của versor V."""
+    params = {'dims': V.layout.gaDims, 'full': full, 'null_basis': null_basis}
+    compute = lambda: {'matrix': compile_versor(V, full=full, null_basis=null_basis)}
+    return cache.get_or_compute('versor', (V.value,), params, compute)['matrix']
+
+def cached_screen_conjunctions(cache, centers, radii, cell_size=None):
+    """screen_conjunctions qua cache; trả về (pairs, margins)."""
+    centers = np.asarray(centers)
+    radii = np.asarray(radii, dtype=float)
+
+    def compute():
+        pairs, margins = screen_conjunctions(centers, radii, cell_size=cell_size)
+        return {'pairs': pairs, 'margins': margins}
+
+    result = cache.get_or_compute('screening', (centers, radii), {'cell_size': cell_size}, compute)
+    return result['pairs'], result['margins']
+
+# ----------------------------------------------------
+# 4. DEMO: CHẠY LẠI CÙNG MỘT KỊCH BẢN
+# ----------------------------------------------------
+
+def _scenario(cache, centers, radii, shifts):
+    from src.ga_utilities import create_translator, create_vector, apply_compiled_versor
+    S = cached_spheres_to_cga(cache, centers, radii, null_basis=True)
+    moved = S
+    for shift in shifts:
+        M = cached_compile_versor(cache, create_translator(create_vector(*shift)), null_basis=True)
+        moved = apply_compiled_versor(M, moved)
+    pairs, margins = cached_screen_conjunctions(cache, centers, radii)
+    return S, moved, pairs, margins
+
+def demo_array_cache(n_objects=200_000, storage='npz'):
+    centers, radii = random_catalogue(n_objects)
+    shifts = [(0.5 * k, -0.25 * k, 1.0) for k in range(1, 9)]
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"\n--- Array Cache Demo (N = {n_objects}, storage = {storage}) ---")
+        cache = ArrayCache(directory, storage=storage)
+        for run in ('cold', 'warm'):
+            t0 = time.perf_counter()
+            result = _scenario(cache, centers, radii, shifts)
+            print(f"{run:>5} run: {time.perf_counter() - t0:.3f} s, {len(result[2])} conflicts, "
+                  f"hit rate {cache.stats()['hit_rate']:.0%}")
+            if run == 'cold':
+                reference = result
+        same = all(np.array_equal(a, b) for a, b in zip(reference, result))
+        stats = cache.stats()
+        print(f"Warm results identical: {same}; {stats['entries']} entries, {stats['bytes'] / 2**20:.1f} MiB")
+        print("Per stage: " + ", ".join(f"{name} {s['hits']}/{s['hits'] + s['misses']}"
+                                        for name, s in stats['stages'].items()))
+
+        # Đổi một tham số: chỉ bước bị ảnh hưởng tính lại
+        perturbed = centers.copy()
+        perturbed[0, 0] += 1e-9
+        misses = sum(cache.misses.values())
+        _scenario(cache, perturbed, radii, shifts)
+        print(f"After perturbing one coordinate: {sum(cache.misses.values()) - misses} stages recomputed")
+
+        # Giới hạn dung lượng: chỉ giữ các mục mới dùng gần nhất
+        cache.trim(stats['bytes'] // 2)
+        print(f"Trim to half size: {cache.stats()['entries']} entries left, {cache.evictions} evicted")
+        print(f"Invalidate 'versor': {cache.invalidate('versor')} entries removed")
+
+if __name__ == '__main__':
+    demo_array_cache(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
+    demo_array_cache(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000, storage='mmap')
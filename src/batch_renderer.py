@@ -0,0 +1,259 @@
+# src/batch_renderer.py (RENDER KHÔNG GIAO DIỆN CHO CHUỖI KHUNG HÌNH CHÒM VỆ TINH)
+#
+# - Mesh cầu đơn vị được tính một lần (cache), mỗi vệ tinh chỉ là phép co giãn + tịnh tiến.
+# - Quần thể lớn: một scatter (point sprite) hoặc một Poly3DCollection gộp, không phải
+#   một artist cho mỗi vệ tinh.
+# - Backend Agg qua Figure/FigureCanvasAgg trực tiếp (không dùng pyplot, không cần màn hình).
+# - Chuỗi khung hình được chia cho các worker process; mỗi worker dựng một FrameRenderer
+#   (một Figure) trong initializer và dùng lại cho mọi khối khung hình.
+
+import os
+import sys
+import time
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from mpl_toolkits.mplot3d import Axes3D  # Đăng ký projection='3d'
+from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+
+OUTPUT_DIR = '5_Results_Analysis'
+FRAMES_DIR = os.path.join(OUTPUT_DIR, 'frames')
+
+# ----------------------------------------------------
+# 1. MESH CẦU ĐƠN VỊ (CACHE)
+# ----------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def unit_sphere_mesh(resolution=50):
+    """Lưới (x, y, z) của cầu đơn vị, dạng (resolution, resolution) như plot_surface. Chỉ đọc."""
+    u = np.linspace(0, 2 * np.pi, resolution)
+    v = np.linspace(0, np.pi, resolution)
+    mesh = np.stack([
+        np.outer(np.cos(u), np.sin(v)),
+        np.outer(np.sin(u), np.sin(v)),
+        np.outer(np.ones(resolution), np.cos(v)),
+    ])
+    mesh.setflags(write=False)
+    return mesh
+
+@functools.lru_cache(maxsize=None)
+def unit_sphere_faces(resolution=10):
+    """Các tứ giác (F, 4, 3) của cầu đơn vị, dùng cho Poly3DCollection gộp. Chỉ đọc."""
+    x, y, z = unit_sphere_mesh(resolution)
+    grid = np.stack([x, y, z], axis=-1)
+    faces = np.stack([grid[:-1, :-1], grid[1:, :-1], grid[1:, 1:], grid[:-1, 1:]], axis=2)
+    faces = np.ascontiguousarray(faces.reshape(-1, 4, 3))
+    faces.setflags(write=False)
+    return faces
+
+def sphere_surface(center, radius, resolution=50):
+    """Lưới (x, y, z) của một cầu tâm center bán kính radius, từ mesh đơn vị đã cache."""
+    x, y, z = unit_sphere_mesh(resolution)
+    return center[0] + radius * x, center[1] + radius * y, center[2] + radius * z
+
+def merged_sphere_faces(centers, radii, resolution=10):
+    """Tứ giác của N cầu trong một mảng (N * F, 4, 3), tính bằng broadcasting."""
+    faces = unit_sphere_faces(resolution)
+    centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), (len(centers),))
+    merged = centers[:, None, None, :] + radii[:, None, None, None] * faces[None]
+    return merged.reshape(-1, 4, 3)
+
+# ----------------------------------------------------
+# 2. LEVEL OF DETAIL
+# ----------------------------------------------------
+
+def lod_split(centers, focus=None, lod_distance=None, max_meshes=200):
+    """
+    Chia vệ tinh thành (chỉ số vẽ mesh, chỉ số vẽ point sprite). Vật thể cách focus
+    dưới lod_distance (tối đa max_meshes vật thể gần nhất) được vẽ mesh; lod_distance=None
+    vẽ toàn bộ bằng sprite.
+    """
+    n = len(centers)
+    if lod_distance is None or n == 0:
+        return np.empty(0, dtype=np.intp), np.arange(n)
+    focus = np.zeros(3) if focus is None else np.asarray(focus, dtype=float)
+    dist = np.linalg.norm(centers - focus, axis=1)
+    near = np.flatnonzero(dist < lod_distance)
+    if len(near) > max_meshes:
+        near = near[np.argsort(dist[near], kind='stable')[:max_meshes]]
+        near.sort()
+    far = np.ones(n, dtype=bool)
+    far[near] = False
+    return near, np.flatnonzero(far)
+
+# ----------------------------------------------------
+# 3. VẼ MỘT KHUNG HÌNH
+# ----------------------------------------------------
+
+class FrameRenderer:
+    """
+    Một Figure Agg dùng lại cho nhiều khung hình: artist sprite / mesh được cập nhật
+    dữ liệu thay vì tạo lại.
+    """
+
+    def __init__(self, limit, size_inches=8.0, dpi=100, title='', mesh_resolution=10,
+                 color='tab:blue', mesh_color='tab:red', elev=30, azim=45):
+        self.figure = Figure(figsize=(size_inches, size_inches), dpi=dpi)
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot(111, projection='3d')
+        self.ax.set_xlim([-limit, limit])
+        self.ax.set_ylim([-limit, limit])
+        self.ax.set_zlim([-limit, limit])
+        self.ax.set_xlabel('X')
+        self.ax.set_ylabel('Y')
+        self.ax.set_zlabel('Z')
+        self.ax.view_init(elev=elev, azim=azim)
+        self.ax.set_box_aspect((1, 1, 1))
+        self.title = title
+        self.limit = limit
+        self.mesh_resolution = mesh_resolution
+        self.color = color
+        self.mesh_color = mesh_color
+        self.sprites = None
+        self.meshes = None
+        # Kích thước sprite (points^2) ứng với bán kính theo đơn vị dữ liệu
+        self.points_per_unit = 0.5 * size_inches * 72.0 / limit
+
+    def draw(self, centers, radii, focus=None, lod_distance=None, max_meshes=200, label=''):
+        near, far = lod_split(centers, focus, lod_distance, max_meshes)
+
+        sizes = np.maximum((radii[far] * self.points_per_unit) ** 2, 1.0)
+        if self.sprites is None:
+            self.sprites = self.ax.scatter(centers[far, 0], centers[far, 1], centers[far, 2],
+                                           s=sizes, c=self.color, marker='o', linewidths=0,
+                                           depthshade=False)
+        else:
+            self.sprites._offsets3d = (centers[far, 0], centers[far, 1], centers[far, 2])
+            self.sprites.set_sizes(sizes)
+
+        faces = merged_sphere_faces(centers[near], radii[near], self.mesh_resolution)
+        if self.meshes is None:
+            self.meshes = Poly3DCollection(faces, facecolor=self.mesh_color, edgecolor='none', alpha=0.4)
+            self.ax.add_collection3d(self.meshes)
+        else:
+            self.meshes.set_verts(faces)
+
+        self.ax.set_title(f"{self.title} {label}".strip())
+        return len(near), len(far)
+
+    def save(self, path):
+        self.figure.savefig(path)
+
+# ----------------------------------------------------
+# 4. RENDER CHUỖI KHUNG HÌNH SONG SONG
+# ----------------------------------------------------
+
+# Renderer (một Figure) của worker, dựng một lần trong initializer và dùng cho mọi khối
+_WORKER_RENDERER = None
+
+def _init_render_worker(renderer_options):
+    global _WORKER_RENDERER
+    _WORKER_RENDERER = FrameRenderer(**renderer_options)
+
+def _render_chunk(frame_ids, positions, radii, output_dir, prefix, options, renderer=None):
+    renderer = renderer or _WORKER_RENDERER
+    paths = []
+    for k, centers in zip(frame_ids, positions):
+        renderer.draw(centers, radii, label=f"t={k}", **options)
+        path = os.path.join(output_dir, f"{prefix}_{k:05d}.png")
+        renderer.save(path)
+        paths.append(path)
+    return paths
+
+def render_frames(positions, radii, output_dir=FRAMES_DIR, prefix='frame', n_workers=None,
+                  frames_per_task=8, limit=None, focus=None, lod_distance=None, max_meshes=200,
+                  title='Constellation', **renderer_options):
+    """
+    Render chuỗi khung hình positions (T, N, 3) — có thể là memmap — thành PNG
+    output_dir/{prefix}_{k:05d}.png. Các khối frames_per_task khung hình được chia cho
+    n_workers process (mặc định os.cpu_count(); 1 = chạy tại chỗ); mỗi process dựng
+    một FrameRenderer duy nhất. Trả về danh sách đường dẫn.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    T = len(positions)
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), (positions.shape[1],)).copy()
+    if limit is None:
+        limit = float(np.abs(positions[0]).max() + radii.max()) if T else 1.0
+    options = dict(focus=focus, lod_distance=lod_distance, max_meshes=max_meshes)
+    renderer_options = dict(limit=limit, title=title, **renderer_options)
+
+    chunks = [np.arange(s, min(s + frames_per_task, T)) for s in range(0, T, frames_per_task)]
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers == 1:
+        renderer = FrameRenderer(**renderer_options)
+        results = [_render_chunk(ids, positions[ids[0]:ids[-1] + 1], radii, output_dir, prefix,
+                                 options, renderer) for ids in chunks]
+    else:
+        # Không fork (treo khi thoát nếu clifford / numba đã chạy): dùng chung lựa chọn
+        # start method với sàng lọc song song
+        from src.application_collision_avoidance import POOL_START_METHOD
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_render_worker,
+                                 initargs=(renderer_options,),
+                                 mp_context=multiprocessing.get_context(POOL_START_METHOD)) as pool:
+            futures = [pool.submit(_render_chunk, ids, np.asarray(positions[ids[0]:ids[-1] + 1]),
+                                   radii, output_dir, prefix, options) for ids in chunks]
+            results = [f.result() for f in futures]
+    return [path for chunk in results for path in chunk]
+
+# ----------------------------------------------------
+# 5. DEMO / BENCHMARK
+# ----------------------------------------------------
+
+def orbiting_constellation(n_objects=5000, n_frames=1000, seed=0, radius=7000.0):
+    """Chuỗi vị trí (T, N, 3) của N vệ tinh trên quỹ đạo tròn với mặt phẳng ngẫu nhiên."""
+    from src.ga_utilities import create_rotors_batch, apply_rotors_batch
+    rng = np.random.default_rng(seed)
+    normals = rng.normal(size=(n_objects, 3))
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    start = np.cross(normals, rng.normal(size=(n_objects, 3)))
+    start *= radius / np.linalg.norm(start, axis=1, keepdims=True)
+    # Bivector mặt phẳng quỹ đạo [e12, e13, e23] từ pháp tuyến n: e12 ~ n_z, e13 ~ -n_y, e23 ~ n_x
+    planes = np.column_stack([normals[:, 2], -normals[:, 1], normals[:, 0]])
+    rates = rng.uniform(0.5, 1.5, size=n_objects) * 2 * np.pi / n_frames
+    positions = np.empty((n_frames, n_objects, 3))
+    for k in range(n_frames):
+        positions[k] = apply_rotors_batch(create_rotors_batch(planes, rates * k), start)
+    return positions
+
+def benchmark_rendering(n_objects=5000, n_frames=8, naive_objects=50):
+    """Thời gian mỗi khung hình: plot_sphere_3d từng vật thể (cách cũ) so với renderer batch."""
+    import tempfile
+    positions = orbiting_constellation(n_objects, n_frames)
+    radii = np.full(n_objects, 60.0)
+
+    print(f"\n--- Batch Rendering Benchmark (N={n_objects}, {n_frames} frames) ---")
+    with tempfile.TemporaryDirectory() as directory:
+        # Cách cũ: một Figure + một plot_surface 50x50 cho mỗi vật thể
+        t0 = time.perf_counter()
+        for k in range(n_frames):
+            figure = Figure(figsize=(8, 8), dpi=100)
+            FigureCanvasAgg(figure)
+            ax = figure.add_subplot(111, projection='3d')
+            for c, r in zip(positions[k, :naive_objects], radii):
+                ax.plot_surface(*sphere_surface(c, r), color='tab:blue', alpha=0.3)
+            figure.savefig(os.path.join(directory, f'naive_{k}.png'))
+        t_naive = (time.perf_counter() - t0) / n_frames
+        print(f"Per-object surfaces ({naive_objects} objects): {t_naive:.3f} s/frame")
+
+        for workers in sorted({1, os.cpu_count() or 1}):
+            t0 = time.perf_counter()
+            render_frames(positions, radii, output_dir=directory, n_workers=workers,
+                          lod_distance=2000.0, focus=positions[0, 0])
+            t_batch = (time.perf_counter() - t0) / n_frames
+            print(f"Batch renderer ({n_objects} objects, {workers} worker(s)): {t_batch:.3f} s/frame")
+
+if __name__ == '__main__':
+    if '--benchmark' in sys.argv:
+        benchmark_rendering()
+    else:
+        n_frames = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+        positions = orbiting_constellation(5000, n_frames)
+        t0 = time.perf_counter()
+        paths = render_frames(positions, 60.0, lod_distance=2000.0, focus=positions[0, 0])
+        elapsed = time.perf_counter() - t0
+        print(f"\nRendered {len(paths)} frames of 5000 objects to {FRAMES_DIR} "
+              f"in {elapsed:.2f} s ({elapsed / len(paths):.3f} s/frame)")
@@ -0,0 +1,261 @@
+# src/benchmark_suite.py (BỘ ĐO HIỆU NĂNG GA/CGA VÀ PIPELINE VA CHẠM)
+#
+# Chạy:   python src/benchmark_suite.py                      -> ghi 5_Results_Analysis/benchmarks/latest.json
+#         python src/benchmark_suite.py --save-baseline      -> ghi thêm baseline.json
+#         python src/benchmark_suite.py --baseline <file>    -> so sánh, exit code 1 nếu có hồi quy
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import numpy as np
+import src.ga_utilities as ga
+from src.application_collision_avoidance import check_cga_intersection, screen_conjunctions
+
+OUTPUT_DIR = os.path.join('5_Results_Analysis', 'benchmarks')
+DEFAULT_OUTPUT = os.path.join(OUTPUT_DIR, 'latest.json')
+DEFAULT_BASELINE = os.path.join(OUTPUT_DIR, 'baseline.json')
+# Cổng hồi quy: trung vị của DEFAULT_REPEATS lần đo, bỏ qua phép đo < DEFAULT_MIN_SECONDS,
+# ngưỡng (1 + tolerance) nới thêm theo độ phân tán của phép đo
+DEFAULT_REPEATS = 7
+DEFAULT_TOLERANCE = 0.5
+DEFAULT_MIN_SECONDS = 1e-2
+DEFAULT_NOISE_FACTOR = 2.0
+
+# ----------------------------------------------------
+# 1. CÁC TRƯỜNG HỢP ĐO
+# ----------------------------------------------------
+# Mỗi trường hợp: tên -> {chế độ: hàm(data) chạy trên n phần tử}.
+# 'scalar' là vòng lặp Multivector như các demo; 'batch' là API mảng tương ứng.
+
+def _make_data(n, seed=0, multivectors=False):
+    """Dữ liệu đầu vào; multivectors=True dựng sẵn Multivector (ngoài vùng đo) cho chế độ scalar."""
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(-5.0, 5.0, size=(n, 3))
+    data = {
+        'points': points,
+        'points_b': rng.uniform(-5.0, 5.0, size=(n, 3)),
+        'planes_a': rng.normal(size=(n, 3)),
+        'planes_b': rng.normal(size=(n, 3)),
+        'angles': rng.uniform(-np.pi, np.pi, size=n),
+        'radii': rng.uniform(0.5, 2.0, size=n),
+        'mv_points': None,
+    }
+    if multivectors:
+        _mv_points(data)
+    return data
+
+def _mv_points(data):
+    if data['mv_points'] is None:
+        data['mv_points'] = [ga.create_vector(*p) for p in data['points']]
+    return data['mv_points']
+
+def _scalar_create_vector(data):
+    for p in data['points']:
+        ga.create_vector(*p)
+
+def _scalar_point_to_cga(data):
+    for v in _mv_points(data):
+        ga.point_to_cga(v)
+
+def _batch_point_to_cga(data):
+    ga.points_to_cga_batch(data['points'])
+
+def _scalar_create_translator(data):
+    for v in _mv_points(data):
+        ga.create_translator(v)
+
+def _scalar_create_rotor(data):
+    for a, b, angle in zip(data['planes_a'], data['planes_b'], data['angles']):
+        ga.create_rotor(ga.create_vector(*a) ^ ga.create_vector(*b), angle)
+
+def _batch_create_rotor(data):
+    ga.create_rotors_batch(
+        ga.create_bivectors_from_planes_batch(data['planes_a'], data['planes_b']), data['angles'])
+
+def _scalar_apply_rotor(data):
+    R = ga.create_rotor(ga.e1 ^ ga.e2, 0.3)
+    for v in _mv_points(data):
+        ga.apply_rotor(R, v)
+
+def _batch_apply_rotor(data):
+    R = ga.create_rotors_batch([1.0, 0.0, 0.0], 0.3)
+    ga.apply_rotors_batch(R, data['points'])
+
+def _scalar_extract_coords(data):
+    for v in _mv_points(data):
+        ga.extract_coords(v)
+
+def _scalar_translator_sandwich(data):
+    T = ga.create_translator(ga.create_vector(1.5, -1.0, 0.0))
+    T_rev = ~T
+    P = [ga.point_to_cga(v) for v in _mv_points(data)] if 'mv_cga' not in data else data['mv_cga']
+    data['mv_cga'] = P
+    t0 = time.perf_counter()
+    for p in P:
+        T * p * T_rev
+    return time.perf_counter() - t0
+
+def _batch_translator_sandwich(data):
+    M = ga.compile_versor(ga.create_translator(ga.create_vector(1.5, -1.0, 0.0)))
+    ga.apply_compiled_versor(M, ga.points_to_cga_batch(data['points'], grade1_only=True))
+
+def _scalar_check_intersection(data):
+    S1 = [ga.create_cga_sphere(v, r) for v, r in zip(_mv_points(data), data['radii'])]
+    S2 = [ga.create_cga_sphere(ga.create_vector(*p), 1.0) for p in data['points_b']]
+    t0 = time.perf_counter()
+    for a, b in zip(S1, S2):
+        check_cga_intersection(a, b)
+    return time.perf_counter() - t0
+
+def _batch_check_intersection(data):
+    # Cùng N cặp sphere như chế độ scalar; hệ số sphere dựng ngoài vùng đo
+    S1 = ga.spheres_to_cga_batch(data['points'], data['radii'], grade1_only=True)
+    S2 = ga.spheres_to_cga_batch(data['points_b'], 1.0, grade1_only=True)
+    t0 = time.perf_counter()
+    ga.sphere_meet_batch(S1, S2)
+    return time.perf_counter() - t0
+
+def _batch_screen_conjunctions(data):
+    # Sàng lọc toàn danh mục (mọi cặp), không phải N phép thử từng cặp
+    screen_conjunctions(data['points'] * len(data['points']) ** (1.0 / 3.0), data['radii'])
+
+CASES = {
+    'create_vector': {'scalar': _scalar_create_vector},
+    'point_to_cga': {'scalar': _scalar_point_to_cga, 'batch': _batch_point_to_cga},
+    'create_translator': {'scalar': _scalar_create_translator},
+    'create_rotor': {'scalar': _scalar_create_rotor, 'batch': _batch_create_rotor},
+    'apply_rotor': {'scalar': _scalar_apply_rotor, 'batch': _batch_apply_rotor},
+    'extract_coords': {'scalar': _scalar_extract_coords},
+    'translator_sandwich': {'scalar': _scalar_translator_sandwich, 'batch': _batch_translator_sandwich},
+    'check_cga_intersection': {'scalar': _scalar_check_intersection, 'batch': _batch_check_intersection},
+    'screen_conjunctions': {'batch': _batch_screen_conjunctions},
+}
+
+# ----------------------------------------------------
+# 2. CHẠY VÀ GHI KẾT QUẢ
+# ----------------------------------------------------
+
+def _time_case(fn, n, repeats, multivectors=False):
+    """
+    Trung vị và độ phân tán (IQR / trung vị) qua repeats lần; hàm có thể tự trả về thời
+    gian phần được đo. Dữ liệu (kể cả Multivector dựng sẵn) tạo một lần, ngoài vùng đo.
+    """
+    data = _make_data(n, multivectors=multivectors)
+    runs = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        measured = fn(data)
+        runs.append(time.perf_counter() - t0 if measured is None else measured)
+    q25, median, q75 = np.percentile(runs, [25, 50, 75])
+    return float(median), float((q75 - q25) / median) if median > 0 else 0.0
+
+def run_suite(sizes, max_scalar=10_000, repeats=DEFAULT_REPEATS, cases=None):
+    """Chạy các trường hợp đo (trung vị của repeats lần); scalar chỉ chạy tới max_scalar phần tử."""
+    ga.warm_up_algebra()
+    for modes in CASES.values():  # Kích hoạt JIT / cache trước khi đo
+        for fn in modes.values():
+            fn(_make_data(2))
+
+    results = []
+    for name, modes in CASES.items():
+        if cases and name not in cases:
+            continue
+        for mode, fn in modes.items():
+            for n in sizes:
+                if mode == 'scalar' and n > max_scalar:
+                    continue
+                seconds, spread = _time_case(fn, n, repeats, multivectors=(mode == 'scalar'))
+                results.append({
+                    'name': name, 'mode': mode, 'size': n, 'seconds': seconds, 'spread': spread,
+                    'ns_per_element': 1e9 * seconds / n,
+                })
+                print(f"{name:<24} {mode:<7} n={n:>8}: {seconds:.6f} s "
+                      f"({1e9 * seconds / n:,.0f} ns/elem, spread {spread:.0%})")
+    return results
+
+def _metadata():
+    import clifford
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'clifford': clifford.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+def save_results(results, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'meta': _metadata(), 'results': results}, f, indent=2)
+    print(f"\nSaved benchmark results to {path}")
+
+def compare_to_baseline(results, baseline_path, tolerance=DEFAULT_TOLERANCE,
+                        min_seconds=DEFAULT_MIN_SECONDS, noise_factor=DEFAULT_NOISE_FACTOR):
+    """
+    So sánh trung vị với baseline: hồi quy nếu
+        thời gian > baseline * (1 + tolerance) * (1 + noise_factor * spread),
+    spread = độ phân tán lớn hơn của hai lần đo (IQR / trung vị), nên phép đo nhiễu cần
+    chậm hơn nhiều mới bị tính. Các phép đo ngắn hơn min_seconds bị bỏ qua.
+    Trả về danh sách hồi quy.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    reference = {(r['name'], r['mode'], r['size']): r for r in baseline['results']}
+
+    regressions = []
+    print(f"\n--- Comparison with baseline {baseline_path} "
+          f"(clifford {baseline['meta'].get('clifford')}, numpy {baseline['meta'].get('numpy')}) ---")
+    for r in results:
+        ref = reference.get((r['name'], r['mode'], r['size']))
+        if ref is None or max(r['seconds'], ref['seconds']) < min_seconds:
+            continue
+        ratio = r['seconds'] / ref['seconds']
+        spread = max(r.get('spread', 0.0), ref.get('spread', 0.0))
+        threshold = (1.0 + tolerance) * (1.0 + noise_factor * spread)
+        flag = 'REGRESSION' if ratio > threshold else ''
+        if flag:
+            regressions.append({**r, 'baseline_seconds': ref['seconds'], 'ratio': ratio,
+                                'threshold': threshold})
+        print(f"{r['name']:<24} {r['mode']:<7} n={r['size']:>8}: x{ratio:.2f} "
+              f"(limit x{threshold:.2f}) {flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark GA/CGA primitives và pipeline va chạm')
+    parser.add_argument('--max-exp', type=int, default=6, help='kích thước tối đa 10^max_exp')
+    parser.add_argument('--max-scalar', type=int, default=10_000,
+                        help='kích thước tối đa cho chế độ scalar (vòng lặp Multivector)')
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    parser.add_argument('--cases', nargs='*', choices=sorted(CASES))
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', default=None, help='file baseline để so sánh')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help=f'ghi kết quả thành baseline ({DEFAULT_BASELINE} nếu không có --baseline)')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--min-seconds', type=float, default=DEFAULT_MIN_SECONDS,
+                        help='bỏ qua các phép đo ngắn hơn ngưỡng này khi so sánh (nhiễu)')
+    parser.add_argument('--noise-factor', type=float, default=DEFAULT_NOISE_FACTOR,
+                        help='nới ngưỡng theo độ phân tán (IQR / trung vị) của phép đo')
+    args = parser.parse_args(argv)
+
+    sizes = [10 ** k for k in range(args.max_exp + 1)]
+    results = run_suite(sizes, max_scalar=args.max_scalar, repeats=args.repeats, cases=args.cases)
+    save_results(results, args.output)
+
+    if args.save_baseline:
+        save_results(results, args.baseline or DEFAULT_BASELINE)
+        return 0
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, tolerance=args.tolerance,
+                                          min_seconds=args.min_seconds, noise_factor=args.noise_factor)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.tolerance:.0%} tolerance")
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
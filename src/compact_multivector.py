@@ -0,0 +1,326 @@
+# src/compact_multivector.py (MULTIVECTOR CGA THƯA THEO BLADE: CHỈ LƯU CÁC BLADE ĐƯỢC DÙNG)
+#
+# Multivector của clifford trên layout_cga luôn lưu đủ 32 hệ số float64. CompactMV chỉ lưu
+# bộ chỉ số blade (tuple, dùng chung giữa các đối tượng) và mảng hệ số tương ứng:
+# một đối tượng (n,) hoặc cả lô (N, n), ví dụ N điểm CGA = mảng (N, 5).
+#
+# Tích hình học / ngoài / trong được lấy từ bảng tích blade x blade của chính layout_cga
+# (tính một lần từ các blade cơ sở bằng *, ^, |). Với mỗi cặp bộ blade (A, B), một
+# tensor dấu (len(A) * len(B), len(C)) được lập và cache, nên một tích là:
+#     (a ⊗ b).reshape(..., na * nb) @ tensor  ->  hệ số trên bộ blade kết quả C.
+
+import sys
+import time
+import tracemalloc
+import numpy as np
+import src.ga_utilities as ga
+from src.ga_utilities import (
+    warm_up_algebra, create_vector, create_translator, point_to_cga, points_to_cga_batch,
+    create_cga_sphere, create_rotor, g3_to_cga,
+)
+
+_PRODUCTS = ('gp', 'op', 'ip')
+_tables = None
+_plans = {}
+_interned = {}
+
+# ----------------------------------------------------
+# 1. BẢNG TÍCH BLADE TỪ LAYOUT_CGA
+# ----------------------------------------------------
+
+def _product_tables():
+    """
+    {'gp' | 'op' | 'ip': (index (32, 32), sign (32, 32))}: blade_i ∘ blade_j = sign * blade_index,
+    cùng dấu reversion (32,). Tính từ layout_cga một lần.
+    """
+    global _tables
+    if _tables is not None:
+        return _tables
+    warm_up_algebra()
+    layout = ga.layout_cga
+    n = layout.gaDims
+    basis = []
+    for i in range(n):
+        value = np.zeros(n)
+        value[i] = 1.0
+        basis.append(ga.cf.MultiVector(layout, value))
+
+    ops = {'gp': lambda a, b: a * b, 'op': lambda a, b: a ^ b, 'ip': lambda a, b: a | b}
+    tables = {}
+    for name, op in ops.items():
+        index = np.zeros((n, n), dtype=np.int64)
+        sign = np.zeros((n, n))
+        for i in range(n):
+            for j in range(n):
+                value = op(basis[i], basis[j]).value
+                nonzero = np.flatnonzero(value)
+                if len(nonzero) > 1:
+                    raise RuntimeError("Tích hai blade cơ sở phải là một blade")
+                if len(nonzero):
+                    index[i, j] = nonzero[0]
+                    sign[i, j] = value[nonzero[0]]
+        tables[name] = (index, sign)
+    grades = np.array([len(blade) for blade in layout.bladeTupList])
+    tables['reverse'] = np.where((grades * (grades - 1) // 2) % 2, -1.0, 1.0)
+    tables['grades'] = grades
+    _tables = tables
+    return tables
+
+def _intern(blades):
+    blades = tuple(int(b) for b in blades)
+    return _interned.setdefault(blades, blades)
+
+def _product_plan(kind, blades_a, blades_b):
+    """(bộ blade kết quả, tensor dấu (na * nb, nk)) cho tích kind của hai bộ blade, có cache."""
+    key = (kind, blades_a, blades_b)
+    plan = _plans.get(key)
+    if plan is None:
+        index, sign = _product_tables()[kind]
+        a = np.array(blades_a, dtype=np.int64)
+        b = np.array(blades_b, dtype=np.int64)
+        k = index[a[:, None], b[None, :]].ravel()
+        s = sign[a[:, None], b[None, :]].ravel()
+        nonzero = np.flatnonzero(s)
+        result = np.unique(k[nonzero])
+        tensor = np.zeros((len(a) * len(b), len(result)))
+        tensor[nonzero, np.searchsorted(result, k[nonzero])] = s[nonzero]
+        plan = _plans[key] = (_intern(result), tensor)
+    return plan
+
+# ----------------------------------------------------
+# 2. COMPACTMV
+# ----------------------------------------------------
+
+class CompactMV:
+    """
+    Multivector CGA thưa: blades là tuple chỉ số blade của layout_cga (tăng dần),
+    coeffs là mảng (..., len(blades)); chiều đầu (nếu có) là lô đối tượng.
+    """
+    __slots__ = ('blades', 'coeffs')
+
+    def __init__(self, blades, coeffs):
+        blades = tuple(int(b) for b in blades)
+        coeffs = np.asarray(coeffs, dtype=float)
+        if coeffs.shape[-1:] != (len(blades),):
+            raise ValueError(f"coeffs phải có chiều cuối {len(blades)}, nhận {coeffs.shape}")
+        if list(blades) != sorted(set(blades)):
+            order = np.argsort(blades)
+            blades, coeffs = tuple(np.array(blades)[order]), coeffs[..., order]
+        self.blades = _intern(blades)
+        self.coeffs = coeffs
+
+    @classmethod
+    def _new(cls, blades, coeffs):
+        """Tạo không kiểm tra (blades đã intern và tăng dần) — dùng trong các phép tính."""
+        mv = object.__new__(cls)
+        mv.blades = blades
+        mv.coeffs = coeffs
+        return mv
+
+    # --- Chuyển đổi với clifford.MultiVector ---
+
+    @classmethod
+    def from_multivector(cls, mv):
+        """Giữ đúng các blade khác 0 của mv (không mất thông tin)."""
+        blades = np.flatnonzero(mv.value)
+        return cls(blades, mv.value[blades])
+
+    @classmethod
+    def from_multivectors(cls, mvs):
+        """Lô từ danh sách MultiVector; bộ blade là hợp các blade khác 0."""
+        values = np.array([mv.value for mv in mvs])
+        blades = np.flatnonzero(np.any(values != 0.0, axis=0))
+        return cls(blades, values[:, blades])
+
+    @classmethod
+    def from_dense(cls, values, blades=None):
+        """Từ hệ số đầy đủ (..., 32) theo layout_cga; blades=None: các blade khác 0 trong cả lô."""
+        values = np.asarray(values, dtype=float)
+        if blades is None:
+            blades = np.flatnonzero(np.any(values.reshape(-1, values.shape[-1]) != 0.0, axis=0))
+        return cls(blades, values[..., list(blades)])
+
+    def to_dense(self):
+        """Hệ số đầy đủ (..., 32) theo layout_cga."""
+        values = np.zeros(self.coeffs.shape[:-1] + (ga.layout_cga.gaDims,))
+        values[..., list(self.blades)] = self.coeffs
+        return values
+
+    def to_multivector(self):
+        """cf.MultiVector (đối tượng đơn) hoặc danh sách MultiVector (lô)."""
+        values = self.to_dense()
+        if values.ndim == 1:
+            return ga.cf.MultiVector(ga.layout_cga, values)
+        return [ga.cf.MultiVector(ga.layout_cga, v) for v in values.reshape(-1, values.shape[-1])]
+
+    # --- Tích ---
+
+    def _product(self, kind, other):
+        if not isinstance(other, CompactMV):
+            if kind == 'gp' and np.isscalar(other):
+                return CompactMV._new(self.blades, self.coeffs * other)
+            return NotImplemented
+        plan = _plans.get((kind, self.blades, other.blades))
+        blades, tensor = plan if plan is not None else _product_plan(kind, self.blades, other.blades)
+        a, b = self.coeffs, other.coeffs
+        if a.ndim == 1 and b.ndim == 1:
+            outer = (a[:, None] * b).ravel()
+        else:
+            outer = a[..., :, None] * b[..., None, :]
+            outer = outer.reshape(outer.shape[:-2] + (-1,))
+        return CompactMV._new(blades, outer @ tensor)
+
+    def gp(self, other):
+        """Tích hình học self * other."""
+        return self._product('gp', other)
+
+    def op(self, other):
+        """Tích ngoài self ^ other."""
+        return self._product('op', other)
+
+    def ip(self, other):
+        """Tích trong self | other (cùng định nghĩa với clifford)."""
+        return self._product('ip', other)
+
+    __mul__ = gp
+    __xor__ = op
+    __or__ = ip
+
+    def __rmul__(self, other):
+        if np.isscalar(other):
+            return CompactMV._new(self.blades, self.coeffs * other)
+        return NotImplemented
+
+    def reverse(self):
+        """Reversion ~X: đổi dấu các blade có grade k với k (k - 1) / 2 lẻ."""
+        return CompactMV._new(self.blades, self.coeffs * _product_tables()['reverse'][list(self.blades)])
+
+    __invert__ = reverse
+
+    # --- Cộng / trừ ---
+
+    def _merged(self, other, sign):
+        blades = _intern(sorted(set(self.blades) | set(other.blades)))
+        shape = np.broadcast_shapes(self.coeffs.shape[:-1], other.coeffs.shape[:-1])
+        coeffs = np.zeros(shape + (len(blades),))
+        coeffs[..., np.searchsorted(blades, self.blades)] += self.coeffs
+        coeffs[..., np.searchsorted(blades, other.blades)] += sign * other.coeffs
+        return CompactMV._new(blades, coeffs)
+
+    def __add__(self, other):
+        return self._merged(other, 1.0) if isinstance(other, CompactMV) else NotImplemented
+
+    def __sub__(self, other):
+        return self._merged(other, -1.0) if isinstance(other, CompactMV) else NotImplemented
+
+    def __neg__(self):
+        return CompactMV._new(self.blades, -self.coeffs)
+
+    # --- Tiện ích ---
+
+    def prune(self, tol=0.0):
+        """Bỏ các blade có |hệ số| <= tol ở mọi phần tử của lô (ví dụ phần bậc 3 triệt tiêu của T P ~T)."""
+        flat = np.abs(self.coeffs).reshape(-1, len(self.blades))
+        keep = np.flatnonzero(np.any(flat > tol, axis=0))
+        return CompactMV(np.array(self.blades)[keep], self.coeffs[..., keep])
+
+    def select_grades(self, *grades):
+        """Phần có grade thuộc grades."""
+        keep = np.flatnonzero(np.isin(_product_tables()['grades'][list(self.blades)], grades))
+        return CompactMV(np.array(self.blades)[keep], self.coeffs[..., keep])
+
+    def __len__(self):
+        return len(self.coeffs) if self.coeffs.ndim > 1 else 1
+
+    def __getitem__(self, key):
+        """Phần tử / lát của lô (chỉ khi coeffs có chiều lô)."""
+        if self.coeffs.ndim < 2:
+            raise TypeError("CompactMV đơn không có chiều lô")
+        return CompactMV._new(self.blades, self.coeffs[key])
+
+    @property
+    def nbytes(self):
+        return self.coeffs.nbytes
+
+    def __repr__(self):
+        names = [ga.layout_cga.names[b] or '1' for b in self.blades] if _tables is not None else self.blades
+        return f"CompactMV(blades={names}, coeffs shape={self.coeffs.shape})"
+
+def compact_points(points_euc):
+    """Lô điểm CGA (N, 3) -> CompactMV với 5 blade grade 1, không qua MultiVector."""
+    _product_tables()
+    return CompactMV(ga.CGA_GRADE1_INDEX, points_to_cga_batch(points_euc, grade1_only=True))
+
+# ----------------------------------------------------
+# 3. BENCHMARK: BỘ NHỚ, TỐC ĐỘ, KHÔNG MẤT THÔNG TIN
+# ----------------------------------------------------
+
+def _allocated(build):
+    """Số byte cấp phát (tracemalloc) còn giữ bởi kết quả của build()."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return size
+
+def benchmark_compact(n_objects=10000, n_products=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    _product_tables()
+    points = rng.uniform(-5.0, 5.0, size=(n_objects, 3))
+    print(f"\n--- CompactMV (grade-sparse CGA multivectors) ---")
+
+    # Không mất thông tin + khớp với clifford
+    T = create_translator(create_vector(1.5, -1.0, 0.25))
+    samples = [point_to_cga(create_vector(*p)) for p in points[:3]] + [
+        T, create_cga_sphere(create_vector(1.0, 2.0, 3.0), 0.7),
+        g3_to_cga(create_rotor(ga.e1 ^ ga.e2, 0.3)),
+    ]
+    round_trip = all(np.array_equal(CompactMV.from_multivector(mv).to_multivector().value, mv.value)
+                     for mv in samples)
+    err = 0.0
+    for a in samples:
+        for b in samples:
+            A, B = CompactMV.from_multivector(a), CompactMV.from_multivector(b)
+            for got, want in (((A * B), a * b), ((A ^ B), a ^ b), ((A | B), a | b), (~A, ~a)):
+                err = max(err, np.abs(got.to_dense() - want.value).max())
+    print(f"Lossless round trip: {round_trip}; max |compact - clifford| over gp/op/ip/reverse: {err:.1e}")
+
+    # Bộ nhớ mỗi đối tượng (tracemalloc)
+    mv_bytes = _allocated(lambda: [point_to_cga(create_vector(*p)) for p in points]) / n_objects
+    single_bytes = _allocated(lambda: [CompactMV(ga.CGA_GRADE1_INDEX, c)
+                                       for c in points_to_cga_batch(points, grade1_only=True)]) / n_objects
+    batch_bytes = _allocated(lambda: compact_points(points)) / n_objects
+    print(f"Memory per point: MultiVector {mv_bytes:.0f} B, CompactMV single {single_bytes:.0f} B "
+          f"({mv_bytes / single_bytes:.1f}x), CompactMV batch {batch_bytes:.0f} B ({mv_bytes / batch_bytes:.1f}x)")
+
+    # Tích điểm / translator như demo_translation: P' = T * P * ~T
+    mvs = [point_to_cga(create_vector(*p)) for p in points[:n_products]]
+    T_rev = ~T
+    t0 = time.perf_counter()
+    for P in mvs:
+        T * P * T_rev
+    t_mv = time.perf_counter() - t0
+
+    Tc, Tc_rev = CompactMV.from_multivector(T), ~CompactMV.from_multivector(T)
+    singles = [CompactMV.from_multivector(P) for P in mvs]
+    Tc * singles[0] * Tc_rev  # Lập bảng tích (một lần cho mỗi cặp bộ blade)
+    t0 = time.perf_counter()
+    for P in singles:
+        Tc * P * Tc_rev
+    t_single = time.perf_counter() - t0
+
+    batch = compact_points(points)
+    Tc * batch[:1] * Tc_rev
+    t0 = time.perf_counter()
+    moved = (Tc * batch * Tc_rev).prune(1e-12)
+    t_batch = time.perf_counter() - t0
+    moved_err = np.abs(moved.coeffs[:, :3] - (points + [1.5, -1.0, 0.25])).max()
+    print(f"T * P * ~T per point: MultiVector {t_mv / n_products * 1e6:.1f} us, "
+          f"CompactMV single {t_single / n_products * 1e6:.1f} us ({t_mv / t_single:.1f}x), "
+          f"CompactMV batch {t_batch / n_objects * 1e6:.3f} us ({t_mv / n_products / (t_batch / n_objects):.0f}x)")
+    print(f"Batch result blades {moved.blades} (grade 1 after prune), max coord err {moved_err:.1e}")
+
+if __name__ == '__main__':
+    benchmark_compact(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -3,6 +3,7 @@
 import numpy as np
 import math
 import os
+import time
 import matplotlib.pyplot as plt
 from src.ga_utilities import *
 # Lưu ý: Các hàm CGA và G3 đã được import từ ga_utilities
@@ -34,38 +35,17 @@ def setup_3d_plot_cga(ax, title):
 def plot_point_cga(ax, P_cga, color, label):
     """
     Trích xuất tọa độ 3D Euclidean từ Point CGA và vẽ điểm đó.
-    Phương pháp: Chuẩn hóa P_cga, sau đó chiếu P_norm - n_o.
+    Phương pháp: chuẩn hóa theo -P | n_inf (cga_to_points_batch).
     """
-    try:
-        # 1. Chuẩn hóa điểm CGA: P_norm = P / (-P | n_inf)
-        inner_prod_mv = -(P_cga | n_inf)
-        
-        # Trích xuất scalar bằng index [0]
-        norm_factor = inner_prod_mv[0]
-        
-        if np.isclose(norm_factor, 0): # Dùng np.isclose cho số float
-             print("Warning: Point is at infinity.")
-             return np.zeros(3)
-
-        P_norm = P_cga / norm_factor
-        
-        # 2. Chiếu về vector Euclidean: v = P_norm - n_o
-        v_euclidean_cga = P_norm - n_o
-        
-        # 3. Lấy hệ số v
-        # Lấy hệ số theo basis CGA Euclidean
-        x = v_euclidean_cga[e1_cga]
-        y = v_euclidean_cga[e2_cga]
-        z = v_euclidean_cga[e3_cga]
-
-        ax.scatter(x, y, z, color=color, s=50, label=label)
-        
-        return np.array([x, y, z])
-    
-    except Exception as e:
-        print(f"Error plotting CGA point: {e}")
+    centers, at_infinity = cga_to_points_batch(P_cga.value)
+    if at_infinity[0]:
+        print("Warning: Point is at infinity.")
         return np.zeros(3)
 
+    x, y, z = centers[0]
+    ax.scatter(x, y, z, color=color, s=50, label=label)
+    return centers[0]
+
 # ... (Hàm demo_translation và main giữ nguyên)
 
 
@@ -109,5 +89,38 @@ def demo_translation():
     plt.savefig(filename)
     print(f"\nSaved CGA translation demo to {filename}")
 
+def demo_compiled_translation(n_points=20000, seed=0):
+    """
+    Tịnh tiến + quay cả mảng điểm bằng versor đã biên dịch (compile_versor)
+    và so sánh với sandwich product V * P * ~V cho từng điểm.
+    """
+    rng = np.random.default_rng(seed)
+    points_euc = rng.uniform(-PLOT_LIMIT, PLOT_LIMIT, size=(n_points, 3))
+
+    # Motor = Translator * Rotor (Rotor G3 được nhúng vào CGA)
+    T = create_translator(create_vector(1.5, -1.0, 0.0))
+    R = create_rotor(create_bivector_from_plane(e1, e2), math.radians(30))
+    V = T * g3_to_cga(R)
+
+    # 1. Sandwich product cho từng điểm (cách hiện tại)
+    t0 = time.perf_counter()
+    moved_loop = np.array([
+        (V * point_to_cga(create_vector(*p)) * (~V)).value[CGA_GRADE1_INDEX]
+        for p in points_euc
+    ])
+    t_loop = time.perf_counter() - t0
+
+    # 2. Biên dịch một lần, áp dụng bằng một phép nhân ma trận
+    t0 = time.perf_counter()
+    M = compile_versor(V)
+    moved_batch = apply_compiled_versor(M, points_to_cga_batch(points_euc, grade1_only=True))
+    t_batch = time.perf_counter() - t0
+
+    print(f"\n--- Compiled Versor vs Sandwich Product (N={n_points}) ---")
+    print(f"Sandwich loop:   {t_loop:.4f} s")
+    print(f"Compiled matmul: {t_batch:.4f} s  (x{t_loop / t_batch:.0f})")
+    print(f"Error Norm (max abs): {np.max(np.abs(moved_loop - moved_batch)):.3e}")
+
 if __name__ == '__main__':
     demo_translation()
+    demo_compiled_translation()
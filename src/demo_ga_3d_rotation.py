@@ -4,6 +4,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 import math
 import os
+import time
 from src.ga_utilities import * # Import các hàm trợ giúp GA
 
 # --- CẤU HÌNH TRỰC QUAN HÓA ---
@@ -109,8 +110,50 @@ def compare_rotation_ga_vs_matrix(vector_in_np, angle_deg=60):
     print(f"\nSaved visualization to {filename}")
     # plt.show() # Chỉ bật nếu chạy local
 
+def benchmark_batch_rotation(n_vectors=20000, seed=0):
+    """
+    So sánh vòng lặp create_rotor/apply_rotor với phiên bản batch
+    (create_rotors_batch/apply_rotors_batch): sai số và thời gian.
+    """
+    rng = np.random.default_rng(seed)
+    planes_a = rng.normal(size=(n_vectors, 3))
+    planes_b = rng.normal(size=(n_vectors, 3))
+    angles = rng.uniform(-math.pi, math.pi, n_vectors)
+    vectors = rng.normal(size=(n_vectors, 3))
+
+    # 1. Vòng lặp Multivector (cách hiện tại)
+    t0 = time.perf_counter()
+    out_loop = np.empty((n_vectors, 3))
+    for k in range(n_vectors):
+        B = create_bivector_from_plane(create_vector(*planes_a[k]), create_vector(*planes_b[k]))
+        R = create_rotor(B, angles[k])
+        out_loop[k] = extract_coords(apply_rotor(R, create_vector(*vectors[k])))
+    t_loop = time.perf_counter() - t0
+
+    # 2. Batch: nhiều rotor, mỗi rotor cho một vector
+    t0 = time.perf_counter()
+    B_batch = create_bivectors_from_planes_batch(planes_a, planes_b)
+    R_batch = create_rotors_batch(B_batch, angles)
+    out_batch = apply_rotors_batch(R_batch, vectors)
+    t_batch = time.perf_counter() - t0
+
+    # 3. Batch: một rotor cho tất cả vector
+    R_single = create_rotor(create_bivector_from_plane(e2, e3), angles[0])
+    t0 = time.perf_counter()
+    out_single = apply_rotors_batch(rotor_to_coeffs(R_single), vectors)
+    t_single = time.perf_counter() - t0
+    ref_single = extract_coords(apply_rotor(R_single, create_vector(*vectors[0])))
+
+    print(f"\n--- Batch Rotation Benchmark (N={n_vectors}) ---")
+    print(f"Loop (Multivector): {t_loop:.4f} s")
+    print(f"Batch (N rotors):   {t_batch:.4f} s  (x{t_loop / t_batch:.0f})")
+    print(f"Batch (1 rotor):    {t_single:.4f} s")
+    print(f"Difference (max abs, N rotors): {np.max(np.abs(out_loop - out_batch)):.3e}")
+    print(f"Difference (1 rotor, vector 0): {np.max(np.abs(out_single[0] - ref_single)):.3e}")
+
 if __name__ == '__main__':
     # Vector đầu vào (ví dụ: tư thế ăng-ten vệ tinh)
     initial_vector = np.array([0.5, 0.8, 0.2]) 
     
     compare_rotation_ga_vs_matrix(initial_vector, angle_deg=120)
+    benchmark_batch_rotation()
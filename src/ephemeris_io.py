@@ -0,0 +1,183 @@
+# src/ephemeris_io.py (ĐỌC FILE TRẠNG THÁI / EPHEMERIS THEO TỪNG KHỐI)
+
+import os
+import sys
+import time
+import itertools
+import tempfile
+import tracemalloc
+from collections import namedtuple
+import numpy as np
+from src.ga_utilities import points_to_cga_batch, spheres_to_cga_batch
+
+# ----------------------------------------------------
+# 1. ĐỊNH DẠNG BẢN GHI
+# ----------------------------------------------------
+# Bản ghi trạng thái cố định (file nhị phân .bin/.dat, hoặc .npy có cấu trúc).
+# CSV / .npy dạng số thực dùng cùng thứ tự cột:
+#   id, epoch, x, y, z, vx, vy, vz[, radius]
+STATE_RECORD_DTYPE = np.dtype([
+    ('id', '<i8'),
+    ('epoch', '<f8'),
+    ('position', '<f8', (3,)),
+    ('velocity', '<f8', (3,)),
+    ('radius', '<f8'),
+])
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+DEFAULT_RADIUS = 1.0
+
+# Một khối trạng thái. cga_points / cga_spheres: hệ số grade 1 (n, 5) theo layout_cga
+# (như points_to_cga_batch / spheres_to_cga_batch), None nếu with_cga=False.
+StateChunk = namedtuple(
+    'StateChunk', ['ids', 'epochs', 'positions', 'velocities', 'radii', 'cga_points', 'cga_spheres']
+)
+
+def _make_chunk(ids, epochs, positions, velocities, radii, with_cga):
+    positions = np.ascontiguousarray(positions, dtype=float)
+    radii = np.ascontiguousarray(radii, dtype=float)
+    cga_points = points_to_cga_batch(positions, grade1_only=True) if with_cga else None
+    cga_spheres = spheres_to_cga_batch(positions, radii, grade1_only=True) if with_cga else None
+    return StateChunk(
+        np.ascontiguousarray(ids, dtype=np.int64), np.ascontiguousarray(epochs, dtype=float),
+        positions, np.ascontiguousarray(velocities, dtype=float), radii, cga_points, cga_spheres,
+    )
+
+def _chunk_from_columns(table, with_cga):
+    """Khối từ bảng số thực (n, 8 hoặc 9) theo thứ tự cột CSV."""
+    radii = table[:, 8] if table.shape[1] > 8 else np.full(len(table), DEFAULT_RADIUS)
+    return _make_chunk(table[:, 0], table[:, 1], table[:, 2:5], table[:, 5:8], radii, with_cga)
+
+def _chunk_from_records(records, with_cga):
+    """Khối từ mảng bản ghi STATE_RECORD_DTYPE (chỉ sao chép phần của khối)."""
+    return _make_chunk(records['id'], records['epoch'], records['position'],
+                       records['velocity'], records['radius'], with_cga)
+
+# ----------------------------------------------------
+# 2. ĐỌC THEO KHỐI
+# ----------------------------------------------------
+
+def _is_header(line):
+    try:
+        float(line.split(',')[0])
+        return False
+    except ValueError:
+        return True
+
+def iter_csv_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, with_cga=True):
+    """Đọc CSV từng khối chunk_size dòng; dòng tiêu đề (nếu có) và dòng trống được bỏ qua."""
+    with open(path, 'r') as f:
+        first = f.readline()
+        lines = f if _is_header(first) else itertools.chain([first], f)
+        # Bỏ dòng trống trước khi chia khối: khối chỉ gồm dòng trống cho bảng (0, 1)
+        lines = (line for line in lines if line.strip())
+        while True:
+            block = list(itertools.islice(lines, chunk_size))
+            if not block:
+                return
+            yield _chunk_from_columns(np.loadtxt(block, delimiter=',', ndmin=2), with_cga)
+
+def iter_npy_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, with_cga=True):
+    """Memory-map file .npy (có cấu trúc STATE_RECORD_DTYPE hoặc số thực (N, 8/9)) rồi cắt khối."""
+    data = np.load(path, mmap_mode='r')
+    for start in range(0, len(data), chunk_size):
+        block = data[start:start + chunk_size]
+        if data.dtype.names:
+            yield _chunk_from_records(block, with_cga)
+        else:
+            yield _chunk_from_columns(np.asarray(block, dtype=float), with_cga)
+
+def iter_record_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, with_cga=True, dtype=STATE_RECORD_DTYPE):
+    """Memory-map file nhị phân bản ghi cố định (mặc định STATE_RECORD_DTYPE) rồi cắt khối."""
+    if os.path.getsize(path) == 0:
+        return
+    data = np.memmap(path, dtype=dtype, mode='r')
+    for start in range(0, len(data), chunk_size):
+        yield _chunk_from_records(data[start:start + chunk_size], with_cga)
+
+_READERS = {
+    '.csv': iter_csv_chunks,
+    '.npy': iter_npy_chunks,
+    '.bin': iter_record_chunks,
+    '.dat': iter_record_chunks,
+}
+
+def iter_state_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, with_cga=True):
+    """
+    Đọc file trạng thái theo từng khối, chọn bộ đọc theo phần mở rộng
+    (.csv, .npy, .bin/.dat). Bộ nhớ đỉnh chỉ phụ thuộc chunk_size, không phụ thuộc
+    kích thước file. Mỗi lần yield một StateChunk.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in _READERS:
+        raise ValueError(f"Không hỗ trợ định dạng '{ext}' (hỗ trợ: {', '.join(_READERS)})")
+    return _READERS[ext](path, chunk_size=chunk_size, with_cga=with_cga)
+
+def write_state_records(path, ids, epochs, positions, velocities, radii):
+    """Ghi trạng thái theo STATE_RECORD_DTYPE: .npy (np.save) hoặc nhị phân thô (.bin/.dat)."""
+    records = np.empty(len(ids), dtype=STATE_RECORD_DTYPE)
+    records['id'], records['epoch'] = ids, epochs
+    records['position'], records['velocity'], records['radius'] = positions, velocities, radii
+    if path.lower().endswith('.npy'):
+        np.save(path, records)
+    else:
+        records.tofile(path)
+
+# ----------------------------------------------------
+# 3. THROUGHPUT: ĐỌC THEO KHỐI vs ĐỌC TOÀN BỘ
+# ----------------------------------------------------
+
+def _naive_full_load(path):
+    """Cách làm ngây thơ: đọc toàn bộ file vào RAM rồi nhúng CGA một lần."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        chunk = _chunk_from_columns(np.loadtxt(path, delimiter=',', skiprows=1, ndmin=2), True)
+    elif ext == '.npy':
+        chunk = _chunk_from_records(np.load(path), True)
+    else:
+        chunk = _chunk_from_records(np.fromfile(path, dtype=STATE_RECORD_DTYPE), True)
+    return len(chunk.ids)
+
+def _streaming_load(path, chunk_size):
+    return sum(len(chunk.ids) for chunk in iter_state_chunks(path, chunk_size=chunk_size))
+
+def _measure(fn, *args):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    n_records = fn(*args)
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return n_records, elapsed, peak
+
+def benchmark_ingestion(n_records=500_000, chunk_size=DEFAULT_CHUNK_SIZE, seed=0):
+    """Throughput (records/s) và bộ nhớ đỉnh: đọc theo khối so với đọc toàn bộ."""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(n_records)
+    epochs = np.zeros(n_records)
+    positions = rng.uniform(-7000.0, 7000.0, size=(n_records, 3))
+    velocities = rng.normal(0.0, 7.5, size=(n_records, 3))
+    radii = rng.uniform(0.5, 2.0, size=n_records)
+
+    print(f"\n--- Ephemeris Ingestion Benchmark (N={n_records}, chunk={chunk_size}) ---")
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'states.csv')
+        table = np.column_stack([ids, epochs, positions, velocities, radii])
+        np.savetxt(csv_path, table, delimiter=',', fmt='%.10g',
+                   header='id,epoch,x,y,z,vx,vy,vz,radius', comments='')
+        npy_path = os.path.join(directory, 'states.npy')
+        bin_path = os.path.join(directory, 'states.bin')
+        write_state_records(npy_path, ids, epochs, positions, velocities, radii)
+        write_state_records(bin_path, ids, epochs, positions, velocities, radii)
+
+        for path in (csv_path, npy_path, bin_path):
+            fmt = os.path.splitext(path)[1]
+            n_full, t_full, peak_full = _measure(_naive_full_load, path)
+            n_stream, t_stream, peak_stream = _measure(_streaming_load, path, chunk_size)
+            assert n_full == n_stream == n_records
+            print(f"{fmt:<5} full load: {n_full / t_full:>12,.0f} rec/s, peak {peak_full / 2**20:7.1f} MiB"
+                  f" | chunked: {n_stream / t_stream:>12,.0f} rec/s, peak {peak_stream / 2**20:7.1f} MiB")
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    benchmark_ingestion(n)
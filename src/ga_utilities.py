@@ -1,22 +1,178 @@
 # src/ga_utilities.py (HỢP NHẤT G3 và CGA)
 
+import os
+import sys
+import functools
+from collections import OrderedDict, namedtuple
+import time
+import subprocess
+import tempfile
+import zipfile
 import numpy as np
 import math
-import clifford as cf
-from clifford.g3 import *
+
+# ----------------------------------------------------
+# 0. KHỞI TẠO LƯỜI (LAZY) CÁC ĐẠI SỐ
+# ----------------------------------------------------
+# Import clifford, dựng G3 / G(4,1) và các hằng số batch chỉ khi dùng lần đầu.
+# Các tên công khai cũ (e1, layout, layout_cga, n_inf, n_o, ...) vẫn truy cập được
+# qua module __getattr__; các hàm trong module gọi _require(...) trước khi dùng.
+_LAZY_NAMES = {
+    'g3': ('cf', 'Cl', 'layout', 'blades', 'e1', 'e2', 'e3', 'e12', 'e13', 'e23', 'e123'),
+    'cga': ('layout_cga', 'blades_cga', 'e1_cga', 'e2_cga', 'e3_cga', 'ep', 'em', 'n_inf', 'n_o'),
+    'constants': ('G3_ROTOR_INDEX', 'G3_BIVECTOR_INDEX', 'CGA_DIMS', 'CGA_GRADE1_INDEX',
+                  'CGA_GRADE1_METRIC', 'CGA_N_INF_GRADE1', 'CGA_N_O_GRADE1', 'CGA_NULL_TO_GRADE1',
+                  'CGA_GRADE1_TO_NULL'),
+}
+_BUILT = set()
+
+# Cache hằng số batch trên đĩa: các đường batch khi đó không cần import clifford
+ALGEBRA_CACHE_ENV = 'GEOSAT_ALGEBRA_CACHE'
+_ALGEBRA_CACHE_FORMAT = 2
+_algebra_cache_path = os.environ.get(ALGEBRA_CACHE_ENV)
+
+def _require(*parts):
+    """Dựng các phần 'g3', 'cga', 'constants' nếu chưa dựng."""
+    for part in parts:
+        if part not in _BUILT:
+            globals()['_build_' + part]()
+            _BUILT.add(part)
+
+def __getattr__(name):
+    for part, names in _LAZY_NAMES.items():
+        if name in names:
+            _require(part)
+            return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def enable_algebra_cache(path):
+    """
+    Bật cache trên đĩa (.npz) cho các hằng số batch (chỉ số blade, metric, n_o, n_inf).
+    Tương đương đặt biến môi trường GEOSAT_ALGEBRA_CACHE; path=None để tắt.
+    """
+    global _algebra_cache_path
+    _algebra_cache_path = path
+
+def warm_up_algebra():
+    """
+    Dựng cả hai đại số và kích hoạt trước JIT (numba) của clifford cho các phép
+    *, ^, |, ~. Gọi trước khi fork worker để các worker thừa hưởng mã đã biên dịch.
+    """
+    _require('g3', 'cga', 'constants')
+    for a in (e1, n_inf):
+        a * a, a ^ a, a | a, ~a
+
+# ----------------------------------------------------
+# 0b. CACHE LRU (TÙY CHỌN) CHO VERSOR
+# ----------------------------------------------------
+# create_rotor, create_bivector_from_plane, create_translator có thể dùng chung
+# một cache LRU giới hạn kích thước, khóa theo giá trị số của đầu vào (chính xác
+# hoặc lượng tử hóa). Mặc định tắt: khi tắt, chi phí chỉ là một phép kiểm tra None.
+
+class _VersorCache:
+    def __init__(self, maxsize, quantum):
+        self.maxsize = int(maxsize)
+        self.quantum = quantum
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key_part(self, arg):
+        """Khóa cho một đầu vào: hệ số Multivector hoặc số thực, lượng tử hóa nếu có quantum."""
+        values = np.asarray(getattr(arg, 'value', arg), dtype=float)
+        if self.quantum:
+            values = np.round(values / self.quantum).astype(np.int64)
+        return id(getattr(arg, 'layout', None)), values.tobytes()
+
+    def trim(self):
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+_versor_cache = None
+
+def _copy_multivector(mv):
+    # type(mv) thay cho cf.MultiVector: cf chỉ có sau _build_g3 (dựng lười)
+    return type(mv)(mv.layout, mv.value.copy())
+
+def _memoize_versor(fn):
+    @functools.wraps(fn)
+    def wrapper(*args):
+        cache = _versor_cache
+        if cache is None:
+            return fn(*args)
+        key = (fn.__name__,) + tuple(cache.key_part(a) for a in args)
+        mv = cache.entries.get(key)
+        if mv is None:
+            cache.misses += 1
+            mv = fn(*args)
+            cache.entries[key] = mv
+            cache.trim()
+        else:
+            cache.hits += 1
+            cache.entries.move_to_end(key)
+        # Bản sao phòng vệ: người gọi không thể làm hỏng mục trong cache
+        return _copy_multivector(mv)
+    return wrapper
+
+def enable_versor_cache(maxsize=1024, quantum=None):
+    """
+    Bật cache LRU cho create_rotor / create_bivector_from_plane / create_translator.
+    quantum: nếu khác None, đầu vào được làm tròn theo bước này trước khi lập khóa
+    (các đầu vào cùng ô lượng tử dùng chung versor của lần gọi đầu tiên).
+    """
+    global _versor_cache
+    _versor_cache = _VersorCache(maxsize, quantum)
+
+def disable_versor_cache():
+    """Tắt và bỏ cache versor."""
+    global _versor_cache
+    _versor_cache = None
+
+def clear_versor_cache():
+    """Xóa các mục trong cache (giữ cấu hình và số liệu thống kê)."""
+    if _versor_cache is not None:
+        _versor_cache.entries.clear()
+
+def resize_versor_cache(maxsize):
+    """Đổi kích thước tối đa khi đang chạy; các mục cũ nhất bị loại nếu vượt quá."""
+    if _versor_cache is not None:
+        _versor_cache.maxsize = int(maxsize)
+        _versor_cache.trim()
+
+def versor_cache_info():
+    """Thống kê cache: enabled, hits, misses, evictions, size, maxsize, quantum."""
+    cache = _versor_cache
+    if cache is None:
+        return {'enabled': False}
+    return {
+        'enabled': True, 'hits': cache.hits, 'misses': cache.misses,
+        'evictions': cache.evictions, 'size': len(cache.entries),
+        'maxsize': cache.maxsize, 'quantum': cache.quantum,
+    }
 
 # ----------------------------------------------------
 # 1. SETUP: EUCLIDEAN GEOMETRIC ALGEBRA G(3)
 # ----------------------------------------------------
 
+def _build_g3():
+    import clifford as cf
+    import clifford.g3 as g3
+    globals().update(cf=cf, Cl=cf.Cl, layout=g3.layout, blades=g3.blades,
+                     **{name: getattr(g3, name) for name in _LAZY_NAMES['g3'][4:]})
+
 def create_vector(x, y, z):
     """Tạo một vector 3D trong không gian G(3)."""
+    _require('g3')
     # Sử dụng basis e1, e2, e3 của G3
     return x*e1 + y*e2 + z*e3
 
+@_memoize_versor
 def create_bivector_from_plane(v1, v2):
     return v1 ^ v2
 
+@_memoize_versor
 def create_rotor(axis_bivector, angle_rad):
     B = axis_bivector.normal()
     half_angle = angle_rad / 2
@@ -25,6 +181,7 @@ def create_rotor(axis_bivector, angle_rad):
 
 def extract_coords(multivector):
     """Trích xuất tọa độ 3D (x, y, z) từ một Multivector (grade 1)."""
+    _require('g3')
     if not isinstance(multivector, cf.MultiVector):
         return np.zeros(3)
 
@@ -45,16 +202,21 @@ def apply_rotor(R, vector):
 # ----------------------------------------------------
 # 2. SETUP: CONFORMAL GEOMETRIC ALGEBRA G(4,1)
 # ----------------------------------------------------
-# (4, 1) signature: 4 basis^2 = +1, 1 basis^2 = -1
-layout_cga, blades_cga = cf.Cl(4, 1)
+def _build_cga():
+    _require('g3')
+    # (4, 1) signature: 4 basis^2 = +1, 1 basis^2 = -1
+    layout_cga, blades_cga = cf.Cl(4, 1)
 
-e1_cga, e2_cga, e3_cga, ep, em = (
-    blades_cga['e1'], blades_cga['e2'], blades_cga['e3'], blades_cga['e4'], blades_cga['e5']
-)
+    e1_cga, e2_cga, e3_cga, ep, em = (
+        blades_cga['e1'], blades_cga['e2'], blades_cga['e3'], blades_cga['e4'], blades_cga['e5']
+    )
+
+    # Null Basis
+    n_inf = ep + em          # Vector vô cực (e_infinity)
+    n_o = 0.5 * (em - ep)    # Vector gốc (e_origin)
 
-# Null Basis
-n_inf = ep + em          # Vector vô cực (e_infinity)
-n_o = 0.5 * (em - ep)    # Vector gốc (e_origin)
+    globals().update(layout_cga=layout_cga, blades_cga=blades_cga, e1_cga=e1_cga,
+                     e2_cga=e2_cga, e3_cga=e3_cga, ep=ep, em=em, n_inf=n_inf, n_o=n_o)
 
 # ----------------------------------------------------
 # 3. HÀM TẠO ĐỐI TƯỢNG CGA VÀ PHÉP BIẾN ĐỔI
@@ -62,6 +224,7 @@ n_o = 0.5 * (em - ep)    # Vector gốc (e_origin)
 
 def create_vector_cga(x, y, z):
     """Tạo một vector Euclidean trong không gian CGA."""
+    _require('cga')
     return x*e1_cga + y*e2_cga + z*e3_cga
 
 def point_to_cga(P_euclidean):
@@ -69,6 +232,7 @@ def point_to_cga(P_euclidean):
     Chuyển đổi một vector Euclidean 3D sang Point trong CGA 5D.
     P = v + 0.5 * ||v||^2 * n_inf + n_o
     """
+    _require('cga')
     # P_euclidean là G3 Multivector. Lấy tọa độ từ G3.
     x, y, z = extract_coords(P_euclidean)
 
@@ -91,6 +255,7 @@ def create_cga_line(P1_cga, P2_cga):
     Tạo một Đường thẳng (Line) đi qua hai điểm CGA.
     Công thức: L = P1 ^ P2 ^ n_inf
     """
+    _require('cga')
     return P1_cga ^ P2_cga ^ n_inf
 
 def create_cga_sphere(center_euc, radius):
@@ -98,6 +263,7 @@ def create_cga_sphere(center_euc, radius):
     Tạo một Quả cầu (Sphere) từ vector tâm (G3 Multivector) và bán kính.
     Công thức: S = C - 0.5 * r^2 * n_inf (C là điểm CGA tâm)
     """
+    _require('cga')
     C_cga = point_to_cga(center_euc)
     # Tích trong (Inner Product) của quả cầu với chính nó là r^2
     S_cga = C_cga - 0.5 * radius**2 * n_inf
@@ -144,12 +310,14 @@ def get_closest_distance(O1, O2):
 
 # ... (Hàm point_to_cga giữ nguyên)
 
+@_memoize_versor
 def create_translator(translation_vector_euclidean):
     """
     Tạo một Translator (Tịnh tiến) từ vector Euclidean t.
     Công thức: T = 1 - 0.5 * n_inf * t_cga
     Chúng ta sẽ dùng tích ngoài (wedge) cho sự rõ ràng: T = 1 - 0.5 * t_cga ^ n_inf
     """
+    _require('cga')
     # Chuyển vector Euclidean (G3) sang vector t_cga (G4,1)
     x, y, z = extract_coords(translation_vector_euclidean)
     t_cga = create_vector_cga(x, y, z)
@@ -158,8 +326,583 @@ def create_translator(translation_vector_euclidean):
     # T = 1 - 0.5 * (t_cga * n_inf)
     T = 1 - 0.5 * (t_cga ^ n_inf)  # <-- Translator dựa trên Wedge Product
     return T
+
+# ----------------------------------------------------
+# 4. BATCH G3 / CGA (MẢNG NUMPY, KHÔNG TẠO MULTIVECTOR)
+# ----------------------------------------------------
+# Hằng số batch (lấy từ layout G3 / layout_cga, hoặc từ cache trên đĩa):
+#   G3_ROTOR_INDEX: rotor G3 dạng mảng (N, 4) = [scalar, e12, e13, e23] theo thứ tự layout G3
+#   CGA_GRADE1_INDEX: vị trí các hệ số grade 1 (e1..e5) trong mảng 32 hệ số của layout_cga
+#   CGA_GRADE1_METRIC: metric của e1..e5 (e_i . e_i = +1, +1, +1, +1, -1)
+#   CGA_N_INF_GRADE1 / CGA_N_O_GRADE1: hệ số grade 1 của n_inf và n_o
+#   CGA_NULL_TO_GRADE1: đổi từ cơ sở null (e1, e2, e3, n_o, n_inf) sang e1..e5;
+#   CGA_GRADE1_TO_NULL là ma trận nghịch đảo.
+# Cơ sở null: X = x e1 + y e2 + z e3 + a * n_o + b * n_inf.
+# Ở bán kính quỹ đạo (||x||^2 ~ 1e7..1e9 km^2), hệ số e4/e5 đều xấp xỉ 0.5||x||^2
+# nên tích trong theo e4/e5 bị triệt tiêu số học rất nặng. Trong cơ sở null tích trong
+# chỉ còn x.x' - a b' - b a' (n_o . n_inf = -1) và giữ được a (hệ số n_o) chính xác,
+# nhưng x.x' và b ~ 0.5||x||^2 vẫn triệt tiêu nhau khi hai vật ở gần: với cặp vật cần
+# độ chính xác (khoảng cách, biên an toàn), tịnh tiến về một tâm trước (tích trong bất
+# biến qua translator), như sphere_meet_from_centers và sàng lọc va chạm.
+
+def _compute_batch_constants():
+    _require('g3', 'cga')
+    rotor_index = np.array([i for i, g in enumerate(layout.gradeList) if g in (0, 2)])
+    grade1_index = np.array([i for i, g in enumerate(layout_cga.gradeList) if g == 1])
+    n_inf_g1 = n_inf.value[grade1_index]
+    n_o_g1 = n_o.value[grade1_index]
+    null_to_grade1 = np.column_stack([np.eye(5)[:, :3], n_o_g1, n_inf_g1])
+    return {
+        'G3_ROTOR_INDEX': rotor_index,
+        'G3_BIVECTOR_INDEX': rotor_index[1:],
+        'CGA_DIMS': layout_cga.gaDims,
+        'CGA_GRADE1_INDEX': grade1_index,
+        'CGA_GRADE1_METRIC': np.asarray(layout_cga.sig, dtype=float),
+        'CGA_N_INF_GRADE1': n_inf_g1,
+        'CGA_N_O_GRADE1': n_o_g1,
+        'CGA_NULL_TO_GRADE1': null_to_grade1,
+        'CGA_GRADE1_TO_NULL': np.linalg.inv(null_to_grade1),
+    }
+
+def _load_constants(path):
+    """Hằng số từ cache .npz; None nếu thiếu, hỏng (ví dụ đang ghi dở) hoặc khác phiên bản."""
+    try:
+        with np.load(path) as data:
+            if int(data['format']) != _ALGEBRA_CACHE_FORMAT:
+                return None
+            constants = {name: data[name] for name in _LAZY_NAMES['constants']}
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+        return None
+    constants['CGA_DIMS'] = int(constants['CGA_DIMS'])
+    return constants
+
+def _save_constants(path, constants):
+    """Ghi nguyên tử: file tạm cùng thư mục rồi os.replace, tiến trình khác không thấy file dở."""
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.npz.tmp')
+        with os.fdopen(fd, 'wb') as f:  # Ghi qua file object: np.savez không thêm đuôi .npz
+            np.savez(f, format=_ALGEBRA_CACHE_FORMAT, **constants)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Cache chỉ để tăng tốc: lỗi ghi không làm hỏng việc dựng hằng số
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _build_constants():
+    path = _algebra_cache_path
+    constants = _load_constants(path) if path and os.path.exists(path) else None
+    if constants is not None:
+        globals().update(constants)
+        return
+
+    constants = _compute_batch_constants()
+    globals().update(constants)
+    if path:
+        _save_constants(path, constants)
+
+def rotor_to_coeffs(R):
+    """Chuyển Rotor G3 (Multivector) sang mảng 4 hệ số [s, e12, e13, e23]."""
+    _require('constants')
+    return R.value[G3_ROTOR_INDEX].copy()
+
+def coeffs_to_rotor(coeffs):
+    """Chuyển mảng 4 hệ số [s, e12, e13, e23] về Rotor G3 (Multivector)."""
+    _require('g3', 'constants')
+    value = np.zeros(layout.gaDims)
+    value[G3_ROTOR_INDEX] = coeffs
+    return cf.MultiVector(layout, value)
+
+def create_bivectors_from_planes_batch(v1, v2):
+    """
+    Phiên bản vector hóa của create_bivector_from_plane: B = v1 ^ v2.
+    v1, v2: mảng (N, 3). Trả về (N, 3) hệ số [e12, e13, e23].
+    """
+    a = np.asarray(v1, dtype=float)
+    b = np.asarray(v2, dtype=float)
+    return np.stack([
+        a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0],
+        a[..., 0] * b[..., 2] - a[..., 2] * b[..., 0],
+        a[..., 1] * b[..., 2] - a[..., 2] * b[..., 1],
+    ], axis=-1)
+
+def create_rotors_batch(bivectors, angles):
+    """
+    Phiên bản vector hóa của create_rotor: R = cos(a/2) - B_hat * sin(a/2).
+    bivectors: (N, 3) hệ số [e12, e13, e23] (hoặc (3,) dùng chung),
+    angles: (N,) góc quay (rad). Trả về mảng rotor (N, 4).
+    """
+    B = np.asarray(bivectors, dtype=float)
+    half_angle = 0.5 * np.asarray(angles, dtype=float)
+    B_hat = B / np.linalg.norm(B, axis=-1, keepdims=True)
+    bivector_part = -B_hat * np.sin(half_angle)[..., None]
+    scalar_part = np.broadcast_to(
+        np.cos(half_angle)[..., None], bivector_part.shape[:-1] + (1,)
+    )
+    return np.concatenate([scalar_part, bivector_part], axis=-1)
+
+def _rotor_axis_part(rotors):
+    """
+    Tách rotor (..., 4) thành (w, u) theo quaternion tương đương:
+    w = s, u = (-e23, e13, -e12)  (vì e23 = I e1, e13 = -I e2, e12 = I e3).
+    """
+    R = np.asarray(rotors, dtype=float)
+    u = np.stack([-R[..., 3], R[..., 2], -R[..., 1]], axis=-1)
+    return R[..., 0], u
+
+def rotors_to_matrices_batch(rotors):
+    """Chuyển mảng rotor (N, 4) sang ma trận quay (N, 3, 3) tương đương."""
+    w, u = _rotor_axis_part(rotors)
+    x, y, z = u[..., 0], u[..., 1], u[..., 2]
+    return np.stack([
+        np.stack([1 - 2*(y*y + z*z), 2*(x*y - w*z), 2*(x*z + w*y)], axis=-1),
+        np.stack([2*(x*y + w*z), 1 - 2*(x*x + z*z), 2*(y*z - w*x)], axis=-1),
+        np.stack([2*(x*z - w*y), 2*(y*z + w*x), 1 - 2*(x*x + y*y)], axis=-1),
+    ], axis=-2)
+
+def apply_rotors_batch(rotors, vectors):
+    """
+    Phiên bản vector hóa của apply_rotor: v' = R v ~R (dạng đóng, không tích hình học).
+    Hỗ trợ broadcast: một rotor (4,) cho nhiều vector (N, 3),
+    hoặc N rotor (N, 4) cho N vector (N, 3) tương ứng. Trả về (N, 3).
+    """
+    v = np.asarray(vectors, dtype=float)
+    w, u = _rotor_axis_part(rotors)
+    # v' = v + 2w (u x v) + 2 u x (u x v)
+    uv = np.cross(u, v)
+    return v + 2.0 * w[..., None] * uv + 2.0 * np.cross(u, uv)
+
+# --- Nội suy rotor (log / exp / slerp) ---
+# Bivector B = [e12, e13, e23] có B^2 = -||B||^2, nên exp(B) = cos||B|| + B sin||B|| / ||B||
+# và create_rotor(B_hat, a) = exp(-B_hat a / 2). sin(x) / x tính bằng np.sinc để
+# không chia cho 0 khi góc nhỏ.
+
+def _rotor_from_axis_part(w, u):
+    return np.concatenate([w[..., None], np.stack([-u[..., 2], u[..., 1], -u[..., 0]], axis=-1)], axis=-1)
+
+def rotor_reverse_batch(rotors):
+    """Nghịch đảo (reverse) ~R của mảng rotor (..., 4): đổi dấu phần bivector."""
+    R = np.array(rotors, dtype=float)
+    R[..., 1:] *= -1.0
+    return R
+
+def rotor_product_batch(A, B):
+    """Tích hình học A * B của hai mảng rotor (..., 4), có broadcast."""
+    wa, ua = _rotor_axis_part(A)
+    wb, ub = _rotor_axis_part(B)
+    w = wa * wb - np.einsum('...i,...i->...', ua, ub)
+    u = wa[..., None] * ub + wb[..., None] * ua + np.cross(ua, ub)
+    return _rotor_from_axis_part(w, u)
+
+def rotor_exp_batch(bivectors):
+    """exp(B) của mảng bivector (..., 3) [e12, e13, e23]. Trả về rotor (..., 4)."""
+    B = np.asarray(bivectors, dtype=float)
+    theta = np.linalg.norm(B, axis=-1)
+    scale = np.sinc(theta / np.pi)  # sin(theta) / theta, = 1 khi theta = 0
+    return np.concatenate([np.cos(theta)[..., None], B * scale[..., None]], axis=-1)
+
+def rotor_log_batch(rotors):
+    """
+    log(R) của mảng rotor đơn vị (..., 4): bivector (..., 3) với exp(log R) = R,
+    góc nửa trong [0, pi]. Muốn đường ngắn nhất thì đổi dấu R khi s < 0 trước khi gọi.
+    R = -1 (góc nửa pi, mặt phẳng không xác định): trả về pi * e12.
+    """
+    R = np.asarray(rotors, dtype=float)
+    b = R[..., 1:]
+    norm_b = np.linalg.norm(b, axis=-1)
+    theta = np.arctan2(norm_b, R[..., 0])
+    # theta * b / |b|: không chia cho sin(theta) nên vẫn đúng khi theta -> pi
+    degenerate = norm_b == 0.0
+    log = b * np.where(degenerate, 0.0, theta / np.where(degenerate, 1.0, norm_b))[..., None]
+    log[..., 0] = np.where(degenerate & (R[..., 0] < 0.0), np.pi, log[..., 0])
+    return log
+
+def rotor_slerp_batch(R0, R1, t):
+    """
+    Nội suy cầu R0 -> R1 tại tham số t (broadcast): R0 * exp(t * log(~R0 R1)).
+    Chọn dấu của R1 để đi đường ngắn nhất (R và -R cùng một phép quay).
+    """
+    delta = rotor_product_batch(rotor_reverse_batch(R0), R1)
+    delta = np.where(delta[..., :1] < 0.0, -delta, delta)
+    t = np.asarray(t, dtype=float)[..., None]
+    return rotor_product_batch(R0, rotor_exp_batch(t * rotor_log_batch(delta)))
+
+def interpolate_rotors(key_times, key_rotors, sample_times, vectors=None):
+    """
+    Nội suy slerp từng đoạn qua K rotor keyframe (K, 4) tại các thời điểm key_times (K,)
+    tăng ngặt, đánh giá tại M thời điểm sample_times. Ngoài khoảng keyframe: giữ rotor biên.
+    Trả về rotor (M, 4); nếu có vectors (3,) hoặc (P, 3) gắn với vật thể, trả về thêm
+    các vector đã quay (M, 3) hoặc (M, P, 3).
+    """
+    key_times = np.asarray(key_times, dtype=float)
+    keys = np.asarray(key_rotors, dtype=float)
+    t = np.asarray(sample_times, dtype=float)
+    if key_times.shape != keys.shape[:1] or not len(keys):
+        raise ValueError(f"key_times {key_times.shape} không khớp key_rotors {keys.shape}")
+    if np.any(np.diff(key_times) <= 0.0):
+        raise ValueError("key_times phải tăng ngặt (không trùng thời điểm)")
+    if len(keys) == 1:
+        rotors = np.broadcast_to(keys[0], t.shape + (4,)).copy()
+    else:
+        # Bivector của từng đoạn (tính một lần cho K - 1 đoạn)
+        delta = rotor_product_batch(rotor_reverse_batch(keys[:-1]), keys[1:])
+        delta = np.where(delta[:, :1] < 0.0, -delta, delta)
+        segment_logs = rotor_log_batch(delta)
+
+        k = np.clip(np.searchsorted(key_times, t, side='right') - 1, 0, len(keys) - 2)
+        u = np.clip((t - key_times[k]) / (key_times[k + 1] - key_times[k]), 0.0, 1.0)
+        rotors = rotor_product_batch(keys[k], rotor_exp_batch(u[..., None] * segment_logs[k]))
+
+    if vectors is None:
+        return rotors
+    v = np.asarray(vectors, dtype=float)
+    R = rotors if v.ndim == 1 else rotors[:, None, :]
+    return rotors, apply_rotors_batch(R, v)
+
+def points_to_cga_batch(points_euc, grade1_only=False):
+    """
+    Phiên bản vector hóa của point_to_cga cho mảng điểm (N, 3).
+    P = v + 0.5 * ||v||^2 * n_inf + n_o, tính hoàn toàn bằng số học mảng.
+    Trả về mảng (N, 32) theo layout_cga, hoặc (N, 5) nếu grade1_only=True.
+    """
+    _require('constants')
+    pts = np.atleast_2d(np.asarray(points_euc, dtype=float))
+    if pts.shape[-1] != 3:
+        raise ValueError(f"points_euc phải có dạng (N, 3), nhận {pts.shape}")
+
+    # ||v||^2 tính trực tiếp, không cần tích hình học v * v
+    v_sq = np.einsum('ij,ij->i', pts, pts)
+
+    # Hệ số grade 1 của n_inf và n_o (lấy từ chính layout_cga)
+    coeffs_g1 = np.empty((pts.shape[0], 5))
+    coeffs_g1[:, :3] = pts
+    coeffs_g1[:, 3:] = 0.0
+    coeffs_g1 += 0.5 * v_sq[:, None] * CGA_N_INF_GRADE1 + CGA_N_O_GRADE1
+
+    if grade1_only:
+        return coeffs_g1
+
+    coeffs = np.zeros((pts.shape[0], CGA_DIMS))
+    coeffs[:, CGA_GRADE1_INDEX] = coeffs_g1
+    return coeffs
+
+def spheres_to_cga_batch(centers_euc, radii, grade1_only=False):
+    """
+    Phiên bản vector hóa của create_cga_sphere: S = C - 0.5 * r^2 * n_inf.
+    centers_euc: (N, 3), radii: (N,) hoặc vô hướng.
+    Trả về (N, 32) theo layout_cga, hoặc (N, 5) nếu grade1_only=True.
+    """
+    S = points_to_cga_batch(centers_euc, grade1_only=True)
+    r_sq = np.broadcast_to(np.asarray(radii, dtype=float) ** 2, S.shape[:1])
+    S -= 0.5 * r_sq[:, None] * CGA_N_INF_GRADE1
+
+    if grade1_only:
+        return S
+
+    coeffs = np.zeros((S.shape[0], CGA_DIMS))
+    coeffs[:, CGA_GRADE1_INDEX] = S
+    return coeffs
+
+def cga_inner_product_batch(A, B):
+    """
+    Tích trong (A | B) của từng cặp vector grade 1, A và B dạng (N, 5).
+    Với hai điểm chuẩn hóa: P_i . P_j = -0.5 * ||x_i - x_j||^2.
+    Với hai sphere: S_i . S_j = 0.5 * (r_i^2 + r_j^2 - ||c_i - c_j||^2).
+    """
+    _require('constants')
+    return np.einsum('...k,...k,k->...', A, B, CGA_GRADE1_METRIC)
+
+# Sphere mixed precision trong cơ sở null: coords (N, 4) = [x, y, z, alpha] lưu ở dtype
+# thấp (float32), b (N,) = hệ số n_inf lưu float64. Ở bán kính quỹ đạo b ~ 0.5 ||c||^2
+# lớn hơn r^2 cả chục triệu lần, làm tròn b về float32 sẽ xóa mất r^2.
+MixedNullSpheres = namedtuple('MixedNullSpheres', ['coords', 'b'])
+
+def _to_mixed_null(X, dtype):
+    """
+    Làm tròn hệ số null float64 (N, 5) về MixedNullSpheres: coords theo dtype, b chỉnh
+    lại theo coords đã làm tròn sao cho r^2 giữ nguyên (chỉ tâm bị làm tròn).
+    """
+    coords = X[:, :4].astype(dtype)
+    x, alpha = coords[:, :3].astype(np.float64), coords[:, 3].astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r_sq = (np.einsum('ij,ij->i', X[:, :3], X[:, :3]) / X[:, 3] - 2.0 * X[:, 4]) / X[:, 3]
+        b = 0.5 * (np.einsum('ij,ij->i', x, x) / alpha - alpha * r_sq)
+    return MixedNullSpheres(coords, np.where(np.isfinite(b), b, X[:, 4]))
+
+def mixed_null_to_float64(S):
+    """Hệ số null (N, 5) float64 từ MixedNullSpheres (mảng thường: đổi sang float64)."""
+    if isinstance(S, MixedNullSpheres):
+        return np.column_stack([S.coords.astype(np.float64), S.b])
+    return np.asarray(S, dtype=np.float64)
+
+def spheres_to_cga_null_batch(centers_euc, radii, dtype=np.float64):
+    """
+    Sphere (hoặc điểm nếu r = 0) trong cơ sở null: (N, 5) = [x, y, z, 1, 0.5 * (||c||^2 - r^2)].
+    Đổi về hệ số grade 1 của layout_cga bằng S_null @ CGA_NULL_TO_GRADE1.T.
+    dtype khác float64 (ví dụ np.float32): trả về MixedNullSpheres, tâm lưu theo dtype và
+    hệ số n_inf lưu float64, tính từ chính tâm đã làm tròn.
+    """
+    c = np.atleast_2d(np.asarray(centers_euc))
+    if not np.issubdtype(c.dtype, np.floating):
+        c = c.astype(float)
+    mixed = np.dtype(dtype) != np.float64
+    if mixed:
+        c = c.astype(dtype).astype(np.float64)
+    r_sq = np.broadcast_to(np.asarray(radii, dtype=float) ** 2, c.shape[:1])
+    S = np.empty((c.shape[0], 5))
+    S[:, :3] = c
+    S[:, 3] = 1.0
+    S[:, 4] = 0.5 * (np.einsum('ij,ij->i', c, c, dtype=np.float64) - r_sq)
+    return _to_mixed_null(S, dtype) if mixed else S
+
+def cga_null_inner_product_batch(A, B):
+    """
+    Tích trong (A | B) của từng cặp vector grade 1 cho trong cơ sở null (N, 5).
+    Luôn tích lũy bằng float64, kể cả khi A, B lưu ở float32.
+    """
+    return (np.einsum('...k,...k->...', A[..., :3], B[..., :3], dtype=np.float64)
+            - np.multiply(A[..., 3], B[..., 4], dtype=np.float64)
+            - np.multiply(A[..., 4], B[..., 3], dtype=np.float64))
+
+# Giải mã điểm / sphere đối ngẫu về Euclidean. Trong cơ sở null:
+#   X = alpha * (c + 0.5 * (||c||^2 - r^2) * n_inf + n_o)
+# nên alpha = hệ số n_o (= -X . n_inf), c = x / alpha, r^2 = ||c||^2 - 2 * b / alpha.
+# alpha ~ 0: điểm / sphere ở vô cực (tâm NaN); r^2 < 0: sphere ảo.
+CGASphereDecoding = namedtuple(
+    'CGASphereDecoding', ['centers', 'radii', 'radii_sq', 'at_infinity', 'imaginary']
+)
+
+def _grade1_null_coeffs(coeffs, null_basis):
+    """Hệ số (N, 5) trong cơ sở null từ (N, 32), (N, 5) grade 1 hoặc (N, 5) cơ sở null."""
+    _require('constants')
+    if isinstance(coeffs, MixedNullSpheres):
+        return mixed_null_to_float64(coeffs)
+    X = np.atleast_2d(np.asarray(coeffs, dtype=float))
+    if X.shape[-1] == CGA_DIMS and not null_basis:
+        X = X[:, CGA_GRADE1_INDEX]
+    elif X.shape[-1] != 5:
+        raise ValueError(f"coeffs phải có dạng (N, {CGA_DIMS}) hoặc (N, 5), nhận {X.shape}")
+    return X if null_basis else X @ CGA_GRADE1_TO_NULL.T
+
+def _normalize_null(X, tol):
+    alpha = X[:, 3]
+    at_infinity = np.abs(alpha) <= tol * np.abs(X).max(axis=1)
+    inv_alpha = 1.0 / np.where(at_infinity, np.nan, alpha)
+    return X[:, :3] * inv_alpha[:, None], inv_alpha, at_infinity
+
+def cga_to_points_batch(coeffs, null_basis=False, tol=1e-12):
+    """
+    Giải mã điểm CGA (không cần chuẩn hóa) về tọa độ Euclidean.
+    coeffs: (N, 32) theo layout_cga, (N, 5) grade 1, hoặc (N, 5) cơ sở null nếu null_basis=True.
+    Trả về (centers (N, 3), at_infinity (N,)); điểm ở vô cực có tọa độ NaN.
+    """
+    centers, _, at_infinity = _normalize_null(_grade1_null_coeffs(coeffs, null_basis), tol)
+    return centers, at_infinity
+
+def cga_to_spheres_batch(coeffs, null_basis=False, tol=1e-12):
+    """
+    Giải mã sphere đối ngẫu S = C - 0.5 * r^2 * n_inf (như create_cga_sphere,
+    spheres_to_cga_batch, spheres_to_cga_null_batch; không cần chuẩn hóa) về tâm và bán kính.
+    Trả về CGASphereDecoding: centers (N, 3), radii = sqrt(|r^2|), radii_sq (có dấu),
+    at_infinity (tâm / bán kính NaN) và imaginary (r^2 < 0).
+    """
+    X = _grade1_null_coeffs(coeffs, null_basis)
+    centers, inv_alpha, at_infinity = _normalize_null(X, tol)
+    c_sq = np.einsum('ij,ij->i', centers, centers)
+    r_sq = c_sq - 2.0 * X[:, 4] * inv_alpha
+    imaginary = r_sq < -tol * (c_sq + 1.0)
+    return CGASphereDecoding(centers, np.sqrt(np.abs(r_sq)), r_sq, at_infinity, imaginary)
+
+# --- Meet của hai sphere (đường tròn giao) ---
+# Với hai sphere đối ngẫu đã chuẩn hóa (hệ số n_o = 1), K = S1 ^ S2 là đường tròn giao
+# (đối ngẫu) và, vì S1, S2 là vector grade 1:
+#   S_i . S_i = r_i^2,  S1 . S2 = 0.5 (r1^2 + r2^2 - d^2),  K^2 = (S1 . S2)^2 - r1^2 r2^2
+#   (K . n_inf)^2 = -d^2 (= -|x(S1 - S2)|^2),  bán kính đường tròn rho^2 = -K^2 / d^2.
+# K^2 < 0: cắt nhau; K^2 = 0: tiếp xúc; K^2 > 0: rời nhau hoặc lồng nhau. Mặt phẳng chứa
+# đường tròn là S1 - S2 (pháp tuyến c2 - c1), tâm cách c1 một đoạn (S1 . S1 - S1 . S2) / d.
+# Các tích trong được tính trong hệ tịnh tiến về c1 (bất biến) để tránh triệt tiêu số học.
+SPHERE_DISJOINT, SPHERE_TANGENT, SPHERE_INTERSECTING, SPHERE_CONTAINED = range(4)
+SPHERE_RELATION_NAMES = ('disjoint', 'tangent', 'intersecting', 'contained')
+
+# centers (N, 3), normals (N, 3) đơn vị từ sphere 1 sang sphere 2, radii (N,) của đường tròn
+# giao (0 khi tiếp xúc; NaN khi rời nhau / lồng nhau), depth = r1 + r2 - d (> 0: chồng lấn),
+# relation (N,) mã SPHERE_* (tên trong SPHERE_RELATION_NAMES)
+SphereMeet = namedtuple('SphereMeet', ['centers', 'normals', 'radii', 'depth', 'relation'])
+
+def sphere_meet_from_centers(c1, r1, c2, r2, tol=1e-9):
+    """
+    Meet S1 ^ S2 của từng cặp sphere cho bởi tâm (N, 3) và bán kính (N,).
+    tol: ngưỡng tương đối của K^2 để coi là tiếp xúc. Trả về SphereMeet.
+    """
+    c1 = np.atleast_2d(np.asarray(c1, dtype=float))
+    c2 = np.atleast_2d(np.asarray(c2, dtype=float))
+    r1 = np.broadcast_to(np.asarray(r1, dtype=float), c1.shape[:1])
+    r2 = np.broadcast_to(np.asarray(r2, dtype=float), c1.shape[:1])
+    delta = c2 - c1
+    S1 = spheres_to_cga_null_batch(np.zeros_like(delta), r1)
+    S2 = spheres_to_cga_null_batch(delta, r2)
+    S11 = cga_null_inner_product_batch(S1, S1)
+    S22 = cga_null_inner_product_batch(S2, S2)
+    S12 = cga_null_inner_product_batch(S1, S2)
+    K_sq = S12**2 - S11 * S22
+    d_sq = np.einsum('ij,ij->i', delta, delta)
+    d = np.sqrt(d_sq)
+
+    concentric = d <= tol * (r1 + r2)
+    tangent = ~concentric & (np.abs(K_sq) <= tol * (S12**2 + S11 * S22))
+    intersecting = ~concentric & ~tangent & (K_sq < 0.0)
+    # K^2 > 0: lồng nhau khi d < |r1 - r2|, tức S1 . S2 > r1 r2
+    contained = concentric | (~tangent & ~intersecting & (S12 > 0.0))
+    relation = np.full(len(d), SPHERE_DISJOINT, dtype=np.int8)
+    relation[tangent] = SPHERE_TANGENT
+    relation[intersecting] = SPHERE_INTERSECTING
+    relation[contained] = SPHERE_CONTAINED
+
+    safe_d = np.where(concentric, np.nan, d)
+    normals = delta / safe_d[:, None]
+    offset = (S11 - S12) / safe_d
+    radii = np.where(intersecting, np.sqrt(np.maximum(-K_sq, 0.0)) / safe_d, np.nan)
+    radii[tangent] = 0.0
+    centers = c1 + offset[:, None] * normals
+    centers[~(intersecting | tangent)] = np.nan
+    return SphereMeet(centers, normals, radii, r1 + r2 - d, relation)
+
+def sphere_meet_batch(S1, S2, null_basis=False, tol=1e-9):
+    """
+    Meet vector hóa của các cặp sphere đối ngẫu (như create_cga_sphere):
+    S1, S2 dạng (N, 32), (N, 5) grade 1 hoặc (N, 5) cơ sở null (null_basis=True).
+    Giải mã tâm / bán kính rồi tính như sphere_meet_from_centers. Trả về SphereMeet.
+    """
+    A = cga_to_spheres_batch(S1, null_basis=null_basis)
+    B = cga_to_spheres_batch(S2, null_basis=null_basis)
+    return sphere_meet_from_centers(A.centers, A.radii, B.centers, B.radii, tol=tol)
+
 # ----------------------------------------------------
-# 4. SELF TEST (Cập nhật)
+# 5. VERSOR "BIÊN DỊCH" THÀNH ÁNH XẠ TUYẾN TÍNH
+# ----------------------------------------------------
+# Tác động X -> V * X * ~V là tuyến tính theo X, nên có thể tính một lần
+# thành ma trận rồi áp dụng cho cả mảng điểm bằng một phép nhân ma trận.
+
+def g3_to_cga(mv_g3):
+    """Nhúng một Multivector G3 (ví dụ Rotor từ create_rotor) vào G(4,1)."""
+    _require('g3', 'cga')
+    value = np.zeros(layout_cga.gaDims)
+    for idx, blade in enumerate(layout.bladeTupList):
+        value[layout_cga.bladeTupList.index(blade)] = mv_g3.value[idx]
+    return cf.MultiVector(layout_cga, value)
+
+def compile_versor(V, full=False, null_basis=False):
+    """
+    Biên dịch versor V (Translator, Rotor hoặc tích của chúng) thành ma trận
+    của phép biến đổi X -> V * X * ~V.
+    full=False: ma trận 5x5 tác động lên hệ số grade 1 (điểm, sphere).
+    full=True: ma trận 32x32 (khối chéo theo từng grade) cho mọi Multivector.
+    null_basis=True: ma trận 5x5 tác động lên hệ số cơ sở null (spheres_to_cga_null_batch).
+    """
+    _require('g3', 'cga', 'constants')
+    if V.layout is layout:
+        V = g3_to_cga(V)
+    V_rev = ~V
+
+    blade_index = np.arange(layout_cga.gaDims) if full else CGA_GRADE1_INDEX
+    M = np.zeros((len(blade_index), len(blade_index)))
+    for col, idx in enumerate(blade_index):
+        basis = np.zeros(layout_cga.gaDims)
+        basis[idx] = 1.0
+        image = V * cf.MultiVector(layout_cga, basis) * V_rev
+        M[:, col] = image.value[blade_index]
+    if null_basis and not full:
+        return CGA_GRADE1_TO_NULL @ M @ CGA_NULL_TO_GRADE1
+    return M
+
+# Kích thước khối khi áp dụng versor lên mảng float32: tính bằng float64 theo khối
+# để bộ nhớ tạm không phụ thuộc N.
+MIXED_PRECISION_CHUNK = 1 << 16
+
+def apply_compiled_versor(M, coeffs, dtype=None):
+    """
+    Áp dụng versor đã biên dịch lên mảng hệ số (N, 5) hoặc (N, 32)
+    bằng một phép nhân ma trận (tương đương V * X * ~V cho từng hàng).
+    dtype: kiểu lưu kết quả (mặc định theo coeffs). Với float32, phép nhân vẫn
+    thực hiện bằng float64 trên từng khối MIXED_PRECISION_CHUNK hàng.
+    coeffs là MixedNullSpheres (M trong cơ sở null): trả về MixedNullSpheres, b vẫn float64.
+    """
+    if isinstance(coeffs, MixedNullSpheres):
+        dtype = np.dtype(dtype or coeffs.coords.dtype)
+        coords = np.empty(coeffs.coords.shape, dtype=dtype)
+        b = np.empty(len(coeffs.b))
+        for start in range(0, len(b), MIXED_PRECISION_CHUNK):
+            block = slice(start, start + MIXED_PRECISION_CHUNK)
+            moved = mixed_null_to_float64(MixedNullSpheres(coeffs.coords[block], coeffs.b[block])) @ M.T
+            coords[block], b[block] = _to_mixed_null(moved, dtype)
+        return MixedNullSpheres(coords, b)
+    X = np.asarray(coeffs)
+    dtype = np.dtype(dtype or np.result_type(X.dtype, np.float32))
+    if dtype == np.float64 or X.ndim < 2:
+        return (X @ M.T).astype(dtype, copy=False)
+    out = np.empty(X.shape[:-1] + (M.shape[0],), dtype=dtype)
+    M_T = np.asarray(M, dtype=np.float64).T
+    for start in range(0, len(X), MIXED_PRECISION_CHUNK):
+        block = slice(start, start + MIXED_PRECISION_CHUNK)
+        out[block] = X[block].astype(np.float64) @ M_T
+    return out
+
+# Tên công khai cho "from src.ga_utilities import *": như trước khi dựng lười (mọi tên
+# công khai, kể cả np, math, e1, n_inf, layout_cga, CGA_*, ...), nên import * dựng luôn
+# các đại số. Muốn khởi động lười: "import src.ga_utilities as ga" hoặc import tường minh
+# các hàm cần dùng (như application_collision_avoidance).
+__all__ = [
+    name for name in list(globals()) if not name.startswith('_')
+] + [
+    name for names in _LAZY_NAMES.values() for name in names
+]
+
+# ----------------------------------------------------
+# 6. THỜI GIAN KHỞI ĐỘNG
+# ----------------------------------------------------
+_STARTUP_SNIPPETS = {
+    'eager (như bản cũ: clifford + G3 + G(4,1) khi import)':
+        "import src.ga_utilities as ga; ga._require('g3', 'cga', 'constants')",
+    'lazy import':
+        "import src.ga_utilities as ga",
+    'star import (mọi tên công khai, dựng đại số)':
+        "from src.ga_utilities import *",
+    'lazy + batch call':
+        "import src.ga_utilities as ga; ga.points_to_cga_batch(np.zeros((1, 3)))",
+    'lazy + batch call (disk cache)':
+        "import src.ga_utilities as ga; ga.points_to_cga_batch(np.zeros((1, 3)))",
+    'lazy + first Multivector product (JIT)':
+        "import src.ga_utilities as ga; ga.point_to_cga(ga.create_vector(1, 2, 3))",
+}
+
+def benchmark_startup(repeats=3):
+    """
+    Đo thời gian khởi động nguội (mỗi lần một tiến trình Python mới) của các
+    kịch bản import, so sánh import "eager" như bản cũ với import lười.
+    """
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    cache_path = os.path.join(tempfile.mkdtemp(), 'ga_constants.npz')
+    print(f"\n--- Startup Benchmark (best of {repeats}) ---")
+    for label, snippet in _STARTUP_SNIPPETS.items():
+        env = dict(os.environ, PYTHONPATH=repo_root)
+        env.pop(ALGEBRA_CACHE_ENV, None)
+        if 'disk cache' in label:
+            env[ALGEBRA_CACHE_ENV] = cache_path
+        code = ("import time; t0 = time.perf_counter(); import numpy as np; " + snippet +
+                "; import sys; print(time.perf_counter() - t0, 'clifford' in sys.modules)")
+        runs = []
+        for _ in range(repeats + ('disk cache' in label)):
+            out = subprocess.run([sys.executable, '-c', code], env=env, cwd=repo_root,
+                                 capture_output=True, text=True, check=True).stdout.split()
+            runs.append(float(out[0]))
+        # Lần chạy đầu với disk cache chỉ để ghi cache, không tính
+        best = min(runs[1:] if 'disk cache' in label else runs)
+        print(f"{label:<55} {best:.3f} s  (clifford imported: {out[1]})")
+
+# ----------------------------------------------------
+# 7. SELF TEST (Cập nhật)
 # ----------------------------------------------------
 if __name__ == '__main__':
     # ... (G3 Test giữ nguyên)
@@ -186,4 +929,72 @@ if __name__ == '__main__':
     P_prime_cga = T * P_origin_cga * (~T)
     print(f"P_o' (Tịnh tiến P_o): {P_prime_cga}")
 
+    # 5. Batch embedding phải khớp point_to_cga từng điểm
+    pts = np.random.default_rng(0).uniform(-7000, 7000, size=(100, 3))
+    P_batch = points_to_cga_batch(pts)
+    P_loop = np.array([point_to_cga(create_vector(*p)).value for p in pts])
+    rel_err = np.max(np.abs(P_batch - P_loop)) / np.max(np.abs(P_loop))
+    print(f"Batch vs point_to_cga (max rel err): {rel_err:.3e}")
+
+    # Giải mã ngược: điểm -> tọa độ, sphere -> tâm + bán kính
+    radii = np.linspace(0.5, 2.0, len(pts))
+    decoded = cga_to_spheres_batch(spheres_to_cga_batch(pts, radii))
+    print(f"Decode points (max abs err): {np.max(np.abs(cga_to_points_batch(P_loop)[0] - pts)):.3e}, "
+          f"spheres radius (max abs err): {np.max(np.abs(decoded.radii - radii)):.3e}")
+
+    # Meet hai sphere: so với dạng đóng Euclidean và với S1 ^ S2 của clifford
+    S_a = create_cga_sphere(create_vector(0, 0, 0), 1.0)
+    cases = [(1.5, 1.0), (2.0, 1.0), (3.0, 1.0), (0.2, 0.5)]  # cắt, tiếp xúc, rời, lồng
+    meet = sphere_meet_batch(
+        np.array([S_a.value] * len(cases)),
+        np.array([create_cga_sphere(create_vector(x, 0, 0), r).value for x, r in cases]),
+    )
+    K = S_a ^ create_cga_sphere(create_vector(1.5, 0, 0), 1.0)
+    K_sq = (K * K)[()]
+    print(f"Sphere meet: {[SPHERE_RELATION_NAMES[k] for k in meet.relation]}, "
+          f"circle center x {meet.centers[0, 0]:.4f} (exact 0.75), radius {meet.radii[0]:.4f} "
+          f"(exact {np.sqrt(1 - 0.75**2):.4f}), K^2 clifford {K_sq:.4f} vs -d^2 rho^2 "
+          f"{-(1.5 * meet.radii[0])**2:.4f}")
+
+    # 6. Cache versor: cùng đầu vào -> hit, bản trả về là bản sao độc lập.
+    # Đầu vào dựng ngoài vòng đo; cả hai đường được chạy trước một lần (JIT, mục cache).
+    B, angle, t_vec = e1 ^ e2, math.radians(30), create_vector(1.5, -2.0, 0.5)
+
+    def time_versors(n=1000):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            create_rotor(B, angle)
+        t1 = time.perf_counter()
+        for _ in range(n):
+            create_translator(t_vec)
+        return (t1 - t0) / n, (time.perf_counter() - t1) / n
+
+    time_versors(10)
+    t_plain = time_versors()
+    enable_versor_cache(maxsize=16)
+    time_versors(10)
+    t_cached = time_versors()
+    print(f"Versor cache info: {versor_cache_info()}")
+    disable_versor_cache()
+    print(f"Versor cache: create_rotor {t_plain[0] * 1e6:.1f} -> {t_cached[0] * 1e6:.1f} us, "
+          f"create_translator {t_plain[1] * 1e6:.1f} -> {t_cached[1] * 1e6:.1f} us per call")
+
+    # 7. Nội suy rotor: 100 Hz giữa các keyframe, khớp apply_rotor trên rotor đã lấy mẫu
+    rng = np.random.default_rng(1)
+    key_times = np.arange(6) * 10.0
+    key_rotors = create_rotors_batch(rng.normal(size=(6, 3)), rng.uniform(-np.pi, np.pi, 6))
+    key_rotors[2] *= -1.0  # Keyframe đối cực: cùng phép quay, dấu ngược
+    samples = np.arange(0.0, 50.0, 0.01)
+    t0 = time.perf_counter()
+    rotors, body_x = interpolate_rotors(key_times, key_rotors, samples, vectors=[1.0, 0.0, 0.0])
+    t_interp = time.perf_counter() - t0
+    check = [extract_coords(apply_rotor(coeffs_to_rotor(rotors[i]), e1)) for i in range(0, len(samples), 97)]
+    err = np.max(np.abs(np.array(check) - body_x[::97]))
+    step = np.max(np.linalg.norm(np.diff(body_x, axis=0), axis=1))
+    print(f"Rotor slerp: {len(samples)} samples in {t_interp * 1e3:.2f} ms, "
+          f"vs apply_rotor max err {err:.2e}, max step {step:.2e}")
+
     print("---------------------------------")
+
+    if '--startup' in sys.argv:
+        benchmark_startup()
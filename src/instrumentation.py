@@ -0,0 +1,243 @@
+# src/instrumentation.py (ĐO ĐẠC HOT PATH: SỐ LẦN GỌI, THỜI GIAN, SỐ PHẦN TỬ)
+#
+# Dùng:
+#     with instrument() as profile:
+#         screen_conjunctions(centers, radii)
+#     print(profile.summary())
+#     profile.export_chrome_trace('trace.json')   # chrome://tracing, Perfetto, speedscope
+#     profile.export_folded('stacks.folded')      # flamegraph.pl, speedscope
+#
+# Khi không bật, không có hàm nào bị bọc: overhead bằng 0. Khi bật, các hàm public
+# được thay tạm thời bằng wrapper (cả trong các module đã `import *` chúng) và
+# được khôi phục khi thoát khỏi khối with. Worker của ProcessPoolExecutor không được đo.
+
+import sys
+import json
+import time
+import types
+import importlib
+import threading
+import functools
+from collections import Counter
+from contextlib import contextmanager
+import numpy as np
+
+DEFAULT_MODULES = ('src.ga_utilities', 'src.application_collision_avoidance')
+
+_ACTIVE = None
+_LOCAL = threading.local()
+
+# ----------------------------------------------------
+# 1. THU THẬP SỐ LIỆU
+# ----------------------------------------------------
+
+def _element_count(args):
+    """Số phần tử của lời gọi: chiều đầu lớn nhất của các mảng >= 2 chiều, mặc định 1."""
+    n = 1
+    for a in args:
+        if isinstance(a, np.ndarray) and a.ndim >= 2:
+            n = max(n, a.shape[0])
+        elif isinstance(a, (list, tuple)) and len(a) and isinstance(a[0], (list, tuple, np.ndarray)):
+            n = max(n, len(a))
+    return n
+
+class Profile:
+    """
+    Số liệu của một phiên đo. Mỗi hàm: số lần gọi, thời gian tích lũy (inclusive),
+    thời gian riêng (self, trừ các hàm được đo lồng bên trong) và tổng số phần tử.
+    """
+
+    def __init__(self, trace=True, max_events=1_000_000):
+        self.stats = {}             # tên -> [calls, total_ns, self_ns, elements]
+        self.folded = Counter()     # ngăn xếp 'a;b;c' -> self_ns
+        self.events = [] if trace else None
+        self.max_events = max_events
+        self.dropped_events = 0
+        self.t0_ns = time.perf_counter_ns()
+        self.wall_ns = 0
+
+    def _record(self, name, stack, start_ns, total_ns, child_ns, elements):
+        entry = self.stats.get(name)
+        if entry is None:
+            entry = self.stats[name] = [0, 0, 0, 0]
+        entry[0] += 1
+        entry[1] += total_ns
+        entry[2] += total_ns - child_ns
+        entry[3] += elements
+        self.folded[';'.join(stack)] += total_ns - child_ns
+        if self.events is not None:
+            if len(self.events) < self.max_events:
+                self.events.append((name, start_ns, total_ns, threading.get_ident(), elements))
+            else:
+                self.dropped_events += 1
+
+    def rows(self, sort='total'):
+        """Danh sách dict theo từng hàm, sắp xếp giảm dần theo 'total', 'self' hoặc 'calls'."""
+        key = {'calls': 0, 'total': 1, 'self': 2}[sort]
+        rows = []
+        for name, (calls, total_ns, self_ns, elements) in sorted(
+                self.stats.items(), key=lambda item: -item[1][key]):
+            rows.append({
+                'name': name, 'calls': calls, 'total_s': total_ns * 1e-9, 'self_s': self_ns * 1e-9,
+                'mean_us': total_ns * 1e-3 / calls, 'elements': elements,
+                'ns_per_element': total_ns / elements,
+            })
+        return rows
+
+    def summary(self, sort='total', limit=None):
+        """Bảng tóm tắt dạng văn bản."""
+        rows = self.rows(sort)[:limit]
+        width = max([len(r['name']) for r in rows] + [8])
+        lines = [f"{'function':<{width}} {'calls':>9} {'total s':>10} {'self s':>10} "
+                 f"{'mean us':>10} {'elements':>11} {'ns/elem':>10}"]
+        for r in rows:
+            lines.append(f"{r['name']:<{width}} {r['calls']:>9} {r['total_s']:>10.4f} {r['self_s']:>10.4f} "
+                         f"{r['mean_us']:>10.1f} {r['elements']:>11} {r['ns_per_element']:>10.0f}")
+        lines.append(f"wall time: {self.wall_ns * 1e-9:.4f} s")
+        return '\n'.join(lines)
+
+    def export_chrome_trace(self, path):
+        """Ghi Chrome Trace Event JSON (sự kiện 'X', đơn vị micro giây)."""
+        if self.events is None:
+            raise RuntimeError("Phiên đo không ghi trace (trace=False)")
+        events = [{
+            'name': name, 'ph': 'X', 'pid': 0, 'tid': tid, 'cat': name.split('.')[0],
+            'ts': (start - self.t0_ns) / 1e3, 'dur': dur / 1e3, 'args': {'elements': elements},
+        } for name, start, dur, tid, elements in self.events]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms',
+                       'otherData': {'dropped_events': self.dropped_events}}, f)
+
+    def export_folded(self, path):
+        """Ghi định dạng 'folded stacks' (thời gian self theo micro giây) cho flame graph."""
+        with open(path, 'w') as f:
+            for stack, ns in sorted(self.folded.items()):
+                f.write(f"{stack} {max(ns // 1000, 1)}\n")
+
+# ----------------------------------------------------
+# 2. BỌC / KHÔI PHỤC HÀM
+# ----------------------------------------------------
+
+def _wrap(fn, name):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        profile = _ACTIVE
+        if profile is None:  # Đã tắt nhưng còn tham chiếu tới wrapper
+            return fn(*args, **kwargs)
+        stack = getattr(_LOCAL, 'stack', None)
+        if stack is None:
+            stack = _LOCAL.stack = []
+        stack.append([name, 0])
+        start = time.perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            total = time.perf_counter_ns() - start
+            frame = stack.pop()
+            if stack:
+                stack[-1][1] += total
+            profile._record(name, [f[0] for f in stack] + [name], start, total, frame[1],
+                            _element_count(args))
+    wrapper.__wrapped_instrumented__ = fn
+    return wrapper
+
+def _public_targets(module):
+    """(owner, attr, hàm, tên) của các hàm / method public định nghĩa trong module."""
+    short = module.__name__.rsplit('.', 1)[-1]
+    for attr, obj in list(vars(module).items()):
+        if attr.startswith('_') or getattr(obj, '__module__', None) != module.__name__:
+            continue
+        if isinstance(obj, types.FunctionType):
+            yield module, attr, obj, f"{short}.{attr}"
+        elif isinstance(obj, type):
+            for m_attr, m_obj in list(vars(obj).items()):
+                if not m_attr.startswith('_') and isinstance(m_obj, types.FunctionType):
+                    yield obj, m_attr, m_obj, f"{short}.{attr}.{m_attr}"
+
+def _patch(module_names):
+    """Thay các hàm bằng wrapper; trả về danh sách (owner, attr, bản gốc) để khôi phục."""
+    wrappers, patched = {}, []
+    for module_name in module_names:
+        module = importlib.import_module(module_name)
+        for owner, attr, fn, name in _public_targets(module):
+            if id(fn) not in wrappers:
+                wrappers[id(fn)] = (fn, _wrap(fn, name))
+            setattr(owner, attr, wrappers[id(fn)][1])
+            patched.append((owner, attr, fn))
+
+    # Các module khác giữ cùng đối tượng hàm (ví dụ `from src.ga_utilities import *`)
+    for module in list(sys.modules.values()):
+        namespace = getattr(module, '__dict__', None)
+        if not isinstance(namespace, dict):
+            continue
+        for attr, obj in list(namespace.items()):
+            entry = wrappers.get(id(obj))
+            if entry is not None and entry[0] is obj:
+                namespace[attr] = entry[1]
+                patched.append((module, attr, obj))
+    return patched
+
+def _unpatch(patched):
+    for owner, attr, fn in reversed(patched):
+        setattr(owner, attr, fn)
+
+# ----------------------------------------------------
+# 3. API
+# ----------------------------------------------------
+
+@contextmanager
+def instrument(modules=DEFAULT_MODULES, trace=True, max_events=1_000_000):
+    """
+    Bật đo đạc trong khối with và trả về Profile. trace=False chỉ giữ số liệu tổng hợp
+    (không lưu từng sự kiện); max_events giới hạn bộ nhớ của trace.
+    """
+    global _ACTIVE
+    if _ACTIVE is not None:
+        raise RuntimeError("Instrumentation đã được bật")
+    profile = Profile(trace=trace, max_events=max_events)
+    patched = _patch(modules)
+    _ACTIVE = profile
+    try:
+        yield profile
+    finally:
+        _ACTIVE = None
+        _unpatch(patched)
+        profile.wall_ns = time.perf_counter_ns() - profile.t0_ns
+
+# ----------------------------------------------------
+# 4. DEMO
+# ----------------------------------------------------
+if __name__ == '__main__':
+    import os
+    import tempfile
+    import src.ga_utilities as ga
+    import src.application_collision_avoidance as app
+
+    centers, radii = app.random_catalogue(20000)
+
+    def workload():
+        # Vòng lặp Multivector như demo gốc
+        ga.create_translator(ga.create_vector(0.5, 0.0, 0.0))
+        for p in centers[:200]:
+            v = ga.create_vector(*p)
+            ga.point_to_cga(v)
+            ga.extract_coords(ga.apply_rotor(ga.create_rotor(ga.e1 ^ ga.e2, 0.1), v))
+        S1 = ga.create_cga_sphere(ga.create_vector(0.0, 0.0, 0.0), 1.0)
+        S2 = ga.create_cga_sphere(ga.create_vector(1.5, 0.0, 0.0), 1.0)
+        for _ in range(100):
+            app.check_cga_intersection(S1, S2)
+        # Pipeline mảng
+        app.screen_conjunctions(centers, radii)
+        app.IncrementalScreener(radii, skin=1.0).update(centers)
+
+    workload()  # Không tính thời gian JIT của clifford vào profile
+    with instrument() as profile:
+        workload()
+
+    print("\n--- Hot-path profile ---")
+    print(profile.summary())
+
+    out = sys.argv[1] if len(sys.argv) > 1 else os.path.join(tempfile.gettempdir(), 'geosat_trace.json')
+    profile.export_chrome_trace(out)
+    profile.export_folded(os.path.splitext(out)[0] + '.folded')
+    print(f"Chrome trace: {out} ({len(profile.events)} events)")
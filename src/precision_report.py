@@ -0,0 +1,125 @@
+# src/precision_report.py (SAI SỐ FLOAT32 / MIXED PRECISION SO VỚI FLOAT64 Ở LEO VÀ GEO)
+#
+# Chạy:  python src/precision_report.py [N]
+# So sánh ba cách cho mỗi bước (nhúng CGA, sandwich versor, sàng lọc va chạm):
+#   float64  — đường tham chiếu
+#   mixed    — lưu float32, số hạng dễ triệt tiêu tính bằng float64 (chế độ của thư viện)
+#   float32  — mọi phép tính ở float32 (để thấy vì sao cần mixed)
+
+import sys
+import time
+import numpy as np
+from src.ga_utilities import (
+    create_translator, create_vector, compile_versor, apply_compiled_versor,
+    points_to_cga_batch, spheres_to_cga_null_batch, cga_to_points_batch, cga_to_spheres_batch,
+)
+from src.application_collision_avoidance import screen_conjunctions
+from src.satellite_geometry import bytes_per_object
+
+# Bán kính quỹ đạo (km): LEO ~ 400 km độ cao, GEO
+SCALES = {'LEO': 6778.0, 'GEO': 42164.0}
+KEEP_OUT_RADIUS = 1.0  # km
+# Ngưỡng (km) cho bán kính giải mã và biên an toàn của chế độ mixed
+RADIUS_TOLERANCE = 1e-6
+MARGIN_TOLERANCE = 1e-6
+
+def shell_catalogue(n_objects, orbit_radius, seed=0, close_fraction=0.2):
+    """N vật trên vỏ cầu bán kính orbit_radius (+-50 km); một phần nằm sát vật khác (0..3 km)."""
+    rng = np.random.default_rng(seed)
+    directions = rng.normal(size=(n_objects, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    centers = directions * (orbit_radius + rng.uniform(-50.0, 50.0, n_objects))[:, None]
+    close = rng.random(n_objects) < close_fraction
+    partners = rng.integers(0, n_objects, size=close.sum())
+    offsets = rng.normal(size=(close.sum(), 3))
+    offsets *= rng.uniform(0.0, 3.0, len(offsets))[:, None] / np.linalg.norm(offsets, axis=1, keepdims=True)
+    centers[close] = centers[partners] + offsets
+    return centers
+
+def _float32_inner_margins(S32, radii, i, j):
+    """Biên an toàn với tích trong CGA tính hoàn toàn ở float32."""
+    A, B = S32[i], S32[j]
+    ip = (A[:, :3] * B[:, :3]).sum(axis=1, dtype=np.float32) - A[:, 3] * B[:, 4] - A[:, 4] * B[:, 3]
+    r = radii.astype(np.float32)
+    d_sq = r[i]**2 + r[j]**2 - np.float32(2.0) * ip
+    return np.sqrt(np.maximum(d_sq, 0.0)) - (r[i] + r[j])
+
+def report_scale(name, orbit_radius, n_objects):
+    centers64 = shell_catalogue(n_objects, orbit_radius)
+    centers32 = centers64.astype(np.float32)
+    stored64 = centers32.astype(np.float64)  # Giá trị thực sự được lưu ở float32
+    radii = np.full(n_objects, KEEP_OUT_RADIUS)
+    print(f"\n=== {name} (|x| ~ {orbit_radius:,.0f} km, N = {n_objects}) ===")
+    print(f"Position storage (float32 rounding): {np.abs(stored64 - centers64).max() * 1e3:.3f} m max")
+
+    # 1. Nhúng CGA. Cơ sở e4/e5 ở float32 mất hẳn trọng số n_o (hiệu hai số ~0.5||x||^2).
+    decoded32, lost = cga_to_points_batch(points_to_cga_batch(centers64, grade1_only=True).astype(np.float32))
+    err_e45 = np.nanmax(np.abs(decoded32 - centers64)) if not lost.all() else np.inf
+    print(f"Embedding, e4/e5 basis stored float32: decode err {err_e45:.3e} km, "
+          f"points lost at infinity {lost.mean():.1%}")
+
+    S64 = spheres_to_cga_null_batch(stored64, radii)
+    S_mixed = spheres_to_cga_null_batch(centers32, radii, dtype=np.float32)
+    v_sq32 = np.einsum('ij,ij->i', centers32, centers32)  # float32
+    b32 = np.float32(0.5) * (v_sq32 - np.float32(KEEP_OUT_RADIUS**2))
+    rel = lambda b: np.abs(b.astype(np.float64) - S64[:, 4]).max() / np.abs(S64[:, 4]).max()
+    print(f"Embedding, null basis 0.5(|c|^2 - r^2) term rel err: mixed {rel(S_mixed.b):.2e}, "
+          f"float32 {rel(b32):.2e}")
+    decoded = cga_to_spheres_batch(S_mixed, null_basis=True)
+    S_all32 = np.column_stack([S_mixed.coords, b32])
+    naive = cga_to_spheres_batch(S_all32, null_basis=True)
+    radius_err = np.abs(decoded.radii - radii).max()
+    print(f"Embedding, null basis decode: center err mixed {np.abs(decoded.centers - stored64).max():.3e} km; "
+          f"radius err mixed {radius_err:.3e} km (imaginary {decoded.imaginary.mean():.1%}), "
+          f"float32 {np.abs(naive.radii - radii).max():.3e} km (imaginary {naive.imaginary.mean():.1%})")
+    assert radius_err < RADIUS_TOLERANCE and not decoded.imaginary.any(), \
+        f"mixed-precision spheres lost r^2: radius err {radius_err:.3e} km"
+
+    # 2. Sandwich: translator biên dịch trong cơ sở null
+    shift = np.array([12.5, -3.25, 0.75])
+    M = compile_versor(create_translator(create_vector(*shift)), null_basis=True)
+    moved64 = apply_compiled_versor(M, S64)
+    t0 = time.perf_counter()
+    moved_mixed = apply_compiled_versor(M, S_mixed)
+    t_mixed = time.perf_counter() - t0
+    moved_f32 = S_all32 @ M.astype(np.float32).T
+    err = lambda X: np.abs(cga_to_spheres_batch(X, null_basis=True).centers - (stored64 + shift)).max()
+    moved_radius_err = np.abs(cga_to_spheres_batch(moved_mixed, null_basis=True).radii - radii).max()
+    print(f"Sandwich (compiled translator): center err float64 {err(moved64):.2e}, "
+          f"mixed {err(moved_mixed):.2e}, float32 {err(moved_f32):.2e} km; "
+          f"mixed radius err {moved_radius_err:.2e} km (mixed {t_mixed * 1e3:.1f} ms)")
+    assert moved_radius_err < RADIUS_TOLERANCE, \
+        f"mixed-precision sandwich lost r^2: radius err {moved_radius_err:.3e} km"
+
+    # 3. Sàng lọc va chạm: float64 trên chính các giá trị đã lưu ở float32
+    t0 = time.perf_counter()
+    pairs64, margins64 = screen_conjunctions(stored64, radii)
+    t64 = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    pairs32, margins32 = screen_conjunctions(centers32, radii)
+    t32 = time.perf_counter() - t0
+    same = np.array_equal(pairs64, pairs32)
+    i, j = pairs64[:, 0], pairs64[:, 1]
+    exact = np.linalg.norm(stored64[j] - stored64[i], axis=1) - 2.0 * KEEP_OUT_RADIUS
+    mixed_err = np.abs(margins32 - exact).max() if same and len(exact) else float('nan')
+    naive = _float32_inner_margins(S_all32, radii, i, j)
+    # Biên an toàn từ tâm / bán kính giải mã của chính các sphere mixed đã lưu
+    stored_margins = (np.linalg.norm(decoded.centers[j] - decoded.centers[i], axis=1)
+                      - decoded.radii[i] - decoded.radii[j])
+    stored_err = np.abs(stored_margins - exact).max(initial=0.0)
+    print(f"Screening: {len(pairs64)} conflicts, mixed identical pairs={same}; margin err vs direct "
+          f"distance: float64 {np.abs(margins64 - exact).max():.2e}, mixed {mixed_err:.2e}, "
+          f"stored mixed spheres {stored_err:.2e}, float32 {np.abs(naive - exact).max():.2e} km")
+    assert same and mixed_err < MARGIN_TOLERANCE and stored_err < MARGIN_TOLERANCE, \
+        f"mixed-precision margins off: screening {mixed_err:.3e} km, stored spheres {stored_err:.3e} km"
+    print(f"Screening time: float64 {t64:.3f} s, mixed {t32:.3f} s")
+
+    # 4. Bộ nhớ
+    print(f"Memory: state {bytes_per_object(np.float64)} -> {bytes_per_object(np.float32)} bytes/object, "
+          f"null-basis spheres {S64.nbytes // n_objects} -> "
+          f"{(S_mixed.coords.nbytes + S_mixed.b.nbytes) // n_objects} bytes/object")
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    for scale_name, radius in SCALES.items():
+        report_scale(scale_name, radius, n)
@@ -0,0 +1,512 @@
+# src/satellite_geometry.py (CHÒM VỆ TINH DẠNG STRUCTURE-OF-ARRAYS)
+
+import os
+import time
+import tempfile
+from collections import namedtuple
+import numpy as np
+from src.ga_utilities import (
+    points_to_cga_batch, spheres_to_cga_batch, spheres_to_cga_null_batch, coeffs_to_rotor,
+    create_rotors_batch, rotor_product_batch, apply_rotors_batch, rotor_exp_batch,
+)
+
+# ----------------------------------------------------
+# 1. CONSTELLATION: MỖI THUỘC TÍNH LÀ MỘT MẢNG NUMPY LIỀN KỀ
+# ----------------------------------------------------
+# Tên trường -> (shape mỗi vệ tinh, dtype). Rotor G3 lưu theo thứ tự
+# [scalar, e12, e13, e23] như create_rotors_batch / apply_rotors_batch.
+CONSTELLATION_FIELDS = {
+    'ids': ((), np.int64),
+    'positions': ((3,), np.float64),
+    'velocities': ((3,), np.float64),
+    'radii': ((), np.float64),
+    'rotors': ((4,), np.float64),
+}
+
+def bytes_per_object(dtype=np.float64):
+    """Số byte mỗi vệ tinh khi các trường số thực lưu ở dtype (id luôn là int64)."""
+    return sum(
+        int(np.prod(shape, dtype=int)) * np.dtype(dtype if field_dtype == np.float64 else field_dtype).itemsize
+        for shape, field_dtype in CONSTELLATION_FIELDS.values()
+    )
+
+# 8 (id) + 24 (vị trí) + 24 (vận tốc) + 8 (bán kính) + 32 (rotor) = 96 byte / vệ tinh
+# (float32: 8 + 12 + 12 + 4 + 16 = 52 byte)
+BYTES_PER_OBJECT = bytes_per_object()
+
+class Constellation:
+    """
+    Chòm vệ tinh dạng structure-of-arrays thay cho từng bộ Multivector rời rạc.
+    Bộ nhớ cố định BYTES_PER_OBJECT = 96 byte / vệ tinh: 1M vệ tinh ~ 96 MB (91.6 MiB),
+    không có overhead đối tượng Python theo từng vệ tinh.
+
+    - Các mảng có thể là np.memmap (xem load), không bị sao chép khi khởi tạo.
+    - Cắt lát bằng slice (c[a:b], c[::k]) trả về Constellation gồm các view, không sao chép.
+    - Lọc theo điều kiện: indices(mask) trả về mảng chỉ số (không sao chép dữ liệu trạng thái);
+      take(indices) mới tạo bản sao gọn.
+    - dtype=np.float32: các trường số thực lưu ở float32 (52 byte / vệ tinh); các đường
+      batch tính những số hạng dễ triệt tiêu (0.5 ||x||^2, tích trong) bằng float64.
+    """
+    __slots__ = tuple(CONSTELLATION_FIELDS)
+
+    def __init__(self, ids, positions, velocities=None, radii=None, rotors=None, dtype=np.float64):
+        n = len(ids)
+        if velocities is None:
+            velocities = np.zeros((n, 3))
+        if radii is None:
+            radii = np.ones(n)
+        if rotors is None:
+            rotors = np.zeros((n, 4))
+            rotors[:, 0] = 1.0  # Rotor đơn vị
+        arrays = dict(ids=ids, positions=positions, velocities=velocities, radii=radii, rotors=rotors)
+
+        for name, (shape, field_dtype) in CONSTELLATION_FIELDS.items():
+            if field_dtype == np.float64:
+                field_dtype = dtype
+            array = arrays[name]
+            if not isinstance(array, np.ndarray) or array.dtype != field_dtype:
+                array = np.asarray(array, dtype=field_dtype)
+            if array.shape != (n,) + shape:
+                raise ValueError(f"{name} phải có dạng {(n,) + shape}, nhận {array.shape}")
+            setattr(self, name, array)
+
+    @classmethod
+    def zeros(cls, n_objects, dtype=np.float64):
+        """Chòm vệ tinh n_objects phần tử, id = 0..n-1, vị trí/vận tốc bằng 0."""
+        return cls(np.arange(n_objects), np.zeros((n_objects, 3), dtype=dtype), dtype=dtype)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """
+        Nạp từ thư mục chứa ids.npy, positions.npy, ... (xem save).
+        mmap_mode='r' / 'r+' / 'c': các mảng là memory-map, không đọc toàn bộ vào RAM.
+        """
+        arrays = {
+            name: np.load(os.path.join(directory, name + '.npy'), mmap_mode=mmap_mode)
+            for name in CONSTELLATION_FIELDS
+        }
+        return cls(**arrays, dtype=arrays['positions'].dtype)
+
+    def save(self, directory):
+        """Ghi mỗi trường thành một file .npy trong directory."""
+        os.makedirs(directory, exist_ok=True)
+        for name in CONSTELLATION_FIELDS:
+            np.save(os.path.join(directory, name + '.npy'), getattr(self, name))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, key):
+        """slice -> view (không sao chép); chỉ số nguyên -> view độ dài 1; còn lại -> take."""
+        if isinstance(key, (int, np.integer)):
+            key = slice(key, key + 1 if key != -1 else None)
+        if isinstance(key, slice):
+            return Constellation(**{name: getattr(self, name)[key] for name in CONSTELLATION_FIELDS},
+                                 dtype=self.dtype)
+        return self.take(key)
+
+    def indices(self, mask):
+        """Chỉ số các vệ tinh thỏa mask (mảng bool độ dài N)."""
+        return np.flatnonzero(mask)
+
+    def take(self, indices):
+        """Bản sao gọn gồm các vệ tinh theo chỉ số hoặc mask."""
+        return Constellation(**{name: getattr(self, name)[indices] for name in CONSTELLATION_FIELDS},
+                             dtype=self.dtype)
+
+    def astype(self, dtype):
+        """
+        Bản sao với các trường số thực ở dtype (ví dụ np.float32 để giảm một nửa bộ nhớ).
+        Luôn sao chép, kể cả khi dtype không đổi: không chia sẻ mảng với bản gốc.
+        """
+        return Constellation(**{
+            name: getattr(self, name).astype(dtype if field_dtype == np.float64 else field_dtype)
+            for name, (_, field_dtype) in CONSTELLATION_FIELDS.items()
+        }, dtype=dtype)
+
+    @property
+    def dtype(self):
+        """Kiểu lưu của các trường số thực."""
+        return self.positions.dtype
+
+    @property
+    def nbytes(self):
+        """Tổng số byte của các mảng trạng thái (= len(self) * bytes_per_object(self.dtype))."""
+        return sum(getattr(self, name).nbytes for name in CONSTELLATION_FIELDS)
+
+    # --- Dạng hệ số CGA / G3 tương thích với ga_utilities ---
+
+    @property
+    def rotor_coeffs(self):
+        """Hệ số rotor (N, 4) [s, e12, e13, e23] — chính mảng lưu trữ, không sao chép."""
+        return self.rotors
+
+    def attitude_rotor(self, k):
+        """Rotor tư thế của vệ tinh thứ k dưới dạng Multivector G3."""
+        return coeffs_to_rotor(self.rotors[k])
+
+    def cga_points(self, grade1_only=True):
+        """Điểm CGA của các tâm: (N, 5) hoặc (N, 32) như points_to_cga_batch."""
+        return points_to_cga_batch(self.positions, grade1_only=grade1_only)
+
+    def cga_spheres(self, grade1_only=True):
+        """Sphere an toàn (keep-out) CGA: (N, 5) hoặc (N, 32) như spheres_to_cga_batch."""
+        return spheres_to_cga_batch(self.positions, self.radii, grade1_only=grade1_only)
+
+    def cga_spheres_null(self):
+        """
+        Sphere an toàn trong cơ sở null (N, 5). Vị trí float32: MixedNullSpheres (tọa độ
+        float32, hệ số n_inf float64 để không mất r^2 ở bán kính quỹ đạo).
+        """
+        return spheres_to_cga_null_batch(self.positions, self.radii, dtype=self.dtype)
+
+# ----------------------------------------------------
+# 2. LAN TRUYỀN KEPLER (HAI VẬT) VỚI HỆ QUỸ ĐẠO TỪ ROTOR
+# ----------------------------------------------------
+MU_EARTH = 398600.4418  # km^3 / s^2
+EARTH_RADIUS = 6378.137  # km
+# Số phần tử (bước thời gian x vật) tối đa mỗi khối mà generator trả về
+DEFAULT_CHUNK_ELEMENTS = 1 << 21
+
+# Các mảng (N,): bán trục lớn a (km), tâm sai e (< 1), độ nghiêng inc, kinh độ điểm
+# nút lên raan, acgumen cận điểm argp, dị thường trung bình tại t = 0 mean_anomaly (rad)
+OrbitalElements = namedtuple('OrbitalElements', ['a', 'e', 'inc', 'raan', 'argp', 'mean_anomaly'])
+
+def random_orbital_elements(n_objects, seed=0, altitude=(400.0, 1200.0), max_eccentricity=0.02):
+    """Quỹ đạo LEO ngẫu nhiên (gần tròn, mọi độ nghiêng)."""
+    rng = np.random.default_rng(seed)
+    return OrbitalElements(
+        a=EARTH_RADIUS + rng.uniform(*altitude, n_objects),
+        e=rng.uniform(0.0, max_eccentricity, n_objects),
+        inc=np.arccos(rng.uniform(-1.0, 1.0, n_objects)),
+        raan=rng.uniform(0.0, 2 * np.pi, n_objects),
+        argp=rng.uniform(0.0, 2 * np.pi, n_objects),
+        mean_anomaly=rng.uniform(0.0, 2 * np.pi, n_objects),
+    )
+
+def _rotate_sin_cos(sin_x, cos_x, d):
+    """
+    sin / cos của x + d từ sin x, cos x. Với |d| nhỏ dùng chuỗi Taylor đủ bậc để sai
+    số < 1e-16 (bước Newton thường rất nhỏ), còn lại gọi sin / cos.
+    """
+    d_max = np.abs(d).max(initial=0.0)
+    d2 = d * d
+    if d_max < 1e-5:
+        sin_d, cos_d = d, 1.0 - 0.5 * d2
+    elif d_max < 2e-3:
+        sin_d = d * (1.0 - d2 / 6.0)
+        cos_d = 1.0 - d2 / 2.0 * (1.0 - d2 / 12.0)
+    elif d_max < 0.05:
+        sin_d = d * (1.0 - d2 / 6.0 * (1.0 - d2 / 20.0 * (1.0 - d2 / 42.0)))
+        cos_d = 1.0 - d2 / 2.0 * (1.0 - d2 / 12.0 * (1.0 - d2 / 30.0 * (1.0 - d2 / 56.0)))
+    else:
+        sin_d, cos_d = np.sin(d), np.cos(d)
+    return sin_x * cos_d + cos_x * sin_d, cos_x * cos_d - sin_x * sin_d
+
+def _newton_kepler(M, e, E, sin_E, cos_E, tol, max_iter):
+    """Lặp Newton từ (E, sin E, cos E); sin / cos được cập nhật theo bước, không gọi lại."""
+    for _ in range(max_iter):
+        delta = (E - e * sin_E - M) / (1.0 - e * cos_E)
+        E = E - delta
+        sin_E, cos_E = _rotate_sin_cos(sin_E, cos_E, -delta)
+        # Newton hội tụ bậc hai: sai số còn lại ~ e delta^2 / 2 < tol
+        if np.abs(delta).max(initial=0.0) ** 2 < tol:
+            break
+    return E, sin_E, cos_E
+
+def _kepler_sin_cos(M, e, tol, max_iter):
+    """Giải phương trình Kepler từ đầu; trả về (E, sin E, cos E)."""
+    # Điểm xuất phát bậc hai theo e (sai số ~ e^3); e lớn: pi
+    E = np.where(e < 0.8, M + e * np.sin(M) * (1.0 + e * np.cos(M)), np.pi)
+    return _newton_kepler(M, e, E, np.sin(E), np.cos(E), tol, max_iter)
+
+def solve_kepler(mean_anomaly, e, tol=1e-12, max_iter=50):
+    """
+    Giải M = E - e sin E cho mọi phần tử cùng lúc bằng Newton (mảng broadcast được).
+    Trả về dị thường tâm sai E.
+    """
+    M = np.remainder(mean_anomaly, 2 * np.pi)
+    return _kepler_sin_cos(M, np.broadcast_to(e, M.shape), tol, max_iter)[0]
+
+def orbital_frame_rotors(raan, inc, argp):
+    """
+    Rotor đặt hệ cận điểm (perifocal) vào không gian: R = R_raan(e12) R_inc(e23) R_argp(e12),
+    ghép từ create_rotors_batch (create_rotor vector hóa). Trả về (N, 4).
+    """
+    raan, inc, argp = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (raan, inc, argp)))
+    R_raan = create_rotors_batch([1.0, 0.0, 0.0], raan)   # Quay quanh z
+    R_inc = create_rotors_batch([0.0, 0.0, 1.0], inc)     # Quay quanh x
+    R_argp = create_rotors_batch([1.0, 0.0, 0.0], argp)
+    return rotor_product_batch(rotor_product_batch(R_raan, R_inc), R_argp)
+
+def propagate_kepler(elements, times, mu=MU_EARTH, chunk_elements=DEFAULT_CHUNK_ELEMENTS, dtype=np.float64,
+                     tol=1e-12, max_iter=50):
+    """
+    Lan truyền hai vật cho N quỹ đạo tại các thời điểm times (T,) (s, tính từ epoch).
+    Generator trả về từng khối (times (Tc,), positions (Tc, N, 3), velocities (Tc, N, 3)),
+    Tc * N <= chunk_elements, nên bộ nhớ không phụ thuộc T. tol: sai số còn lại của E (rad)
+    khi Newton dừng.
+    Hệ quỹ đạo: P = R x ~R, Q = R y ~R với R = orbital_frame_rotors(...), tính một lần.
+    """
+    a = np.asarray(elements.a, dtype=float)
+    e = np.asarray(elements.e, dtype=float)
+    if np.any((e < 0.0) | (e >= 1.0)):
+        raise ValueError("Chỉ hỗ trợ quỹ đạo elip (0 <= e < 1)")
+    times = np.asarray(times, dtype=float)
+
+    R = orbital_frame_rotors(elements.raan, elements.inc, elements.argp)
+    P = apply_rotors_batch(R, np.broadcast_to([1.0, 0.0, 0.0], (len(a), 3)))
+    Q = apply_rotors_batch(R, np.broadcast_to([0.0, 1.0, 0.0], (len(a), 3)))
+    n = np.sqrt(mu / a**3)          # Chuyển động trung bình
+    b = a * np.sqrt(1.0 - e**2)     # Bán trục nhỏ
+    M0 = np.asarray(elements.mean_anomaly, dtype=float)
+
+    steps = max(1, chunk_elements // max(len(a), 1))
+    for start in range(0, len(times), steps):
+        t = times[start:start + steps]
+        sin_E = np.empty((len(t), len(a)))
+        cos_E = np.empty((len(t), len(a)))
+        # Đầu khối: giải đầy đủ (đồng bộ lại sin / cos). Các bước sau: quay E thêm
+        # dM = n dt (sin / cos của dM tính một lần cho mỗi dt) rồi hiệu chỉnh Newton.
+        M_start = np.remainder(M0 + n * t[0], 2 * np.pi)
+        E, sin_E[0], cos_E[0] = _kepler_sin_cos(M_start, e, tol, max_iter)
+        dt = None
+        for k in range(1, len(t)):
+            if t[k] - t[k - 1] != dt:
+                dt = t[k] - t[k - 1]
+                sin_dM, cos_dM = np.sin(n * dt), np.cos(n * dt)
+            s_k = sin_E[k - 1] * cos_dM + cos_E[k - 1] * sin_dM
+            c_k = cos_E[k - 1] * cos_dM - sin_E[k - 1] * sin_dM
+            E, sin_E[k], cos_E[k] = _newton_kepler(M_start + n * (t[k] - t[0]), e, E + n * dt, s_k, c_k,
+                                                   tol, max_iter)
+
+        x, y = a * (cos_E - e), b * sin_E                     # Tọa độ cận điểm
+        rate = n / (1.0 - e * cos_E)                          # dE/dt
+        vx, vy = -a * sin_E * rate, b * cos_E * rate
+        positions = np.multiply(x[..., None], P, dtype=dtype)
+        positions += y[..., None] * Q
+        velocities = np.multiply(vx[..., None], P, dtype=dtype)
+        velocities += vy[..., None] * Q
+        yield t, positions, velocities
+
+def benchmark_kepler(n_objects=100_000, duration=86400.0, step=60.0, check_every=100):
+    """
+    Lan truyền n_objects vật trong duration giây với bước step. Kiểm tra bảo toàn năng
+    lượng và mômen động lượng trên mỗi vật thứ check_every (không tính vào thời gian).
+    """
+    elements = random_orbital_elements(n_objects)
+    times = np.arange(0.0, duration + step, step)
+    print(f"\n--- Kepler propagation ({n_objects} objects x {len(times)} steps) ---")
+    elapsed = energy_drift = momentum_drift = 0.0
+    energy0 = momentum0 = None
+    t0 = time.perf_counter()
+    for _, positions, velocities in propagate_kepler(elements, times):
+        elapsed += time.perf_counter() - t0
+        p, v = positions[:, ::check_every], velocities[:, ::check_every]
+        energy = 0.5 * np.einsum('...i,...i->...', v, v) - MU_EARTH / np.linalg.norm(p, axis=-1)
+        momentum = np.cross(p, v)
+        if energy0 is None:
+            energy0, momentum0 = energy[0], momentum[0]
+        energy_drift = max(energy_drift, np.abs(energy / energy0 - 1.0).max())
+        momentum_drift = max(momentum_drift, (np.linalg.norm(momentum - momentum0, axis=-1)
+                                              / np.linalg.norm(momentum0, axis=-1)).max())
+        t0 = time.perf_counter()
+    print(f"Propagation: {elapsed:.2f} s ({n_objects * len(times) / elapsed / 1e6:.1f} M object-steps/s)")
+    print(f"Max relative drift: energy {energy_drift:.2e}, angular momentum {momentum_drift:.2e}")
+
+# ----------------------------------------------------
+# 3. TÍCH PHÂN TƯ THẾ: PREFIX SCAN CỦA ROTOR
+# ----------------------------------------------------
+# Tích rotor có tính kết hợp, nên R_k = R_0 dR_0 dR_1 ... dR_{k-1} là một prefix scan.
+# 'hillis_steele': log2(T) lượt, mỗi lượt nhân toàn bộ mảng (N, T) một lần.
+# 'blocked': chia T thành các khối ~sqrt(T): scan tuần tự trong khối (vector hóa theo
+# N x số khối), scan các tích khối, rồi nhân tiền tố khối vào từng khối. Tổng công
+# O(N T) như vòng lặp tuần tự nhưng chỉ ~2 sqrt(T) bước Python.
+# 'sequential': T bước, mỗi bước vector hóa theo N; nhanh nhất khi N >= T.
+# 'auto': 'sequential' nếu số chuỗi (N) >= T, ngược lại 'blocked'.
+SEQUENTIAL_RENORMALIZE_EVERY = 64
+
+def _normalize_rotors(R):
+    return R / np.linalg.norm(R, axis=-1, keepdims=True)
+
+def _identity_rotors(shape):
+    R = np.zeros(shape + (4,))
+    R[..., 0] = 1.0
+    return R
+
+def rotor_scan(rotors, method='auto', renormalize=True):
+    """
+    Prefix scan bao gồm (inclusive) theo trục thời gian của mảng rotor (..., T, 4):
+    out[..., k, :] = R_0 R_1 ... R_k. renormalize=True chuẩn hóa sau mỗi lượt
+    (sequential: mỗi SEQUENTIAL_RENORMALIZE_EVERY bước) để chặn trôi số.
+    """
+    R = np.array(rotors, dtype=float)
+    T = R.shape[-2]
+    if method == 'auto':
+        method = 'sequential' if int(np.prod(R.shape[:-2])) >= T else 'blocked'
+    if method == 'sequential':
+        for k in range(1, T):
+            R[..., k, :] = rotor_product_batch(R[..., k - 1, :], R[..., k, :])
+            if renormalize and k % SEQUENTIAL_RENORMALIZE_EVERY == 0:
+                R[..., k, :] = _normalize_rotors(R[..., k, :])
+        return _normalize_rotors(R) if renormalize else R
+    if method == 'hillis_steele':
+        offset = 1
+        while offset < T:
+            R[..., offset:, :] = rotor_product_batch(R[..., :-offset, :], R[..., offset:, :])
+            if renormalize:
+                R = _normalize_rotors(R)
+            offset *= 2
+        return R
+    if method != 'blocked':
+        raise ValueError("method phải là 'auto', 'sequential', 'blocked' hoặc 'hillis_steele'")
+
+    block = max(1, int(np.ceil(np.sqrt(T))))
+    n_blocks = -(-T // block)
+    batch_shape = R.shape[:-2]
+    padded = _identity_rotors(batch_shape + (n_blocks * block,))
+    padded[..., :T, :] = R
+    blocks = padded.reshape(batch_shape + (n_blocks, block, 4))
+    for k in range(1, block):
+        blocks[..., k, :] = rotor_product_batch(blocks[..., k - 1, :], blocks[..., k, :])
+
+    # Tiền tố (exclusive) của tích từng khối
+    prefix = np.empty(batch_shape + (n_blocks, 4))
+    carry = _identity_rotors(batch_shape)
+    for j in range(n_blocks):
+        prefix[..., j, :] = carry
+        carry = rotor_product_batch(carry, blocks[..., j, block - 1, :])
+        if renormalize:
+            carry = _normalize_rotors(carry)
+    blocks = rotor_product_batch(prefix[..., :, None, :], blocks)
+    if renormalize:
+        blocks = _normalize_rotors(blocks)
+    return blocks.reshape(batch_shape + (n_blocks * block, 4))[..., :T, :]
+
+def incremental_rotors(rates, dt):
+    """
+    Rotor gia số dR = exp(-B dt / 2) từ vận tốc góc hệ thân (..., 3) [wx, wy, wz] (rad/s),
+    với B = [wz, -wy, wx] (hệ số [e12, e13, e23] của mặt phẳng vuông góc trục quay):
+    dR = cos(|w| dt / 2) - B_hat sin(|w| dt / 2), như create_rotor. dt: số hoặc (T,).
+    """
+    w = np.asarray(rates, dtype=float)
+    B = np.stack([w[..., 2], -w[..., 1], w[..., 0]], axis=-1)
+    return rotor_exp_batch(-0.5 * np.asarray(dt, dtype=float)[..., None] * B)
+
+def integrate_attitude(rates, dt, initial=None, method='auto', renormalize=True):
+    """
+    Tích phân tư thế cho N vệ tinh từ vận tốc góc hệ thân rates (N, T, 3):
+    R_{k+1} = R_k dR_k. initial: rotor ban đầu (N, 4) (mặc định đơn vị).
+    Trả về toàn bộ lịch sử rotor (N, T + 1, 4), phần tử 0 là tư thế ban đầu.
+    """
+    rates = np.asarray(rates, dtype=float)
+    N = rates.shape[0]
+    initial = _identity_rotors((N,)) if initial is None else np.asarray(initial, dtype=float)
+    # Scan của [R_0, dR_0, ..., dR_{T-1}] chính là lịch sử [R_0, R_0 dR_0, ...]
+    steps = np.concatenate([initial[:, None, :], incremental_rotors(rates, dt)], axis=1)
+    return rotor_scan(steps, method=method, renormalize=renormalize)
+
+def _integrate_attitude_sequential(rates, dt, initial=None):
+    """Tham chiếu: vòng lặp tuần tự theo thời gian (vector hóa theo N)."""
+    dR = incremental_rotors(rates, dt)
+    N, T = dR.shape[:2]
+    history = np.empty((N, T + 1, 4))
+    history[:, 0] = _identity_rotors((N,)) if initial is None else initial
+    for k in range(T):
+        history[:, k + 1] = rotor_product_batch(history[:, k], dR[:, k])
+    return history
+
+def benchmark_attitude_integration(cases=((16, 65536), (2048, 512)), dt=0.1, mv_steps=2000):
+    """So sánh scan với vòng lặp tuần tự và với tích Multivector từng bước."""
+    from src.ga_utilities import create_rotor, warm_up_algebra, e12, e13, e23
+    warm_up_algebra()
+    print("\n--- Attitude integration (rotor prefix scan) ---")
+    rng = np.random.default_rng(0)
+
+    # Vòng lặp Multivector gốc (create_rotor + *) cho một vệ tinh, ngoại suy theo N x T
+    def mv_loop(rates):
+        R = create_rotor(e12, 0.0)
+        for wx, wy, wz in rates:
+            R = R * create_rotor(wz * e12 - wy * e13 + wx * e23, np.linalg.norm([wx, wy, wz]) * dt)
+        return R
+
+    rates = rng.normal(scale=0.05, size=(mv_steps, 3))
+    mv_loop(rates[:100])  # JIT của clifford
+    t0 = time.perf_counter()
+    mv_loop(rates)
+    mv_per_step = (time.perf_counter() - t0) / mv_steps
+
+    for N, T in cases:
+        rates = rng.normal(scale=0.05, size=(N, T, 3))
+        print(f"N = {N}, T = {T}: Multivector loop ~{mv_per_step * N * T:.1f} s (extrapolated)")
+        for name, fn in (('sequential', lambda: _integrate_attitude_sequential(rates, dt)),
+                         ('hillis_steele', lambda: integrate_attitude(rates, dt, method='hillis_steele')),
+                         ('blocked', lambda: integrate_attitude(rates, dt, method='blocked')),
+                         ('auto', lambda: integrate_attitude(rates, dt))):
+            t0 = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - t0
+            if name == 'sequential':
+                reference = result
+            err = np.abs(result - reference).max()
+            norm_err = np.abs(np.linalg.norm(result, axis=-1) - 1.0).max()
+            print(f"  {name:<14} {elapsed:.3f} s, max |R - sequential| {err:.1e}, "
+                  f"max ||R| - 1| {norm_err:.1e}")
+
+# ----------------------------------------------------
+# 4. SELF TEST
+# ----------------------------------------------------
+if __name__ == '__main__':
+    n = 1_000_000
+    constellation = Constellation.zeros(n)
+    constellation.positions[:] = np.random.default_rng(0).uniform(-7000, 7000, size=(n, 3))
+    print("\n--- Constellation (structure-of-arrays) ---")
+    print(f"N = {len(constellation)}, {constellation.nbytes / 2**20:.1f} MiB "
+          f"({BYTES_PER_OBJECT} bytes/object)")
+
+    # Memory-map: nạp lại không đọc toàn bộ dữ liệu
+    with tempfile.TemporaryDirectory() as directory:
+        constellation.save(directory)
+        mapped = Constellation.load(directory)
+        print(f"Memory-mapped positions: {type(mapped.positions).__name__}")
+
+        # Cắt lát không sao chép
+        part = mapped[1000:2000]
+        print(f"Slice shares memory: {np.shares_memory(part.positions, mapped.positions)}")
+
+        # Lọc theo điều kiện: chỉ số, rồi hệ số CGA của phần đã chọn
+        idx = mapped.indices(mapped.positions[:, 2] > 6900)
+        spheres = mapped.take(idx).cga_spheres()
+        print(f"Filtered {len(idx)} objects -> CGA spheres {spheres.shape}")
+
+    # Kepler: rotor hệ quỹ đạo khớp với create_rotor (Multivector), quay về vị trí ban đầu sau một chu kỳ
+    from src.ga_utilities import create_rotor, rotor_to_coeffs, e12, e23
+    elements = random_orbital_elements(5)
+    R_mv = [create_rotor(e12, W) * create_rotor(e23, i) * create_rotor(e12, w)
+            for W, i, w in zip(elements.raan, elements.inc, elements.argp)]
+    R_err = np.abs(orbital_frame_rotors(elements.raan, elements.inc, elements.argp)
+                   - np.array([rotor_to_coeffs(R) for R in R_mv])).max()
+    period = 2 * np.pi * np.sqrt(elements.a**3 / MU_EARTH)
+    (_, p_start, _), = propagate_kepler(elements, [0.0])
+    p_period = np.array([
+        next(propagate_kepler(OrbitalElements(*(f[k:k + 1] for f in elements)), [period[k]]))[1][0, 0]
+        for k in range(len(period))
+    ])
+    print(f"Orbital frame rotor vs create_rotor: {R_err:.2e}; position after one period: "
+          f"{np.abs(p_period - p_start[0]).max():.2e} km")
+    benchmark_kepler()
+
+    # Tư thế: scan so với tích Multivector tuần tự, kiểm tra bằng apply_rotor
+    from src.ga_utilities import create_vector, apply_rotor, extract_coords, e13
+    rates = np.random.default_rng(1).normal(scale=0.2, size=(3, 500, 3))
+    history = integrate_attitude(rates, 0.05)
+    R = create_rotor(e12, 0.0)
+    for wx, wy, wz in rates[0]:
+        R = R * create_rotor(wz * e12 - wy * e13 + wx * e23, np.linalg.norm([wx, wy, wz]) * 0.05)
+    v = np.array([0.3, -1.2, 2.0])
+    err = np.abs(apply_rotors_batch(history[0, -1], v[None])[0] - extract_coords(apply_rotor(R, create_vector(*v)))).max()
+    # Quay đều quanh z với 0.1 rad/s trong 10 s: x -> (cos 1, sin 1, 0)
+    spin = integrate_attitude(np.tile([0.0, 0.0, 0.1], (1, 1000, 1)), 0.01)
+    spin_err = np.abs(apply_rotors_batch(spin[0, -1], [[1.0, 0.0, 0.0]])[0] - [np.cos(1.0), np.sin(1.0), 0.0]).max()
+    print(f"Attitude scan vs Multivector product (apply_rotor): {err:.2e}; constant spin: {spin_err:.2e}")
+    benchmark_attitude_integration()
@@ -0,0 +1,429 @@
+# src/screening_service.py (DỊCH VỤ SÀNG LỌC VA CHẠM CHẠY LIÊN TỤC: ASYNCIO + NDJSON)
+#
+# Chạy:  python src/screening_service.py                 # demo với client trong cùng tiến trình
+#        python src/screening_service.py --serve 127.0.0.1:8765 --objects 20000
+#
+# Đại số CGA, trạng thái chòm vệ tinh và danh sách lân cận (IncrementalScreener) được
+# giữ sẵn trong bộ nhớ. Mỗi dòng trên socket là một JSON:
+#   client -> server
+#     {"type": "update", "seq": 7, "ids": [...], "positions": [[x, y, z], ...],
+#      "rotors": [[s, e12, e13, e23], ...]}            # rotors không bắt buộc
+#     {"type": "stats"}
+#   server -> client
+#     {"type": "snapshot", "active": [[id_i, id_j, margin], ...]}      # khi vừa kết nối
+#     {"type": "ack", "batch": k, "seqs": [...], "latency_ms": [...]}  # update đã được sàng lọc
+#     {"type": "alert", "batch": k, "new": [[id_i, id_j, margin], ...], "cleared": [[id_i, id_j], ...],
+#      "active": n}
+#     {"type": "stats", ...} / {"type": "error", "seq": 7, "message": "..."}
+#
+# Các update đến trong cùng một cửa sổ batch_window giây được gộp thành một lần sàng
+# lọc. Backpressure: hàng đợi update có giới hạn (khi đầy, server ngừng đọc socket và
+# TCP đẩy ngược về client); hàng đợi gửi của mỗi client có giới hạn, client chậm bị bỏ
+# tin cũ nhất thay vì làm nghẽn vòng sàng lọc.
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+from collections import deque
+import numpy as np
+from src.ga_utilities import warm_up_algebra
+from src.satellite_geometry import Constellation
+from src.application_collision_avoidance import IncrementalScreener, random_catalogue
+
+DEFAULT_BATCH_WINDOW = 0.01   # s
+DEFAULT_MAX_BATCH = 256       # Số message update tối đa mỗi batch
+DEFAULT_MAX_PENDING = 1024    # Số message update chờ xử lý tối đa
+DEFAULT_SEND_QUEUE = 256      # Số message chờ gửi tối đa mỗi client
+LATENCY_HISTORY = 100_000
+STREAM_LIMIT = 1 << 24        # Độ dài tối đa một dòng JSON (byte)
+
+def _percentiles(values):
+    values = np.asarray(values, dtype=float)
+    if not len(values):
+        return {'p50': None, 'p99': None, 'max': None}
+    p50, p99 = np.percentile(values, [50, 99])
+    return {'p50': float(p50), 'p99': float(p99), 'max': float(values.max())}
+
+# ----------------------------------------------------
+# 1. SERVER
+# ----------------------------------------------------
+
+class _Client:
+    """Một kết nối: hàng đợi gửi có giới hạn và task ghi socket."""
+
+    def __init__(self, writer, max_queue):
+        self.writer = writer
+        self.handler = asyncio.current_task()  # Task đọc của kết nối (ScreeningService._handle)
+        self.outbox = asyncio.Queue(max_queue)
+        self.dropped = 0
+        self.task = asyncio.create_task(self._drain())
+
+    def send(self, message):
+        """Đưa message vào hàng đợi; nếu đầy thì bỏ message cũ nhất."""
+        if self.outbox.full():
+            self.outbox.get_nowait()
+            self.dropped += 1
+        self.outbox.put_nowait(message)
+
+    async def _drain(self):
+        while True:
+            message = await self.outbox.get()
+            self.writer.write(json.dumps(message).encode() + b'\n')
+            await self.writer.drain()
+
+    async def close(self):
+        self.task.cancel()
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+class ScreeningService:
+    """
+    Dịch vụ sàng lọc va chạm giữ trạng thái trong bộ nhớ.
+    constellation: Constellation ban đầu (id tùy ý, không trùng); skin: độ nới danh
+    sách lân cận của IncrementalScreener.
+    """
+
+    def __init__(self, constellation, skin=1.0, batch_window=DEFAULT_BATCH_WINDOW,
+                 max_batch=DEFAULT_MAX_BATCH, max_pending=DEFAULT_MAX_PENDING,
+                 send_queue=DEFAULT_SEND_QUEUE):
+        warm_up_algebra()
+        self.constellation = constellation.take(np.arange(len(constellation)))  # Bản sao có thể ghi
+        self.screener = IncrementalScreener(self.constellation.radii, skin)
+        self.batch_window = float(batch_window)
+        self.max_batch = int(max_batch)
+        self.max_pending = int(max_pending)
+        self.send_queue = int(send_queue)
+        self._id_order = np.argsort(self.constellation.ids, kind='stable')
+        self._sorted_ids = self.constellation.ids[self._id_order]
+
+        self._queue = None
+        self._clients = set()
+        self._server = None
+        self._batcher = None
+        self.batch_count = 0
+        self.update_count = 0
+        self.backpressure_waits = 0
+        self.latencies_ms = deque(maxlen=LATENCY_HISTORY)   # Nhận update -> sàng lọc xong
+        self.screen_ms = deque(maxlen=LATENCY_HISTORY)
+        self.batch_sizes = deque(maxlen=LATENCY_HISTORY)
+
+        pairs, margins = self.screener.update(self.constellation.positions)
+        self._active = self._pair_keys(pairs)
+        self._active_margins = margins
+
+    # --- Vòng đời ---
+
+    async def start(self, host='127.0.0.1', port=0):
+        """Mở socket; trả về (host, port) thực sự (port=0: hệ điều hành chọn)."""
+        self._queue = asyncio.Queue(self.max_pending)
+        self._batcher = asyncio.create_task(self._batch_loop())
+        self._server = await asyncio.start_server(self._handle, host, port, limit=STREAM_LIMIT)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        """
+        Ngừng nhận kết nối, đóng mọi client rồi mới chờ server: từ Python 3.12
+        wait_closed() chờ đến khi không còn kết nối nào.
+        """
+        self._server.close()
+        self._batcher.cancel()
+        clients = list(self._clients)
+        for client in clients:
+            client.handler.cancel()  # Kể cả khi đang chờ hàng đợi update (backpressure)
+            await client.close()
+        await asyncio.gather(*(client.handler for client in clients), return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def serve_forever(self, host='127.0.0.1', port=8765):
+        host, port = await self.start(host, port)
+        print(f"Screening service on {host}:{port} ({len(self.constellation)} objects)")
+        await self._server.serve_forever()
+
+    # --- Đọc từ client ---
+
+    async def _handle(self, reader, writer):
+        client = _Client(writer, self.send_queue)
+        self._clients.add(client)
+        client.send({'type': 'snapshot', 'active': self._describe(self._active, self._active_margins)})
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = None
+                try:
+                    message = json.loads(line)
+                    kind = message.get('type')
+                    if kind == 'update':
+                        item = self._parse_update(message, client)
+                        if self._queue.full():
+                            self.backpressure_waits += 1
+                        await self._queue.put(item)  # Chặn khi đầy: ngừng đọc socket
+                    elif kind == 'stats':
+                        client.send({'type': 'stats', **self.metrics()})
+                    else:
+                        raise ValueError(f"type không hợp lệ: {kind!r}")
+                except (ValueError, KeyError, TypeError, AttributeError) as exc:
+                    seq = message.get('seq') if isinstance(message, dict) else None
+                    client.send({'type': 'error', 'seq': seq, 'message': str(exc)})
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass  # CancelledError: stop() đóng kết nối; task kết thúc bình thường
+        finally:
+            self._clients.discard(client)
+            await client.close()
+
+    def _parse_update(self, message, client):
+        """Kiểm tra và chuyển một update sang (t_nhận, client, seq, chỉ số, vị trí, rotor)."""
+        received = time.perf_counter()
+        ids = np.asarray(message['ids'], dtype=np.int64).reshape(-1)
+        positions = np.asarray(message['positions'], dtype=float).reshape(len(ids), 3)
+        rotors = message.get('rotors')
+        if rotors is not None:
+            rotors = np.asarray(rotors, dtype=float).reshape(len(ids), 4)
+        pos = np.searchsorted(self._sorted_ids, ids)
+        pos = np.minimum(pos, len(self._sorted_ids) - 1)
+        unknown = self._sorted_ids[pos] != ids
+        if unknown.any():
+            raise ValueError(f"id không tồn tại: {ids[unknown][:10].tolist()}")
+        return received, client, message.get('seq'), self._id_order[pos], positions, rotors
+
+    # --- Gộp batch và sàng lọc ---
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            await asyncio.sleep(self.batch_window)  # Gom các update đến trong cửa sổ
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self._apply(batch)
+            # Sàng lọc ngoài event loop để vẫn nhận update (vào hàng đợi) trong lúc tính
+            t0 = time.perf_counter()
+            pairs, margins = await loop.run_in_executor(None, self.screener.update,
+                                                        self.constellation.positions)
+            self.screen_ms.append((time.perf_counter() - t0) * 1e3)
+            self._publish(batch, pairs, margins)
+
+    def _apply(self, batch):
+        """Ghi các update vào trạng thái; cùng một id xuất hiện nhiều lần thì update sau thắng."""
+        index = np.concatenate([item[3] for item in batch])
+        positions = np.concatenate([item[4] for item in batch])
+        _, last = np.unique(index[::-1], return_index=True)
+        keep = len(index) - 1 - last
+        self.constellation.positions[index[keep]] = positions[keep]
+
+        with_rotors = [item for item in batch if item[5] is not None]
+        if with_rotors:
+            index = np.concatenate([item[3] for item in with_rotors])
+            rotors = np.concatenate([item[5] for item in with_rotors])
+            _, last = np.unique(index[::-1], return_index=True)
+            keep = len(index) - 1 - last
+            self.constellation.rotors[index[keep]] = rotors[keep]
+
+    def _publish(self, batch, pairs, margins):
+        done = time.perf_counter()
+        self.batch_count += 1
+        self.update_count += len(batch)
+        self.batch_sizes.append(len(batch))
+
+        # Ack cho từng client đã gửi update trong batch, kèm độ trễ phía server
+        acks = {}
+        for received, client, seq, *_ in batch:
+            latency = (done - received) * 1e3
+            self.latencies_ms.append(latency)
+            ack = acks.setdefault(client, {'type': 'ack', 'batch': self.batch_count, 'seqs': [], 'latency_ms': []})
+            ack['seqs'].append(seq)
+            ack['latency_ms'].append(latency)
+        for client, ack in acks.items():
+            if client in self._clients:
+                client.send(ack)
+
+        # Cảnh báo: cặp mới xuất hiện / đã hết xung đột so với batch trước
+        keys = self._pair_keys(pairs)
+        new = ~np.isin(keys, self._active)
+        cleared = self._active[~np.isin(self._active, keys)]
+        self._active, self._active_margins = keys, margins
+        if new.any() or len(cleared):
+            alert = {
+                'type': 'alert', 'batch': self.batch_count,
+                'new': self._describe(keys[new], margins[new]),
+                'cleared': self._describe(cleared),
+                'active': int(len(keys)),
+            }
+            for client in self._clients:
+                client.send(alert)
+
+    def _pair_keys(self, pairs):
+        return pairs[:, 0].astype(np.int64) * len(self.constellation) + pairs[:, 1]
+
+    def _describe(self, keys, margins=None):
+        """Khóa cặp -> [[id_i, id_j(, margin)], ...] theo id gốc."""
+        ids = self.constellation.ids
+        i, j = ids[keys // len(self.constellation)], ids[keys % len(self.constellation)]
+        if margins is None:
+            return np.column_stack([i, j]).tolist()
+        return [[int(a), int(b), float(m)] for a, b, m in zip(i, j, margins)]
+
+    # --- Số liệu ---
+
+    def metrics(self):
+        """Số liệu hiện tại: độ trễ update -> sàng lọc xong (ms), thời gian sàng lọc, backpressure."""
+        return {
+            'objects': len(self.constellation),
+            'clients': len(self._clients),
+            'updates': self.update_count,
+            'batches': self.batch_count,
+            'mean_batch_size': float(np.mean(self.batch_sizes)) if self.batch_sizes else 0.0,
+            'pending': self._queue.qsize() if self._queue is not None else 0,
+            'backpressure_waits': self.backpressure_waits,
+            'dropped_messages': sum(client.dropped for client in self._clients),
+            'active_conflicts': int(len(self._active)),
+            'latency_ms': _percentiles(self.latencies_ms),
+            'screen_ms': _percentiles(self.screen_ms),
+            'screener': self.screener.stats(),
+        }
+
+# ----------------------------------------------------
+# 2. CLIENT
+# ----------------------------------------------------
+
+class ScreeningClient:
+    """Client NDJSON tối giản (dùng cho test / demo trong cùng tiến trình)."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self._seq = 0
+
+    @classmethod
+    async def connect(cls, host, port):
+        reader, writer = await asyncio.open_connection(host, port, limit=STREAM_LIMIT)
+        return cls(reader, writer)
+
+    async def _send(self, message):
+        self.writer.write(json.dumps(message).encode() + b'\n')
+        await self.writer.drain()  # Chờ khi bộ đệm socket đầy (backpressure từ server)
+
+    async def send_update(self, ids, positions, rotors=None):
+        """Gửi một update; trả về số thứ tự seq."""
+        self._seq += 1
+        message = {'type': 'update', 'seq': self._seq, 'ids': np.asarray(ids).tolist(),
+                   'positions': np.asarray(positions).tolist()}
+        if rotors is not None:
+            message['rotors'] = np.asarray(rotors).tolist()
+        await self._send(message)
+        return self._seq
+
+    async def request_stats(self):
+        await self._send({'type': 'stats'})
+
+    async def messages(self):
+        """Lặp qua các message server gửi về cho tới khi kết nối đóng."""
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                return
+            yield json.loads(line)
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+# ----------------------------------------------------
+# 3. DEMO: CLIENT TRONG CÙNG TIẾN TRÌNH
+# ----------------------------------------------------
+
+async def run_demo(n_objects=20000, n_updates=400, objects_per_update=200, rate=1000.0,
+                   step=0.05, batch_window=DEFAULT_BATCH_WINDOW, seed=0):
+    """
+    Client gửi n_updates update (mỗi update dời objects_per_update vật ngẫu nhiên một
+    đoạn ~step) với tốc độ rate update/s, đồng thời nhận alert. In độ trễ end-to-end
+    (gửi -> ack) phía client và số liệu phía server.
+    """
+    rng = np.random.default_rng(seed)
+    centers, radii = random_catalogue(n_objects, seed=seed)
+    ids = np.arange(n_objects) + 1000  # id bất kỳ, không cần là chỉ số
+    service = ScreeningService(Constellation(ids, centers, radii=radii), skin=1.0, batch_window=batch_window)
+    host, port = await service.start()
+    client = await ScreeningClient.connect(host, port)
+
+    sent_at, round_trip_ms = {}, []
+    counts = {'alert': 0, 'new': 0, 'cleared': 0, 'snapshot': 0}
+
+    async def receive():
+        async for message in client.messages():
+            kind = message['type']
+            if kind == 'ack':
+                now = time.perf_counter()
+                round_trip_ms.extend((now - sent_at.pop(seq)) * 1e3 for seq in message['seqs'])
+            elif kind == 'alert':
+                counts['alert'] += 1
+                counts['new'] += len(message['new'])
+                counts['cleared'] += len(message['cleared'])
+            elif kind == 'snapshot':
+                counts['snapshot'] = len(message['active'])
+            elif kind == 'stats':
+                return message
+
+    receiver = asyncio.create_task(receive())
+    print(f"\n--- Screening Service Demo ({n_objects} objects, {n_updates} updates x "
+          f"{objects_per_update} objects, {rate:.0f} updates/s, window {batch_window * 1e3:.0f} ms) ---")
+    t0 = time.perf_counter()
+    for k in range(n_updates):
+        moved = rng.choice(n_objects, size=objects_per_update, replace=False)
+        centers[moved] += rng.normal(scale=step, size=(objects_per_update, 3))
+        seq = await client.send_update(ids[moved], centers[moved])
+        sent_at[seq] = time.perf_counter()
+        await asyncio.sleep(max(0.0, t0 + (k + 1) / rate - time.perf_counter()))
+    while sent_at:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - t0
+    await client.request_stats()
+    stats = await receiver
+    await client.close()
+    await service.stop()
+
+    rt = _percentiles(round_trip_ms)
+    print(f"Sent {n_updates} updates in {elapsed:.2f} s ({n_updates / elapsed:.0f} updates/s)")
+    print(f"Initial conflicts {counts['snapshot']}; {counts['alert']} alerts, "
+          f"{counts['new']} new, {counts['cleared']} cleared, {stats['active_conflicts']} active")
+    print(f"Batches {stats['batches']} (mean size {stats['mean_batch_size']:.1f}), "
+          f"backpressure waits {stats['backpressure_waits']}, dropped {stats['dropped_messages']}")
+    print(f"Latency update -> screened (server): p50 {stats['latency_ms']['p50']:.2f} ms, "
+          f"p99 {stats['latency_ms']['p99']:.2f} ms")
+    print(f"Latency send -> ack (client):        p50 {rt['p50']:.2f} ms, p99 {rt['p99']:.2f} ms")
+    print(f"Screening per batch: p50 {stats['screen_ms']['p50']:.2f} ms, p99 {stats['screen_ms']['p99']:.2f} ms, "
+          f"rebuilds {stats['screener']['rebuilds']}")
+
+    # Đối chiếu: trạng thái cuối của service phải cho đúng tập xung đột như sàng lọc một lần
+    from src.application_collision_avoidance import screen_conjunctions
+    pairs, _ = screen_conjunctions(centers, radii)
+    same = np.array_equal(np.sort(service._pair_keys(pairs)), np.sort(service._active))
+    print(f"Final active conflicts match one-shot screening: {same}")
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Conjunction screening service")
+    parser.add_argument('--serve', metavar='HOST:PORT', help="chạy server thay vì demo")
+    parser.add_argument('--objects', type=int, default=20000)
+    parser.add_argument('--updates', type=int, default=400)
+    parser.add_argument('--rate', type=float, default=1000.0)
+    parser.add_argument('--window', type=float, default=DEFAULT_BATCH_WINDOW, help="cửa sổ gộp batch (s)")
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        host, port = args.serve.rsplit(':', 1)
+        centers, radii = random_catalogue(args.objects)
+        service = ScreeningService(Constellation(np.arange(args.objects), centers, radii=radii),
+                                   batch_window=args.window)
+        asyncio.run(service.serve_forever(host, int(port)))
+    else:
+        asyncio.run(run_demo(args.objects, args.updates, rate=args.rate, batch_window=args.window))
+
+if __name__ == '__main__':
+    sys.exit(main())